@@ -45,6 +45,14 @@ CREATE TABLE IF NOT EXISTS alert_log (
     message TEXT
 );
 
+CREATE TABLE IF NOT EXISTS etl_watermark (
+    pipeline_name VARCHAR(64),
+    watermark_week INTEGER,
+    watermark_date_submitted DOUBLE PRECISION,
+    rows_processed BIGINT,
+    updated_at TIMESTAMP
+);
+
 -- New Route B model output table
 CREATE TABLE IF NOT EXISTS ml.student_risk_scores (
     run_date TIMESTAMP,
@@ -0,0 +1,91 @@
+"""Compare training time and test accuracy of the model backends at several data sizes.
+
+Each size generates a synthetic OULAD dataset, builds the feature matrix and trains every
+importable backend on the same time-aware split. PyTorch and TensorFlow are included
+when installed.
+
+Run from the repo root: python -m scripts.bench_model_backends --students 2000,20000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import importlib.util
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.config import load_config
+from src.etl.synthetic import generate_synthetic_oulad
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.evaluate import ranking_metrics
+from src.model.train import FEATURE_COLS, train_model
+
+_OPTIONAL_BACKENDS = {"pytorch": "torch", "tensorflow": "tensorflow"}
+
+
+def _backends(requested: list[str] | None) -> list[str]:
+    available = ["sklearn", "hgb"] + [
+        backend
+        for backend, module in _OPTIONAL_BACKENDS.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+    return [backend for backend in available if requested is None or backend in requested]
+
+
+def _bench_size(n_students: int, args: argparse.Namespace, root: Path) -> list[dict]:
+    features = build_time_sliced_features(
+        transform_data(
+            *generate_synthetic_oulad(
+                n_students=n_students, n_modules=args.modules, n_weeks=args.weeks
+            )
+        )
+    )
+    matrix = write_feature_matrix(features, FEATURE_COLS, root / f"matrix_{n_students}")
+    base = dataclasses.replace(
+        load_config(demo_mode=False), models_dir=root, hgb_threads=args.hgb_threads
+    )
+
+    results = []
+    for backend in _backends(args.backends):
+        config = dataclasses.replace(base, model_backend=backend)
+        start = time.perf_counter()
+        model, _, _, X_test, y_test, metadata = train_model(matrix, config)
+        train_seconds = time.perf_counter() - start
+        probs = model.predict_proba(X_test)[:, 1]
+        results.append(
+            {
+                "students": n_students,
+                "train_rows": metadata["train_rows"],
+                "backend": backend,
+                "train_seconds": round(train_seconds, 3),
+                **{k: round(v, 4) for k, v in ranking_metrics(y_test, probs).items()},
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", default="2000,20000,100000")
+    parser.add_argument("--weeks", type=int, default=10)
+    parser.add_argument("--modules", type=int, default=22)
+    parser.add_argument("--hgb-threads", type=int, default=0)
+    parser.add_argument("--backends", type=lambda v: v.split(","), default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            row
+            for n_students in map(int, args.students.split(","))
+            for row in _bench_size(n_students, args, Path(tmp))
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
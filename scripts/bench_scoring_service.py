@@ -0,0 +1,86 @@
+"""Load-test a running scoring service (python -m src.model.serve) on localhost.
+
+Feature rows are sampled from the persisted feature matrix, so run the pipeline once
+first. `--concurrency` client threads send `--requests` POST /score requests of
+`--rows-per-request` rows each; the script prints client-side latency percentiles and
+throughput alongside the server's own /metrics.
+
+Run from the repo root: python -m scripts.bench_scoring_service --requests 2000 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.config import load_config
+from src.features.matrix import open_feature_matrix
+from src.model.train import FEATURE_COLS
+
+
+def _payloads(n_requests: int, rows_per_request: int, seed: int) -> list[bytes]:
+    matrix = open_feature_matrix(load_config().feature_matrix_dir)
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(n_requests):
+        sample = matrix.values[rng.integers(0, len(matrix), rows_per_request)]
+        rows = [
+            {
+                col: None if np.isnan(value) else float(value)
+                for col, value in zip(FEATURE_COLS, row)
+            }
+            for row in sample
+        ]
+        payloads.append(json.dumps({"rows": rows}).encode())
+    return payloads
+
+
+def _post(url: str, body: bytes) -> float:
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rows-per-request", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    payloads = _payloads(args.requests, args.rows_per_request, args.seed)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = np.array(
+            list(executor.map(lambda body: _post(f"{args.url}/score", body), payloads))
+        )
+    seconds = time.perf_counter() - start
+    with urllib.request.urlopen(f"{args.url}/metrics") as response:
+        server = json.loads(response.read())
+
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    client = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rows_per_request": args.rows_per_request,
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(args.requests / seconds, 2),
+        "rows_per_second": round(args.requests * args.rows_per_request / seconds, 2),
+        "latency_ms": {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3)},
+    }
+    print(json.dumps({"client": client, "server": server}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the indexed dimension join against the chained pandas merges in transform_data.
+
+Run from the repo root: python -m scripts.bench_transform_join --rows 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from src.etl.indexed_join import indexed_left_join
+from src.etl.synthetic import generate_synthetic_oulad
+
+
+def _merge_join(
+    student_info: pd.DataFrame, student_assessment: pd.DataFrame, assessments: pd.DataFrame
+) -> pd.DataFrame:
+    merged = student_assessment.merge(assessments, on="id_assessment", how="left")
+    return merged.merge(student_info, on="id_student", how="left")
+
+
+def _indexed_join(
+    student_info: pd.DataFrame, student_assessment: pd.DataFrame, assessments: pd.DataFrame
+) -> pd.DataFrame:
+    merged = indexed_left_join(student_assessment, assessments, "id_assessment")
+    return indexed_left_join(merged, student_info, "id_student")
+
+
+def _best_of(fn, repeats: int, *args) -> tuple[float, pd.DataFrame]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Fact rows to join")
+    parser.add_argument("--weeks", type=int, default=10)
+    parser.add_argument("--modules", type=int, default=22)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    student_info, student_assessment, assessments = generate_synthetic_oulad(
+        n_students=max(args.rows // args.weeks, 1), n_modules=args.modules, n_weeks=args.weeks
+    )
+
+    merge_s, expected = _best_of(
+        _merge_join, args.repeats, student_info, student_assessment, assessments
+    )
+    indexed_s, actual = _best_of(
+        _indexed_join, args.repeats, student_info, student_assessment, assessments
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+    print(
+        json.dumps(
+            {
+                "fact_rows": len(student_assessment),
+                "merge_seconds": round(merge_s, 3),
+                "indexed_seconds": round(indexed_s, 3),
+                "speedup": round(merge_s / indexed_s, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
-"""Load OULAD raw CSV files into Postgres raw.* tables."""
+"""Load OULAD raw CSV files into Postgres raw.* tables.
+
+Each table is COPYed into a staging table and swapped into place only once it is complete,
+so an interrupted run never leaves a half-loaded raw.* table behind. Completed loads are
+recorded in raw._ingest_log; `--resume` skips tables whose source file is unchanged since.
+
+    python scripts/ingest_raw_postgres.py --workers 4 --unlogged --typed --resume
+"""
 
 from __future__ import annotations
 
+import argparse
+import csv
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
+import pandas as pd
 import psycopg2
 
 RAW_TABLE_SPECS = [
@@ -16,6 +29,19 @@ RAW_TABLE_SPECS = [
     ("courses.csv", "courses", False),
     ("studentRegistration.csv", "student_registration", False),
 ]
+RAW_SCHEMA = "raw"
+INGEST_LOG_TABLE = f"{RAW_SCHEMA}._ingest_log"
+# OULAD marks missing values with "?"; typed columns load both it and "" as NULL.
+RAW_NULL_TOKENS = ("", "?")
+TYPE_SAMPLE_ROWS = 50_000
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class IngestOptions:
+    unlogged: bool = False
+    typed: bool = False
+    resume: bool = False
 
 
 def _normalized_database_url() -> str:
@@ -25,65 +51,244 @@ def _normalized_database_url() -> str:
     return database_url.replace("postgresql+psycopg2://", "postgresql://")
 
 
-def _create_table_from_csv(cur, csv_path: Path, schema: str, table_name: str) -> list[str]:
-    header_line = csv_path.read_text(encoding="utf-8").splitlines()[0]
-    columns = [col.strip() for col in header_line.split(",")]
-    col_sql = ", ".join(f'"{col}" TEXT' for col in columns)
-    cur.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
-    cur.execute(f"DROP TABLE IF EXISTS {schema}.{table_name}")
-    cur.execute(f"CREATE TABLE {schema}.{table_name} ({col_sql})")
-    return columns
+def _read_header(csv_path: Path) -> list[str]:
+    """Read only the header row, so large files such as studentVle.csv stay on disk."""
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
+        return [col.strip() for col in next(csv.reader(handle))]
+
+
+def _infer_column_types(csv_path: Path, columns: list[str]) -> dict[str, str]:
+    """Guess BIGINT/DOUBLE PRECISION/TEXT per column from the first rows of the file."""
+    sample = pd.read_csv(
+        csv_path, nrows=TYPE_SAMPLE_ROWS, dtype=str, keep_default_na=False, usecols=columns
+    )
+    types = {}
+    for col in columns:
+        values = sample[col].str.strip()
+        values = values[~values.isin(RAW_NULL_TOKENS)]
+        numeric = pd.to_numeric(values, errors="coerce")
+        if values.empty or numeric.isna().any():
+            types[col] = "TEXT"
+        elif (numeric == numeric.round()).all() and not values.str.contains(r"[.eE]").any():
+            types[col] = "BIGINT"
+        else:
+            types[col] = "DOUBLE PRECISION"
+    return types
+
+
+class _ProgressReader:
+    """File wrapper that counts bytes handed to COPY and prints periodic throughput."""
+
+    def __init__(self, handle, label: str, total_bytes: int) -> None:
+        self._handle = handle
+        self._label = label
+        self._total = max(total_bytes, 1)
+        self._start = time.perf_counter()
+        self._last_report = self._start
+        self.bytes_read = 0
+
+    def _count(self, data: str) -> str:
+        self.bytes_read += len(data)
+        now = time.perf_counter()
+        if now - self._last_report >= PROGRESS_INTERVAL_SECONDS:
+            self._last_report = now
+            mb = self.bytes_read / 1e6
+            print(
+                f"  {self._label}: {min(self.bytes_read / self._total, 1.0):.0%} "
+                f"({mb:.1f}/{self._total / 1e6:.1f} MB, {mb / (now - self._start):.1f} MB/s)"
+            )
+        return data
+
+    def read(self, size: int = -1) -> str:
+        return self._count(self._handle.read(size))
+
+    def readline(self, size: int = -1) -> str:
+        return self._count(self._handle.readline(size))
+
+
+def _ensure_ingest_log(conn) -> None:
+    with conn, conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA IF NOT EXISTS {RAW_SCHEMA}")
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {INGEST_LOG_TABLE} (
+                table_name VARCHAR(64) PRIMARY KEY,
+                source_file TEXT,
+                size_bytes BIGINT,
+                mtime_ns BIGINT,
+                rows_loaded BIGINT,
+                typed BOOLEAN,
+                completed_at TIMESTAMP
+            )
+            """
+        )
+
+
+def _already_ingested(cur, table_name: str, csv_path: Path) -> bool:
+    stat = csv_path.stat()
+    cur.execute(
+        f"SELECT size_bytes, mtime_ns FROM {INGEST_LOG_TABLE} WHERE table_name = %s",
+        (table_name,),
+    )
+    row = cur.fetchone()
+    cur.execute("SELECT to_regclass(%s)", (f"{RAW_SCHEMA}.{table_name}",))
+    table_exists = cur.fetchone()[0] is not None
+    return table_exists and row is not None and tuple(row) == (stat.st_size, stat.st_mtime_ns)
 
 
-def _copy_csv_into_table(
-    cur, csv_path: Path, schema: str, table_name: str, columns: list[str]
-) -> None:
+def _copy_into_staging(
+    cur, csv_path: Path, staging: str, columns: list[str], unlogged: bool
+) -> int:
+    col_sql = ", ".join(f'"{col}" TEXT' for col in columns)
+    cur.execute(f"DROP TABLE IF EXISTS {staging}")
+    cur.execute(f"CREATE {'UNLOGGED ' if unlogged else ''}TABLE {staging} ({col_sql})")
+
     col_names = ", ".join(f'"{col}"' for col in columns)
     copy_sql = (
-        f"COPY {schema}.{table_name} ({col_names}) "
+        f"COPY {staging} ({col_names}) "
         "FROM STDIN WITH (FORMAT CSV, HEADER TRUE, DELIMITER ',', QUOTE '\"')"
     )
     with csv_path.open("r", encoding="utf-8") as handle:
-        cur.copy_expert(copy_sql, handle)
+        reader = _ProgressReader(handle, staging, csv_path.stat().st_size)
+        cur.copy_expert(copy_sql, reader)
+    if cur.rowcount >= 0:
+        return cur.rowcount
+    cur.execute(f"SELECT COUNT(*) FROM {staging}")
+    return cur.fetchone()[0]
+
+
+def _publish_table(
+    cur,
+    staging: str,
+    target: str,
+    columns: list[str],
+    unlogged: bool,
+    types: dict[str, str] | None,
+) -> bool:
+    """Replace `target` with the staged rows; returns whether typed columns were kept."""
+    cur.execute(f"DROP TABLE IF EXISTS {target}")
+    if types is not None:
+        col_sql = ", ".join(f'"{col}" {types[col]}' for col in columns)
+        null_tokens = ", ".join(f"'{token}'" for token in RAW_NULL_TOKENS)
+        select_sql = ", ".join(
+            (
+                f'"{col}"'
+                if types[col] == "TEXT"
+                else f'CASE WHEN trim("{col}") IN ({null_tokens}) THEN NULL '
+                f'ELSE trim("{col}")::{types[col]} END'
+            )
+            for col in columns
+        )
+        cur.execute("SAVEPOINT typed_publish")
+        try:
+            cur.execute(f"CREATE TABLE {target} ({col_sql})")
+            cur.execute(f"INSERT INTO {target} SELECT {select_sql} FROM {staging}")
+            cur.execute(f"DROP TABLE {staging}")
+            cur.execute("RELEASE SAVEPOINT typed_publish")
+            return True
+        except psycopg2.DataError as exc:
+            cur.execute("ROLLBACK TO SAVEPOINT typed_publish")
+            print(f"  {target}: typed cast failed ({exc.pgerror or exc}); keeping TEXT columns")
+
+    if unlogged:
+        cur.execute(f"ALTER TABLE {staging} SET LOGGED")
+    cur.execute(f"ALTER TABLE {staging} RENAME TO {target.split('.')[-1]}")
+    return False
+
+
+def ingest_table(
+    database_url: str, csv_path: Path, table_name: str, options: IngestOptions
+) -> dict[str, object]:
+    """Load one CSV on its own connection and record it in the ingest log."""
+    target = f"{RAW_SCHEMA}.{table_name}"
+    staging = f"{RAW_SCHEMA}._stg_{table_name}"
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn, conn.cursor() as cur:
+            if options.resume and _already_ingested(cur, table_name, csv_path):
+                print(f"Skipping {target}: already ingested from unchanged {csv_path.name}")
+                return {"table": target, "status": "skipped"}
+
+            start = time.perf_counter()
+            columns = _read_header(csv_path)
+            types = _infer_column_types(csv_path, columns) if options.typed else None
+            rows = _copy_into_staging(cur, csv_path, staging, columns, options.unlogged)
+            typed = _publish_table(cur, staging, target, columns, options.unlogged, types)
+
+            stat = csv_path.stat()
+            cur.execute(f"DELETE FROM {INGEST_LOG_TABLE} WHERE table_name = %s", (table_name,))
+            cur.execute(
+                f"INSERT INTO {INGEST_LOG_TABLE} (table_name, source_file, size_bytes, "
+                "mtime_ns, rows_loaded, typed, completed_at) VALUES (%s, %s, %s, %s, %s, %s, now())",
+                (table_name, csv_path.name, stat.st_size, stat.st_mtime_ns, rows, typed),
+            )
+        elapsed = time.perf_counter() - start
+        print(
+            f"Loaded {target}: {rows} rows in {elapsed:.1f}s "
+            f"({rows / max(elapsed, 1e-9):,.0f} rows/s, "
+            f"{stat.st_size / 1e6 / max(elapsed, 1e-9):.1f} MB/s{', typed' if typed else ''})"
+        )
+        return {"table": target, "status": "loaded", "rows": rows, "seconds": elapsed}
+    finally:
+        conn.close()
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest OULAD raw CSVs into Postgres raw.*")
+    parser.add_argument("--workers", type=int, default=1, help="Tables loaded in parallel")
+    parser.add_argument("--unlogged", action="store_true", help="COPY into UNLOGGED staging tables")
+    parser.add_argument(
+        "--typed",
+        action="store_true",
+        help="Create BIGINT/DOUBLE PRECISION columns inferred from a sample instead of TEXT",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip tables already ingested from an unchanged source file",
+    )
+    args = parser.parse_args()
+
     repo_root = Path(__file__).resolve().parents[1]
     raw_dir = repo_root / "data" / "raw"
     if not raw_dir.exists():
         raise FileNotFoundError(f"Raw directory not found: {raw_dir}")
 
-    conn = psycopg2.connect(_normalized_database_url())
+    jobs = []
+    for csv_name, table_name, required in RAW_TABLE_SPECS:
+        csv_path = raw_dir / csv_name
+        if not csv_path.exists():
+            if required:
+                raise FileNotFoundError(
+                    f"Required raw file is missing: {csv_path}. "
+                    "Required files: studentInfo.csv, studentAssessment.csv, assessments.csv"
+                )
+            print(f"Skipping optional file (not found): {csv_name}")
+            continue
+        jobs.append((csv_path, table_name))
+
+    database_url = _normalized_database_url()
+    conn = psycopg2.connect(database_url)
     try:
-        with conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-                print("Connected to Postgres")
-
-                for csv_name, table_name, required in RAW_TABLE_SPECS:
-                    csv_path = raw_dir / csv_name
-                    if not csv_path.exists():
-                        if required:
-                            raise FileNotFoundError(
-                                f"Required raw file is missing: {csv_path}. "
-                                "Required files: studentInfo.csv, studentAssessment.csv, assessments.csv"
-                            )
-                        print(f"Skipping optional file (not found): {csv_name}")
-                        continue
-
-                    columns = _create_table_from_csv(
-                        cur, csv_path, schema="raw", table_name=table_name
-                    )
-                    _copy_csv_into_table(
-                        cur, csv_path, schema="raw", table_name=table_name, columns=columns
-                    )
-
-                    cur.execute(f"SELECT COUNT(*) FROM raw.{table_name}")
-                    row_count = cur.fetchone()[0]
-                    print(f"Loaded raw.{table_name}: {row_count} rows")
+        _ensure_ingest_log(conn)
+        print("Connected to Postgres")
     finally:
         conn.close()
 
+    options = IngestOptions(unlogged=args.unlogged, typed=args.typed, resume=args.resume)
+    # Largest files first so a long studentVle load overlaps with the small tables.
+    jobs.sort(key=lambda job: job[0].stat().st_size, reverse=True)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [
+            executor.submit(ingest_table, database_url, csv_path, table_name, options)
+            for csv_path, table_name in jobs
+        ]
+        total_rows = sum(int(future.result().get("rows", 0)) for future in futures)
+    print(
+        f"Ingested {total_rows} rows across {len(jobs)} tables in {time.perf_counter() - start:.1f}s"
+    )
+
 
 if __name__ == "__main__":
     main()
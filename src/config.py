@@ -12,6 +12,10 @@ class PipelineConfig:
     repo_root: Path
     data_raw_dir: Path
     data_processed_dir: Path
+    raw_cache_dir: Path
+    feature_store_dir: Path
+    feature_matrix_dir: Path
+    score_cache_dir: Path
     outputs_dir: Path
     marts_dir: Path
     alerts_dir: Path
@@ -21,6 +25,9 @@ class PipelineConfig:
     db_path: Path
     database_url: str | None
     db_mode: str
+    db_bulk_insert: bool
+    db_pool_size: int
+    schema_memory_report: bool
     random_seed: int
     high_risk_threshold: float
     spike_threshold_pct: float
@@ -30,7 +37,36 @@ class PipelineConfig:
     value_per_pass: float
     default_intervention_cost: float
     demo_mode: bool
+    extract_mode: str
+    extract_chunk_size: int
+    raw_cache_enabled: bool
+    etl_mode: str
+    feature_backend: str
+    feature_workers: int
+    feature_shard_strategy: str
     model_backend: str
+    torch_batch_size: int
+    torch_num_threads: int
+    early_stopping_patience: int
+    valid_weeks: int
+    tf_data_parallelism: int
+    tf_data_chunk_rows: int
+    hgb_threads: int
+    sgd_chunk_rows: int
+    eval_mode: str
+    cv_workers: int
+    cv_min_train_weeks: int
+    search_trials: int
+    search_workers: int
+    search_trial_timeout: float
+    score_chunk_rows: int
+    score_workers: int
+    score_cache: bool
+    serve_host: str
+    serve_port: int
+    serve_max_batch_rows: int
+    serve_max_wait_ms: float
+    retrain_every_days: float
     storage_backend: str
     aws_region: str
     s3_bucket: str
@@ -67,6 +103,10 @@ def load_config(demo_mode: bool | None = None) -> PipelineConfig:
         repo_root=root,
         data_raw_dir=root / "data" / "raw",
         data_processed_dir=root / "data" / "processed",
+        raw_cache_dir=root / "data" / "processed" / "raw_cache",
+        feature_store_dir=root / "data" / "processed" / "feature_store",
+        feature_matrix_dir=root / "data" / "processed" / "feature_matrix",
+        score_cache_dir=root / "data" / "processed" / "score_cache",
         outputs_dir=root / "outputs",
         marts_dir=root / "outputs" / "marts",
         alerts_dir=root / "outputs" / "alerts",
@@ -76,6 +116,9 @@ def load_config(demo_mode: bool | None = None) -> PipelineConfig:
         db_path=root / "data" / "processed" / "pipeline.db",
         database_url=database_url,
         db_mode="postgres" if database_url else "sqlite",
+        db_bulk_insert=str(os.getenv("DB_BULK_INSERT", "true")).lower() == "true",
+        db_pool_size=_env_int("DB_POOL_SIZE", 4),
+        schema_memory_report=str(os.getenv("SCHEMA_MEMORY_REPORT", "false")).lower() == "true",
         random_seed=_env_int("PIPELINE_RANDOM_SEED", 42),
         high_risk_threshold=_env_float("HIGH_RISK_THRESHOLD", 0.25),
         spike_threshold_pct=_env_float("RISK_SPIKE_THRESHOLD_PCT", 0.10),
@@ -85,7 +128,36 @@ def load_config(demo_mode: bool | None = None) -> PipelineConfig:
         value_per_pass=_env_float("VALUE_PER_PASS", 1200.0),
         default_intervention_cost=_env_float("INTERVENTION_COST", 150.0),
         demo_mode=use_demo_mode,
+        extract_mode=os.getenv("EXTRACT_MODE", "full").strip().lower(),
+        extract_chunk_size=_env_int("EXTRACT_CHUNK_SIZE", 250_000),
+        raw_cache_enabled=str(os.getenv("RAW_CACHE", "true")).lower() == "true",
+        etl_mode=os.getenv("ETL_MODE", "full").strip().lower(),
+        feature_backend=os.getenv("FEATURE_BACKEND", "pandas").strip().lower(),
+        feature_workers=_env_int("FEATURE_WORKERS", 1),
+        feature_shard_strategy=os.getenv("FEATURE_SHARD_STRATEGY", "module").strip().lower(),
         model_backend=os.getenv("MODEL_BACKEND", "sklearn").strip().lower(),
+        torch_batch_size=_env_int("TORCH_BATCH_SIZE", 0),
+        torch_num_threads=_env_int("TORCH_NUM_THREADS", 0),
+        early_stopping_patience=_env_int("EARLY_STOPPING_PATIENCE", 0),
+        valid_weeks=_env_int("VALID_WEEKS", 2),
+        tf_data_parallelism=_env_int("TF_DATA_PARALLELISM", 0),
+        tf_data_chunk_rows=_env_int("TF_DATA_CHUNK_ROWS", 8192),
+        hgb_threads=_env_int("HGB_THREADS", 0),
+        sgd_chunk_rows=_env_int("SGD_CHUNK_ROWS", 50_000),
+        eval_mode=os.getenv("EVAL_MODE", "split").strip().lower(),
+        cv_workers=_env_int("CV_WORKERS", 1),
+        cv_min_train_weeks=_env_int("CV_MIN_TRAIN_WEEKS", 4),
+        search_trials=_env_int("SEARCH_TRIALS", 0),
+        search_workers=_env_int("SEARCH_WORKERS", 1),
+        search_trial_timeout=_env_float("SEARCH_TRIAL_TIMEOUT", 600.0),
+        score_chunk_rows=_env_int("SCORE_CHUNK_ROWS", 100_000),
+        score_workers=_env_int("SCORE_WORKERS", 1),
+        score_cache=str(os.getenv("SCORE_CACHE", "true")).lower() == "true",
+        serve_host=os.getenv("SERVE_HOST", "127.0.0.1").strip(),
+        serve_port=_env_int("SERVE_PORT", 8080),
+        serve_max_batch_rows=_env_int("SERVE_MAX_BATCH_ROWS", 1024),
+        serve_max_wait_ms=_env_float("SERVE_MAX_WAIT_MS", 5.0),
+        retrain_every_days=_env_float("RETRAIN_EVERY_DAYS", 7.0),
         storage_backend=os.getenv("STORAGE_BACKEND", "local").strip().lower(),
         aws_region=os.getenv("AWS_REGION", "us-east-1"),
         s3_bucket=os.getenv("S3_BUCKET", "").strip(),
@@ -97,6 +169,7 @@ def ensure_directories(config: PipelineConfig) -> None:
     for path in [
         config.data_raw_dir,
         config.data_processed_dir,
+        config.raw_cache_dir,
         config.outputs_dir,
         config.marts_dir,
         config.alerts_dir,
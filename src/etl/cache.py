@@ -0,0 +1,184 @@
+"""Columnar cache for raw OULAD CSVs keyed by source-file fingerprint.
+
+Each raw CSV is parsed once and stored as a zstd-compressed Parquet file under
+`data/processed/raw_cache`. Later runs reuse the Parquet copy while the source file's
+size, mtime and SHA-256 all still match the fingerprint recorded next to it.
+
+Invalidate explicitly with:
+
+    python -m src.etl.cache clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import load_config
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_HASH_BLOCK_BYTES = 1 << 20
+
+
+def source_fingerprint(path: Path, with_hash: bool = True) -> dict[str, int | str]:
+    stat = path.stat()
+    fingerprint: dict[str, int | str] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def _cache_paths(csv_path: Path, cache_dir: Path, variant: str) -> tuple[Path, Path]:
+    stem = f"{csv_path.stem}.{variant}"
+    return cache_dir / f"{stem}.parquet", cache_dir / f"{stem}.json"
+
+
+def _cached_fingerprint_matches(csv_path: Path, data_path: Path, meta_path: Path) -> bool:
+    if not data_path.exists() or not meta_path.exists():
+        return False
+    cached = json.loads(meta_path.read_text())
+    current = source_fingerprint(csv_path, with_hash=False)
+    if cached.get("size") != current["size"] or cached.get("mtime_ns") != current["mtime_ns"]:
+        return False
+    return cached.get("sha256") == source_fingerprint(csv_path)["sha256"]
+
+
+def _write_meta(csv_path: Path, meta_path: Path) -> None:
+    meta = {"source": csv_path.name, **source_fingerprint(csv_path)}
+    meta_path.write_text(json.dumps(meta, indent=2))
+
+
+def read_csv_cached(
+    csv_path: Path,
+    cache_dir: Path,
+    variant: str,
+    reader: Callable[[Path], pd.DataFrame],
+) -> pd.DataFrame:
+    """Return `reader(csv_path)`, served from the Parquet cache when the source is unchanged."""
+    data_path, meta_path = _cache_paths(csv_path, cache_dir, variant)
+    if _cached_fingerprint_matches(csv_path, data_path, meta_path):
+        logger.info("Raw cache hit for %s (%s)", csv_path.name, variant)
+        return pd.read_parquet(data_path)
+
+    logger.info("Raw cache miss for %s (%s); parsing CSV", csv_path.name, variant)
+    df = reader(csv_path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path, compression="zstd", index=False)
+    tmp_path.replace(data_path)
+    _write_meta(csv_path, meta_path)
+    return df
+
+
+def iter_csv_chunks_cached(
+    csv_path: Path,
+    cache_dir: Path,
+    variant: str,
+    chunk_reader: Callable[[Path], Iterator[pd.DataFrame]],
+    chunksize: int,
+    dtypes: dict[str, str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Chunked counterpart of `read_csv_cached`.
+
+    On a hit, Parquet record batches of `chunksize` rows are yielded. On a miss, CSV chunks
+    are yielded as they are parsed and appended to the cache file, which is only published
+    once the whole source has been consumed.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    data_path, meta_path = _cache_paths(csv_path, cache_dir, variant)
+    if _cached_fingerprint_matches(csv_path, data_path, meta_path):
+        logger.info("Raw cache hit for %s (%s)", csv_path.name, variant)
+        for batch in pq.ParquetFile(data_path).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            if dtypes:
+                chunk = chunk.astype({k: v for k, v in dtypes.items() if k in chunk.columns})
+            yield chunk
+        return
+
+    logger.info("Raw cache miss for %s (%s); streaming CSV", csv_path.name, variant)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(".parquet.tmp")
+    writer = None
+    completed = False
+    try:
+        for chunk in chunk_reader(csv_path):
+            # Per-chunk categoricals carry their own dictionaries, so store plain values.
+            stored = chunk.astype(
+                {
+                    c: "object"
+                    for c in chunk.columns
+                    if isinstance(chunk[c].dtype, pd.CategoricalDtype)
+                }
+            )
+            table = pa.Table.from_pandas(stored, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            yield chunk
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+        if completed and writer is not None:
+            tmp_path.replace(data_path)
+            _write_meta(csv_path, meta_path)
+        else:
+            tmp_path.unlink(missing_ok=True)
+
+
+def clear_cache(cache_dir: Path) -> int:
+    """Delete every cached Parquet file and fingerprint; returns the number of files removed."""
+    if not cache_dir.exists():
+        return 0
+    removed = 0
+    for path in cache_dir.iterdir():
+        if path.is_file() and path.name.endswith((".parquet", ".json", ".parquet.tmp")):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def cache_status(cache_dir: Path, raw_dir: Path) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
+    if not cache_dir.exists():
+        return rows
+    for meta_path in sorted(cache_dir.glob("*.json")):
+        meta = json.loads(meta_path.read_text())
+        csv_path = raw_dir / str(meta.get("source", ""))
+        data_path = meta_path.with_suffix(".parquet")
+        rows.append(
+            {
+                "cache_file": data_path.name,
+                "source": meta.get("source"),
+                "size_bytes": data_path.stat().st_size if data_path.exists() else None,
+                "valid": csv_path.exists()
+                and _cached_fingerprint_matches(csv_path, data_path, meta_path),
+            }
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the raw OULAD columnar cache")
+    parser.add_argument("command", choices=["clear", "status"])
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.command == "clear":
+        count = clear_cache(config.raw_cache_dir)
+        print(f"Removed {count} cached files from {config.raw_cache_dir}")
+    else:
+        print(json.dumps(cache_status(config.raw_cache_dir, config.data_raw_dir), indent=2))
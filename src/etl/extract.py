@@ -2,67 +2,79 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
 from src.config import PipelineConfig
+from src.etl.cache import iter_csv_chunks_cached, read_csv_cached
+from src.etl.synthetic import generate_synthetic_oulad
+from src.schema import RAW_DTYPES, enforce_schema
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 EXPECTED_FILES = ["studentInfo.csv", "studentAssessment.csv", "assessments.csv"]
+RAW_NA_VALUES = ["?", ""]
 
 
-def _read_if_exists(path: Path) -> pd.DataFrame | None:
-    return pd.read_csv(path) if path.exists() else None
+def _read_typed(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=RAW_DTYPES.get(path.name), na_values=RAW_NA_VALUES)
 
 
-def _generate_demo_data(config: PipelineConfig) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    rng = np.random.default_rng(config.random_seed)
-    n_students = 300
-    student_ids = np.arange(10000, 10000 + n_students)
-    courses = rng.choice(["AAA", "BBB", "CCC", "DDD"], size=n_students)
-    risk_baseline = rng.beta(2, 5, size=n_students)
-
-    student_info = pd.DataFrame(
-        {
-            "id_student": student_ids,
-            "code_module": courses,
-            "studied_credits": rng.integers(30, 120, size=n_students),
-            "age_band_num": rng.integers(1, 4, size=n_students),
-            "imd_band_num": rng.integers(1, 10, size=n_students),
-            "disability_flag": rng.integers(0, 2, size=n_students),
-            "pass_probability_base": np.clip(0.75 - risk_baseline * 0.6, 0.15, 0.95),
-        }
+def _raw_cache_enabled(config: PipelineConfig) -> bool:
+    if not config.raw_cache_enabled:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.warning("RAW_CACHE is enabled but pyarrow is not installed; reading CSVs directly")
+        return False
+    return True
+
+
+def _read_if_exists(path: Path, config: PipelineConfig) -> pd.DataFrame | None:
+    if not path.exists():
+        return None
+    if not _raw_cache_enabled(config):
+        return _read_typed(path)
+    return read_csv_cached(path, config.raw_cache_dir, "typed", _read_typed)
+
+
+def iter_raw_chunks(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield typed chunks of a raw OULAD CSV, holding at most `chunksize` rows at a time."""
+    with pd.read_csv(
+        path,
+        dtype=RAW_DTYPES.get(path.name),
+        na_values=RAW_NA_VALUES,
+        chunksize=chunksize,
+    ) as reader:
+        yield from reader
+
+
+def _iter_frame_chunks(df: pd.DataFrame, chunksize: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
+def _enforce_raw_schema(
+    info: pd.DataFrame, assess: pd.DataFrame, assessments: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    return (
+        enforce_schema(info, "extract", RAW_DTYPES["studentInfo.csv"]),
+        enforce_schema(assess, "extract", RAW_DTYPES["studentAssessment.csv"]),
+        enforce_schema(assessments, "extract", RAW_DTYPES["assessments.csv"]),
     )
 
-    records = []
-    assess_rows = []
-    aid = 1
-    for wk in range(1, 11):
-        assess_rows.append({"id_assessment": aid, "date": wk * 7, "weight": 10})
-        scores = np.clip(70 - risk_baseline * 50 + rng.normal(0, 10, size=n_students), 0, 100)
-        submitted = rng.binomial(1, np.clip(0.95 - risk_baseline * 0.5, 0.3, 0.99), size=n_students)
-        for sid, score, sub in zip(student_ids, scores, submitted):
-            records.append(
-                {
-                    "id_student": sid,
-                    "id_assessment": aid,
-                    "date_submitted": wk * 7,
-                    "score": round(float(score), 2) if sub else np.nan,
-                    "is_banked": 0,
-                    "submitted": int(sub),
-                }
-            )
-        aid += 1
-    student_assessment = pd.DataFrame(records)
-    assessments = pd.DataFrame(assess_rows)
-    return student_info, student_assessment, assessments
+
+def _generate_demo_data(config: PipelineConfig) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    return _enforce_raw_schema(
+        *generate_synthetic_oulad(n_students=300, n_modules=4, n_weeks=10, seed=config.random_seed)
+    )
 
 
-def extract_data(config: PipelineConfig) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+def _missing_raw_files(config: PipelineConfig) -> list[str]:
     missing = [f for f in EXPECTED_FILES if not (config.data_raw_dir / f).exists()]
     if missing:
         msg = (
@@ -75,12 +87,53 @@ def extract_data(config: PipelineConfig) -> tuple[pd.DataFrame, pd.DataFrame, pd
             raise FileNotFoundError(
                 msg + " Set PIPELINE_DEMO_MODE=true or place files in data/raw with expected names."
             )
+    return missing
+
+
+def extract_data(config: PipelineConfig) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    if _missing_raw_files(config):
         return _generate_demo_data(config)
 
     logger.info("Reading raw OULAD files from data/raw")
-    info = _read_if_exists(config.data_raw_dir / "studentInfo.csv")
-    assess = _read_if_exists(config.data_raw_dir / "studentAssessment.csv")
-    assessments = _read_if_exists(config.data_raw_dir / "assessments.csv")
+    info = _read_if_exists(config.data_raw_dir / "studentInfo.csv", config)
+    assess = _read_if_exists(config.data_raw_dir / "studentAssessment.csv", config)
+    assessments = _read_if_exists(config.data_raw_dir / "assessments.csv", config)
     if info is None or assess is None or assessments is None:
         raise FileNotFoundError("Could not read one or more required raw files.")
-    return info, assess, assessments
+    return _enforce_raw_schema(info, assess, assessments)
+
+
+def extract_data_chunked(
+    config: PipelineConfig,
+) -> tuple[pd.DataFrame, Iterator[pd.DataFrame], pd.DataFrame]:
+    """Streaming variant of `extract_data`.
+
+    The small dimension tables are read whole with narrow dtypes; the student assessment
+    fact table is returned as an iterator of typed chunks of `config.extract_chunk_size` rows.
+    """
+    chunksize = config.extract_chunk_size
+    if _missing_raw_files(config):
+        info, assess, assessments = _generate_demo_data(config)
+        return info, _iter_frame_chunks(assess, chunksize), assessments
+
+    logger.info("Streaming raw OULAD files from data/raw (chunk size %s)", chunksize)
+    info = _read_if_exists(config.data_raw_dir / "studentInfo.csv", config)
+    assessments = _read_if_exists(config.data_raw_dir / "assessments.csv", config)
+    if info is None or assessments is None:
+        raise FileNotFoundError("Could not read one or more required raw files.")
+    info = enforce_schema(info, "extract", RAW_DTYPES["studentInfo.csv"])
+    assessments = enforce_schema(assessments, "extract", RAW_DTYPES["assessments.csv"])
+
+    assess_path = config.data_raw_dir / "studentAssessment.csv"
+    if _raw_cache_enabled(config):
+        assess_chunks = iter_csv_chunks_cached(
+            assess_path,
+            config.raw_cache_dir,
+            "typed",
+            lambda path: iter_raw_chunks(path, chunksize),
+            chunksize,
+            dtypes=RAW_DTYPES[assess_path.name],
+        )
+    else:
+        assess_chunks = iter_raw_chunks(assess_path, chunksize)
+    return info, assess_chunks, assessments
@@ -0,0 +1,95 @@
+"""Indexed left joins of a fact table against small integer-keyed dimension tables.
+
+Instead of hash-merging, the dimension key column is turned into a position lookup once
+(a dense array when the key range is compact, sorted keys + `searchsorted` otherwise) and
+the requested dimension columns are gathered onto the fact rows with vectorized takes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Dense lookups are used while the key span stays within this many slots (or 8x the table).
+_DENSE_MAX_SPAN = 1 << 22
+
+
+@dataclass(frozen=True)
+class KeyIndex:
+    """Maps integer keys to row positions of a dimension table."""
+
+    min_key: int
+    dense: np.ndarray | None = None
+    sorted_keys: np.ndarray | None = None
+    sorted_positions: np.ndarray | None = None
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Return the dimension row for each key, or -1 where the key is absent."""
+        keys = np.asarray(keys, dtype=np.int64)
+        if self.dense is not None:
+            offsets = keys - self.min_key
+            in_range = (offsets >= 0) & (offsets < len(self.dense))
+            positions = np.full(len(keys), -1, dtype=np.int64)
+            positions[in_range] = self.dense[offsets[in_range]]
+            return positions
+
+        slots = np.searchsorted(self.sorted_keys, keys)
+        slots = np.minimum(slots, len(self.sorted_keys) - 1)
+        found = self.sorted_keys[slots] == keys
+        return np.where(found, self.sorted_positions[slots], -1)
+
+
+def build_key_index(keys: pd.Series | np.ndarray) -> KeyIndex | None:
+    """Build a lookup for unique integer keys; returns None if keys are missing or repeated."""
+    values = np.asarray(keys)
+    if len(values) == 0 or not np.issubdtype(values.dtype, np.integer):
+        return None
+    values = values.astype(np.int64, copy=False)
+
+    min_key, max_key = int(values.min()), int(values.max())
+    span = max_key - min_key + 1
+    if span <= max(_DENSE_MAX_SPAN, 8 * len(values)):
+        dense = np.full(span, -1, dtype=np.int64)
+        dense[values - min_key] = np.arange(len(values))
+        # Repeated keys overwrite each other's slot, leaving fewer filled slots than rows.
+        if np.count_nonzero(dense >= 0) != len(values):
+            return None
+        return KeyIndex(min_key=min_key, dense=dense)
+
+    order = np.argsort(values, kind="stable")
+    sorted_keys = values[order]
+    if (sorted_keys[1:] == sorted_keys[:-1]).any():
+        return None
+    return KeyIndex(min_key=min_key, sorted_keys=sorted_keys, sorted_positions=order)
+
+
+def take_columns(
+    dim: pd.DataFrame, positions: np.ndarray, columns: list[str]
+) -> dict[str, pd.api.extensions.ExtensionArray | np.ndarray]:
+    """Gather `columns` of `dim` at `positions`; -1 positions become missing values."""
+    allow_fill = bool((positions < 0).any())
+    return {col: dim[col].array.take(positions, allow_fill=allow_fill) for col in columns}
+
+
+def indexed_left_join(
+    fact: pd.DataFrame,
+    dim: pd.DataFrame,
+    key: str,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Left-join `dim[columns]` onto `fact` by `key`, preserving fact row order.
+
+    `columns` defaults to every dimension column not already on the fact table. Falls back
+    to `DataFrame.merge` when the dimension key is not a unique integer column, since a
+    positional lookup cannot express one-to-many matches.
+    """
+    if columns is None:
+        columns = [c for c in dim.columns if c != key and c not in fact.columns]
+    index = build_key_index(dim[key])
+    if index is None or not np.issubdtype(np.asarray(fact[key]).dtype, np.integer):
+        return fact.merge(dim[[key, *columns]], on=key, how="left")
+
+    positions = index.lookup(fact[key].to_numpy())
+    return fact.reset_index(drop=True).assign(**take_columns(dim, positions, columns))
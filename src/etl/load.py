@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import io
+import json
 import sqlite3
-from dataclasses import dataclass
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
 
 import pandas as pd
 
 from src.config import PipelineConfig
+from src.etl.pool import ConnectionPool
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,18 +24,172 @@ logger = get_logger(__name__)
 class DBClient:
     conn: object
     driver: str  # sqlite|postgres
+    bulk_insert: bool = True
+    batch_size: int = 50_000
+    pool: ConnectionPool | None = None
+    _in_transaction: bool = field(default=False, repr=False)
+    _on_commit: list[Callable[[], None]] = field(default_factory=list, repr=False)
+    _on_rollback: list[Callable[[], None]] = field(default_factory=list, repr=False)
+
+    def _commit(self) -> None:
+        if not self._in_transaction:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[DBClient]:
+        """Run the enclosed statements as one unit: a single commit, or rollback on error.
+
+        Nested scopes join the outermost one. Writes inside the scope must go through the
+        client's cursor; `DataFrame.to_sql` commits the connection itself.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        if self.driver == "sqlite" and not getattr(self.conn, "in_transaction", False):
+            # sqlite3 only opens a transaction implicitly before DML, so DDL such as
+            # recreating a table would otherwise commit on its own.
+            self.conn.cursor().execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            for undo in reversed(self._on_rollback):
+                undo()
+            raise
+        else:
+            self.conn.commit()
+            for done in self._on_commit:
+                done()
+        finally:
+            self._in_transaction = False
+            self._on_commit.clear()
+            self._on_rollback.clear()
+
+    def on_transaction_end(
+        self,
+        commit: Callable[[], None] | None = None,
+        rollback: Callable[[], None] | None = None,
+    ) -> None:
+        """Tie a side effect outside the database to the current transaction scope.
+
+        `commit` runs after the scope commits and `rollback` after it rolls back; outside
+        a scope every statement commits at once, so `commit` runs immediately.
+        """
+        if not self._in_transaction:
+            if commit is not None:
+                commit()
+            return
+        if commit is not None:
+            self._on_commit.append(commit)
+        if rollback is not None:
+            self._on_rollback.append(rollback)
+
+    @contextmanager
+    def session(self) -> Iterator[DBClient]:
+        """Check out a separate pooled connection, e.g. for a stage running concurrently."""
+        if self.pool is None:
+            raise RuntimeError("DBClient was created without a connection pool")
+        conn = self.pool.checkout()
+        try:
+            yield DBClient(
+                conn=conn,
+                driver=self.driver,
+                bulk_insert=self.bulk_insert,
+                batch_size=self.batch_size,
+                pool=self.pool,
+            )
+        finally:
+            self.pool.checkin(conn)
+
+    def close(self) -> None:
+        """Return the pinned connection and close every pooled connection."""
+        if self.pool is None:
+            self.conn.close()
+            return
+        self.pool.checkin(self.conn)
+        self.pool.close_all()
 
     def execute(self, sql: str, params: tuple | None = None) -> None:
         cur = self.conn.cursor()
         cur.execute(sql, params or ())
-        self.conn.commit()
+        self._commit()
 
     def insert_df(self, table_name: str, df: pd.DataFrame) -> None:
         if df.empty:
             return
+        start = time.perf_counter()
         if self.driver == "sqlite":
-            df.to_sql(table_name, self.conn, if_exists="append", index=False)
-            return
+            method = self._insert_sqlite_batched(table_name, df)
+        elif self.bulk_insert:
+            method = self._insert_postgres_copy(table_name, df)
+        else:
+            method = self._insert_postgres_executemany(table_name, df)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            json.dumps(
+                {
+                    "event": "db_insert",
+                    "table": table_name,
+                    "method": method,
+                    "rows": len(df),
+                    "seconds": round(elapsed, 4),
+                    "rows_per_sec": round(len(df) / max(elapsed, 1e-9)),
+                }
+            )
+        )
+
+    def replace_table(self, table_name: str, df: pd.DataFrame) -> None:
+        """Recreate SQLite table `table_name` with the columns and rows of `df`."""
+        cur = self.conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+        cur.execute(pd.io.sql.get_schema(df, table_name))
+        self._commit()
+        self.insert_df(table_name, df)
+
+    def _insert_sqlite_batched(self, table_name: str, df: pd.DataFrame) -> str:
+        cur = self.conn.cursor()
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+        if cur.fetchone() is None:
+            # Created through the cursor, not `to_sql`, which would commit the transaction.
+            cur.execute(pd.io.sql.get_schema(df, table_name))
+
+        cols = list(df.columns)
+        query = (
+            f"INSERT INTO {table_name} ({', '.join(cols)}) "
+            f"VALUES ({', '.join(['?'] * len(cols))})"
+        )
+        for offset in range(0, len(df), self.batch_size):
+            batch = df.iloc[offset : offset + self.batch_size]
+            cur.executemany(query, batch.itertuples(index=False, name=None))
+        self._commit()
+        return "sqlite_batched"
+
+    def _insert_postgres_copy(self, table_name: str, df: pd.DataFrame) -> str:
+        import psycopg2
+
+        col_names = ", ".join(df.columns)
+        copy_sql = f"COPY {table_name} ({col_names}) FROM STDIN WITH (FORMAT CSV, NULL '')"
+        cur = self.conn.cursor()
+        # A savepoint lets a failed COPY be undone without discarding the enclosing transaction.
+        cur.execute("SAVEPOINT bulk_copy")
+        try:
+            for offset in range(0, len(df), self.batch_size):
+                buffer = io.StringIO()
+                df.iloc[offset : offset + self.batch_size].to_csv(
+                    buffer, index=False, header=False, na_rep=""
+                )
+                buffer.seek(0)
+                cur.copy_expert(copy_sql, buffer)
+        except psycopg2.Error as exc:
+            cur.execute("ROLLBACK TO SAVEPOINT bulk_copy")
+            logger.warning("COPY into %s failed (%s); falling back to executemany", table_name, exc)
+            return self._insert_postgres_executemany(table_name, df)
+        cur.execute("RELEASE SAVEPOINT bulk_copy")
+        self._commit()
+        return "copy"
+
+    def _insert_postgres_executemany(self, table_name: str, df: pd.DataFrame) -> str:
         cols = list(df.columns)
         values = [tuple(x) for x in df.itertuples(index=False, name=None)]
         placeholders = ", ".join(["%s"] * len(cols))
@@ -36,23 +197,33 @@ class DBClient:
         query = f"INSERT INTO {table_name} ({col_names}) VALUES ({placeholders})"
         cur = self.conn.cursor()
         cur.executemany(query, values)
-        self.conn.commit()
+        self._commit()
+        return "executemany"
 
 
 def get_database_client(config: PipelineConfig) -> DBClient:
+    """Open a pooled client; the returned client pins one connection for the main run.
+
+    Further connections (up to DB_POOL_SIZE) are opened on demand by `DBClient.session`.
+    """
     if config.database_url:
         import psycopg2
 
         normalized_url = config.database_url.replace("postgresql+psycopg2://", "postgresql://")
-        conn = psycopg2.connect(normalized_url)
+        pool = ConnectionPool(lambda: psycopg2.connect(normalized_url), config.db_pool_size)
+        conn = pool.checkout()
         cur = conn.cursor()
         cur.execute("SELECT 1")
-        logger.info("Connected to Postgres database")
-        return DBClient(conn=conn, driver="postgres")
+        logger.info("Connected to Postgres database (pool size %s)", config.db_pool_size)
+        return DBClient(conn=conn, driver="postgres", bulk_insert=config.db_bulk_insert, pool=pool)
 
-    conn = sqlite3.connect(config.db_path)
+    # SQLite serializes writers; the busy timeout lets concurrent sessions wait for the lock.
+    pool = ConnectionPool(
+        lambda: sqlite3.connect(config.db_path, timeout=30.0, check_same_thread=False),
+        config.db_pool_size,
+    )
     logger.info("Using SQLite fallback at %s", config.db_path)
-    return DBClient(conn=conn, driver="sqlite")
+    return DBClient(conn=pool.checkout(), driver="sqlite", pool=pool)
 
 
 def initialize_schema(config: PipelineConfig, db: DBClient) -> None:
@@ -81,18 +252,68 @@ def initialize_schema(config: PipelineConfig, db: DBClient) -> None:
             db.execute("ALTER TABLE course_summary_daily ADD COLUMN week INTEGER")
     else:
         cur = db.conn.cursor()
-        cur.execute(
-            """
+        cur.execute("""
             SELECT column_name
             FROM information_schema.columns
             WHERE table_name='course_summary_daily' AND column_name='week'
-            """
-        )
+            """)
         if cur.fetchone() is None:
             db.execute("ALTER TABLE course_summary_daily ADD COLUMN week INTEGER")
 
 
-def load_processed_data(clean_df: pd.DataFrame, config: PipelineConfig, db: DBClient) -> None:
-    clean_df.to_csv(config.data_processed_dir / "clean_events.csv", index=False)
+def _undo_on_rollback(path: Path, append: bool, db: DBClient) -> None:
+    """Restore `path` as it is now if the enclosing transaction rolls back."""
+    if not path.exists():
+        db.on_transaction_end(rollback=lambda: path.unlink(missing_ok=True))
+    elif append:
+        size = path.stat().st_size
+
+        def truncate() -> None:
+            with path.open("r+b") as handle:
+                handle.truncate(size)
+
+        db.on_transaction_end(rollback=truncate)
+    else:
+        backup = path.with_name(path.name + ".bak")
+        path.replace(backup)
+        db.on_transaction_end(
+            commit=lambda: backup.unlink(missing_ok=True),
+            rollback=lambda: backup.replace(path),
+        )
+
+
+def load_processed_data(
+    clean_df: pd.DataFrame, config: PipelineConfig, db: DBClient, append: bool = False
+) -> None:
+    """Write cleaned events to `clean_events.csv` and, on SQLite, the `clean_events` table.
+
+    Inside a `DBClient.transaction` scope both writes are undone if the scope rolls back,
+    so a failed run leaves no events behind for the next incremental run to load again.
+    """
+    out_path = config.data_processed_dir / "clean_events.csv"
+    _undo_on_rollback(out_path, append, db)
+    if append:
+        clean_df.to_csv(out_path, mode="a", header=not out_path.exists(), index=False)
+    else:
+        clean_df.to_csv(out_path, index=False)
     if db.driver == "sqlite":
-        clean_df.to_sql("clean_events", db.conn, if_exists="replace", index=False)
+        if append:
+            db.insert_df("clean_events", clean_df)
+        else:
+            db.replace_table("clean_events", clean_df)
+
+
+def load_processed_chunks(
+    clean_chunks: Iterable[pd.DataFrame],
+    config: PipelineConfig,
+    db: DBClient,
+    append: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """Chunked counterpart of `load_processed_data`.
+
+    Writes each chunk to the processed store as it streams past and yields it unchanged,
+    so the full cleaned table is never materialized.
+    """
+    for i, chunk in enumerate(clean_chunks):
+        load_processed_data(chunk, config, db, append=append or i > 0)
+        yield chunk
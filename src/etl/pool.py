@@ -0,0 +1,100 @@
+"""Thread-safe database connection pool with checkout metrics."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection became free within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Lazily opens up to `max_size` connections from `factory` and hands them out.
+
+    Connections are reused LIFO so a mostly-sequential pipeline keeps touching one warm
+    connection, while concurrent stages can each hold their own.
+    """
+
+    def __init__(self, factory: Callable[[], object], max_size: int = 4) -> None:
+        if max_size < 1:
+            raise ValueError("Connection pool size must be at least 1")
+        self._factory = factory
+        self.max_size = max_size
+        self._idle: list[object] = []
+        self._all: list[object] = []
+        self._opening = 0
+        self._cond = threading.Condition()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def checkout(self, timeout: float | None = 30.0) -> object:
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            while not self._idle and len(self._all) + self._opening >= self.max_size:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available within {timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._opening += 1
+
+        if conn is None:
+            try:
+                conn = self._factory()
+            finally:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+            with self._cond:
+                self._all.append(conn)
+
+        waited = time.perf_counter() - start
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def checkin(self, conn: object) -> None:
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = 30.0) -> Iterator[object]:
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": len(self._all),
+                "in_use": len(self._all) - len(self._idle),
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
+
+    def close_all(self) -> None:
+        with self._cond:
+            conns, self._all, self._idle = self._all, [], []
+        for conn in conns:
+            conn.close()
@@ -0,0 +1,191 @@
+"""Vectorized synthetic OULAD-like data generator for demo runs and load testing."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def module_codes(n_modules: int) -> list[str]:
+    """OULAD-style module codes: AAA, BBB, ... then M026, M027, ... beyond 26 modules."""
+    return [chr(ord("A") + i) * 3 if i < 26 else f"M{i:03d}" for i in range(n_modules)]
+
+
+def generate_synthetic_oulad(
+    n_students: int = 300,
+    n_modules: int = 4,
+    n_weeks: int = 10,
+    missing_rate: float = 0.0,
+    seed: int = 42,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Generate `(student_info, student_assessment, assessments)` without Python row loops.
+
+    Each student is enrolled in one module and has one weekly assessment per week, so the
+    fact table has `n_students * n_weeks` rows. Non-submissions are driven by a latent risk
+    baseline; `missing_rate` additionally blanks that share of submitted scores.
+    """
+    if not 0.0 <= missing_rate <= 1.0:
+        raise ValueError("missing_rate must be between 0 and 1")
+
+    rng = np.random.default_rng(seed)
+    student_ids = np.arange(10000, 10000 + n_students)
+    module_idx = rng.integers(0, n_modules, size=n_students)
+    risk_baseline = rng.beta(2, 5, size=n_students)
+
+    student_info = pd.DataFrame(
+        {
+            "id_student": student_ids,
+            "code_module": np.asarray(module_codes(n_modules))[module_idx],
+            "studied_credits": rng.integers(30, 120, size=n_students),
+            "age_band_num": rng.integers(1, 4, size=n_students),
+            "imd_band_num": rng.integers(1, 10, size=n_students),
+            "disability_flag": rng.integers(0, 2, size=n_students),
+            "pass_probability_base": np.clip(0.75 - risk_baseline * 0.6, 0.15, 0.95),
+        }
+    )
+
+    weeks = np.arange(1, n_weeks + 1)
+    assessments = pd.DataFrame(
+        {
+            "id_assessment": (np.repeat(np.arange(n_modules), n_weeks) * n_weeks)
+            + np.tile(weeks, n_modules),
+            "date": np.tile(weeks, n_modules) * 7,
+            "weight": 10,
+        }
+    )
+
+    # Week-major layout: every student's week-1 row, then week 2, and so on.
+    n_rows = n_students * n_weeks
+    row_week = np.repeat(weeks, n_students)
+    row_baseline = np.tile(risk_baseline, n_weeks)
+    scores = np.clip(70 - row_baseline * 50 + rng.normal(0, 10, size=n_rows), 0, 100).round(2)
+    submitted = rng.binomial(1, np.clip(0.95 - row_baseline * 0.5, 0.3, 0.99))
+    missing = (submitted == 0) | (rng.random(n_rows) < missing_rate)
+
+    student_assessment = pd.DataFrame(
+        {
+            "id_student": np.tile(student_ids, n_weeks),
+            "id_assessment": np.tile(module_idx, n_weeks) * n_weeks + row_week,
+            "date_submitted": row_week * 7,
+            "score": np.where(missing, np.nan, scores),
+            "is_banked": np.zeros(n_rows, dtype=np.int8),
+            "submitted": submitted,
+        }
+    )
+    return student_info, student_assessment, assessments
+
+
+def generate_synthetic_vle(
+    student_info: pd.DataFrame,
+    n_weeks: int = 10,
+    rows_per_week: int = 5,
+    n_sites: int = 200,
+    seed: int = 42,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Generate `(student_vle, vle)` clickstream tables for the students in `student_info`.
+
+    Every student gets `rows_per_week` click rows per week on random days and sites, so
+    `student_vle` has `len(student_info) * n_weeks * rows_per_week` rows.
+    """
+    rng = np.random.default_rng(seed)
+    activity_types = np.array(
+        ["forumng", "homepage", "oucontent", "quiz", "resource", "subpage", "url", "glossary"]
+    )
+    vle = pd.DataFrame(
+        {
+            "id_site": np.arange(500000, 500000 + n_sites),
+            "activity_type": rng.choice(activity_types, size=n_sites),
+        }
+    )
+
+    per_student = n_weeks * rows_per_week
+    n_rows = len(student_info) * per_student
+    row_week = np.tile(np.repeat(np.arange(1, n_weeks + 1), rows_per_week), len(student_info))
+    student_vle = pd.DataFrame(
+        {
+            "code_module": np.repeat(student_info["code_module"].to_numpy(), per_student),
+            "id_student": np.repeat(student_info["id_student"].to_numpy(), per_student),
+            "id_site": rng.choice(vle["id_site"].to_numpy(), size=n_rows),
+            "date": row_week * 7 + rng.integers(0, 7, size=n_rows),
+            "sum_click": rng.geometric(0.3, size=n_rows),
+        }
+    )
+    return student_vle, vle
+
+
+def write_synthetic_raw(
+    out_dir: Path,
+    n_students: int,
+    n_modules: int,
+    n_weeks: int,
+    missing_rate: float = 0.0,
+    seed: int = 42,
+    vle_rows_per_week: int = 0,
+) -> dict[str, int]:
+    """Write generated tables to `out_dir` under the raw OULAD file names.
+
+    With `vle_rows_per_week` > 0, `studentVle.csv` and `vle.csv` are written as well.
+    """
+    student_info, student_assessment, assessments = generate_synthetic_oulad(
+        n_students, n_modules, n_weeks, missing_rate, seed
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tables = {
+        "studentInfo.csv": student_info,
+        "studentAssessment.csv": student_assessment,
+        "assessments.csv": assessments,
+    }
+    if vle_rows_per_week > 0:
+        tables["studentVle.csv"], tables["vle.csv"] = generate_synthetic_vle(
+            student_info, n_weeks, vle_rows_per_week, seed=seed
+        )
+    for name, df in tables.items():
+        df.to_csv(out_dir / name, index=False, chunksize=500_000)
+    return {name: len(df) for name, df in tables.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic OULAD raw files")
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--modules", type=int, default=4)
+    parser.add_argument("--weeks", type=int, default=10)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--vle-rows-per-week", type=int, default=0)
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=Path(__file__).resolve().parents[2] / "data" / "raw",
+        help="Output directory (default: data/raw)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    row_counts = write_synthetic_raw(
+        args.out,
+        args.students,
+        args.modules,
+        args.weeks,
+        args.missing_rate,
+        args.seed,
+        args.vle_rows_per_week,
+    )
+    logger.info(
+        json.dumps(
+            {
+                "event": "synthetic_raw_written",
+                "out_dir": str(args.out),
+                "rows": row_counts,
+                "seconds": round(time.perf_counter() - start, 2),
+            }
+        )
+    )
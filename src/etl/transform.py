@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+
 import pandas as pd
 
+from src.etl.indexed_join import indexed_left_join
+from src.schema import enforce_schema
+
 
 def transform_data(
     student_info: pd.DataFrame,
     student_assessment: pd.DataFrame,
     assessments: pd.DataFrame,
 ) -> pd.DataFrame:
-    merged = student_assessment.merge(assessments, on="id_assessment", how="left")
-    merged = merged.merge(student_info, on="id_student", how="left")
+    assessment_cols = [c for c in ("date", "weight") if c in assessments.columns]
+    merged = indexed_left_join(student_assessment, assessments, "id_assessment", assessment_cols)
+    merged = indexed_left_join(merged, student_info, "id_student")
 
     merged["week"] = (merged["date_submitted"].fillna(merged["date"]).fillna(0) // 7).astype(int)
 
@@ -37,4 +43,14 @@ def transform_data(
         if col not in merged.columns:
             merged[col] = 0
 
-    return merged[passthrough].copy()
+    return enforce_schema(merged[passthrough], "transform")
+
+
+def transform_data_chunked(
+    student_info: pd.DataFrame,
+    student_assessment_chunks: Iterable[pd.DataFrame],
+    assessments: pd.DataFrame,
+) -> Iterator[pd.DataFrame]:
+    """Apply `transform_data` chunk by chunk; every output row depends only on its input row."""
+    for chunk in student_assessment_chunks:
+        yield transform_data(student_info, chunk, assessments)
@@ -0,0 +1,171 @@
+"""Out-of-core weekly aggregation of the OULAD VLE clickstream (`studentVle.csv`).
+
+`studentVle.csv` (10M+ rows) is read in chunks of `chunksize` rows. Each chunk is reduced
+to per-(student, module, week) partials holding click totals, clicks per activity type
+and one "was active" flag per day of the week; partials are folded together
+periodically. Memory is therefore bounded by the chunk size plus the number of distinct
+weekly groups, whatever the size of the file. Activity types come from `vle.csv` via an
+indexed site lookup.
+
+Incremental runs pass the last featurised week of every (student, module) group; clicks
+up to that week are already in stored feature rows and are dropped from each chunk
+before aggregation. The CSV itself is still parsed in full.
+
+    python -m src.etl.vle --chunksize 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import PipelineConfig, load_config
+from src.etl.indexed_join import build_key_index
+from src.schema import RAW_DTYPES, enforce_schema
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+VLE_KEYS = ["id_student", "code_module", "week"]
+# The OULAD activity types carrying most clicks; every other type is counted as "other".
+VLE_ACTIVITY_TYPES = ["forumng", "homepage", "oucontent", "quiz", "resource", "subpage", "url"]
+VLE_ACTIVITY_COLS = [f"vle_clicks_{name}" for name in [*VLE_ACTIVITY_TYPES, "other"]]
+VLE_FEATURE_COLS = ["vle_clicks", "vle_active_days", *VLE_ACTIVITY_COLS]
+
+_DAY_COLS = [f"_active_day{day}" for day in range(7)]
+# Number of chunk-level partial aggregates held before they are folded together.
+_PARTIAL_COMPACT_EVERY = 8
+
+
+def _site_activity_codes(vle_path: Path) -> tuple[object, np.ndarray]:
+    """Site lookup plus, per `vle.csv` row, the position of its activity column."""
+    sites = pd.read_csv(vle_path, usecols=["id_site", "activity_type"])
+    site_index = build_key_index(sites["id_site"])
+    if site_index is None:
+        raise ValueError(f"{vle_path.name} must have unique integer id_site values")
+    other = len(VLE_ACTIVITY_TYPES)
+    codes = pd.Index(VLE_ACTIVITY_TYPES).get_indexer(sites["activity_type"].astype(str))
+    return site_index, np.where(codes < 0, other, codes)
+
+
+def _partial_vle(chunk: pd.DataFrame, site_index, site_codes: np.ndarray) -> pd.DataFrame:
+    date = chunk["date"].to_numpy(dtype=np.int64)
+    clicks = chunk["sum_click"].to_numpy(dtype=np.int64)
+    positions = site_index.lookup(chunk["id_site"].to_numpy())
+    activity = np.where(positions >= 0, site_codes[positions], len(VLE_ACTIVITY_TYPES))
+    day = date % 7
+
+    partial = pd.DataFrame(
+        {
+            "id_student": chunk["id_student"].to_numpy(),
+            "code_module": chunk["code_module"].astype(str).to_numpy(),
+            "week": date // 7,
+            "vle_clicks": clicks,
+            **{col: np.where(activity == i, clicks, 0) for i, col in enumerate(VLE_ACTIVITY_COLS)},
+            **{col: day == i for i, col in enumerate(_DAY_COLS)},
+        }
+    )
+    return _fold(partial)
+
+
+def _fold(partial: pd.DataFrame) -> pd.DataFrame:
+    return partial.groupby(VLE_KEYS, as_index=False, sort=False).agg(
+        **{col: (col, "sum") for col in ["vle_clicks", *VLE_ACTIVITY_COLS]},
+        **{col: (col, "max") for col in _DAY_COLS},
+    )
+
+
+def _after_stored_weeks(chunk: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Rows of `chunk` later than their group's week in `after`; unknown groups are kept."""
+    keys = pd.DataFrame(
+        {
+            "id_student": chunk["id_student"].to_numpy(),
+            "code_module": chunk["code_module"].astype(str).to_numpy(),
+        }
+    )
+    stored = keys.merge(after, on=["id_student", "code_module"], how="left")["week"].to_numpy()
+    week = chunk["date"].to_numpy(dtype=np.int64) // 7
+    return chunk[np.isnan(stored) | (week > stored)]
+
+
+def aggregate_vle_weekly(
+    student_vle_path: Path,
+    vle_path: Path,
+    chunksize: int,
+    after: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """Weekly per-(student, module) VLE features plus throughput stats for the scan.
+
+    With `after` (`id_student`, `code_module`, `week`), only clicks from weeks after each
+    listed group's week are aggregated.
+    """
+    site_index, site_codes = _site_activity_codes(vle_path)
+    if after is not None:
+        after = after[["id_student", "code_module", "week"]].astype(
+            {"code_module": str, "week": "float64"}
+        )
+    dtypes = RAW_DTYPES["studentVle.csv"]
+    start = time.perf_counter()
+    rows = 0
+    partials: list[pd.DataFrame] = []
+    with pd.read_csv(
+        student_vle_path, usecols=list(dtypes), dtype=dtypes, chunksize=chunksize
+    ) as reader:
+        for chunk in reader:
+            rows += len(chunk)
+            if after is not None:
+                chunk = _after_stored_weeks(chunk, after)
+            partials.append(_partial_vle(chunk, site_index, site_codes))
+            if len(partials) >= _PARTIAL_COMPACT_EVERY:
+                partials = [_fold(pd.concat(partials, ignore_index=True))]
+    if not rows:
+        raise ValueError(f"{student_vle_path.name} has no rows to aggregate.")
+
+    weekly = _fold(pd.concat(partials, ignore_index=True))
+    weekly["vle_active_days"] = weekly[_DAY_COLS].sum(axis=1)
+    weekly = weekly[[*VLE_KEYS, *VLE_FEATURE_COLS]].sort_values(VLE_KEYS, ignore_index=True)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": rows,
+        "weekly_groups": len(weekly),
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / max(seconds, 1e-9)),
+    }
+    logger.info(json.dumps({"event": "vle_aggregated", **stats}))
+    return enforce_schema(weekly, "vle"), stats
+
+
+def load_vle_weekly(
+    config: PipelineConfig, after: pd.DataFrame | None = None
+) -> pd.DataFrame | None:
+    """Weekly VLE features from `data/raw`, or None when the clickstream files are absent.
+
+    `after` limits the aggregation to clicks newer than each group's stored week.
+    """
+    student_vle_path = config.data_raw_dir / "studentVle.csv"
+    vle_path = config.data_raw_dir / "vle.csv"
+    if not (student_vle_path.exists() and vle_path.exists()):
+        logger.info("No studentVle.csv/vle.csv in data/raw; VLE features default to zero")
+        return None
+    weekly, _ = aggregate_vle_weekly(student_vle_path, vle_path, config.extract_chunk_size, after)
+    return weekly
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate studentVle.csv into weekly features")
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    config = load_config()
+    _, stats = aggregate_vle_weekly(
+        config.data_raw_dir / "studentVle.csv",
+        config.data_raw_dir / "vle.csv",
+        args.chunksize or config.extract_chunk_size,
+    )
+    print(json.dumps(stats, indent=2))
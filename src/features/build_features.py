@@ -2,32 +2,190 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 import numpy as np
 import pandas as pd
 
+from src.etl.vle import VLE_FEATURE_COLS
+from src.schema import enforce_schema
+
+WEEKLY_KEYS = ["id_student", "week", "code_module"]
+STATIC_COLS = [
+    "studied_credits",
+    "age_band_num",
+    "imd_band_num",
+    "disability_flag",
+    "pass_probability_base",
+]
+
+GROUP_KEYS = ["id_student", "code_module"]
+ROLLING_WINDOW = 3
 
-def build_time_sliced_features(clean_df: pd.DataFrame) -> pd.DataFrame:
-    clean_df = clean_df.sort_values(["id_student", "code_module", "week"]).copy()
-    grouped = clean_df.groupby(["id_student", "week", "code_module"], as_index=False).agg(
+# Number of chunk-level partial aggregates held before they are folded together.
+_PARTIAL_COMPACT_EVERY = 8
+
+
+def aggregate_weekly(clean_df: pd.DataFrame) -> pd.DataFrame:
+    clean_df = clean_df.sort_values(["id_student", "code_module", "week"])
+    return clean_df.groupby(WEEKLY_KEYS, as_index=False, observed=True).agg(
         weekly_score_mean=("score", "mean"),
         weekly_submissions=("submitted", "sum"),
-        studied_credits=("studied_credits", "max"),
-        age_band_num=("age_band_num", "max"),
-        imd_band_num=("imd_band_num", "max"),
-        disability_flag=("disability_flag", "max"),
-        pass_probability_base=("pass_probability_base", "max"),
+        **{col: (col, "max") for col in STATIC_COLS},
     )
 
-    grouped["cum_submissions"] = grouped.groupby(["id_student", "code_module"])[
-        "weekly_submissions"
-    ].cumsum()
-    grouped["rolling_score_3w"] = grouped.groupby(["id_student", "code_module"])[
-        "weekly_score_mean"
-    ].transform(lambda s: s.rolling(3, min_periods=1).mean())
-    grouped["score_trend_2w"] = (
-        grouped.groupby(["id_student", "code_module"])["weekly_score_mean"].diff().fillna(0)
+
+def _partial_weekly(clean_df: pd.DataFrame) -> pd.DataFrame:
+    return clean_df.groupby(WEEKLY_KEYS, as_index=False, observed=True).agg(
+        score_sum=("score", "sum"),
+        score_count=("score", "count"),
+        weekly_submissions=("submitted", "sum"),
+        **{col: (col, "max") for col in STATIC_COLS},
     )
 
+
+def _combine_partials(partials: list[pd.DataFrame]) -> pd.DataFrame:
+    combined = pd.concat(partials, ignore_index=True)
+    return combined.groupby(WEEKLY_KEYS, as_index=False, observed=True).agg(
+        score_sum=("score_sum", "sum"),
+        score_count=("score_count", "sum"),
+        weekly_submissions=("weekly_submissions", "sum"),
+        **{col: (col, "max") for col in STATIC_COLS},
+    )
+
+
+def aggregate_weekly_chunks(clean_chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Weekly aggregation over a stream of cleaned chunks.
+
+    Each chunk is reduced to per-(student, week, module) partial sums, and partials are
+    folded together periodically, so memory is bounded by the number of distinct weekly
+    groups rather than by the number of event rows.
+    """
+    partials: list[pd.DataFrame] = []
+    for chunk in clean_chunks:
+        partials.append(_partial_weekly(chunk))
+        if len(partials) >= _PARTIAL_COMPACT_EVERY:
+            partials = [_combine_partials(partials)]
+    if not partials:
+        raise ValueError("No cleaned rows were provided for weekly aggregation.")
+
+    combined = _combine_partials(partials)
+    combined.insert(
+        len(WEEKLY_KEYS),
+        "weekly_score_mean",
+        combined["score_sum"] / combined["score_count"].where(combined["score_count"] > 0),
+    )
+    return combined.drop(columns=["score_sum", "score_count"])
+
+
+def attribute_vle_weeks(grouped: pd.DataFrame, vle_weekly: pd.DataFrame) -> pd.DataFrame:
+    """Re-key weekly VLE rows onto the weekly rows of `grouped` and sum them per row.
+
+    Clicks from a week with no assessment row for a (student, module) count towards that
+    group's next week in `grouped`, so activity between assessments is kept. Clicks after
+    a group's last week in `grouped` are held back until a later week arrives.
+    """
+    targets = grouped[WEEKLY_KEYS].drop_duplicates().astype({"week": "int64"})
+    targets = targets.assign(
+        code_module=targets["code_module"].astype(str), _target=targets["week"]
+    )
+    clicks = vle_weekly.astype({"week": "int64"})
+    clicks = clicks.assign(code_module=clicks["code_module"].astype(str))
+    matched = pd.merge_asof(
+        clicks.sort_values("week"),
+        targets.sort_values("week"),
+        on="week",
+        by=GROUP_KEYS,
+        direction="forward",
+    ).dropna(subset=["_target"])
+    matched["week"] = matched.pop("_target").astype("int64")
+    return matched.groupby(WEEKLY_KEYS, as_index=False, sort=False)[VLE_FEATURE_COLS].sum()
+
+
+def join_vle_features(grouped: pd.DataFrame, vle_weekly: pd.DataFrame | None) -> pd.DataFrame:
+    """Left-join VLE click features onto weekly rows; rows without clicks get zeros.
+
+    Clicks are attributed with `attribute_vle_weeks`, so `vle_active_days` counts active
+    days since the group's previous weekly row and can exceed 7 across gaps.
+    """
+    if vle_weekly is None:
+        return grouped.assign(**{col: 0.0 for col in VLE_FEATURE_COLS})
+    attributed = attribute_vle_weeks(grouped, vle_weekly)
+    keys = grouped[WEEKLY_KEYS].astype({"week": "int64", "code_module": str})
+    joined = keys.merge(attributed, on=WEEKLY_KEYS, how="left")
+    joined.index = grouped.index
+    return grouped.assign(**{col: joined[col].fillna(0.0) for col in VLE_FEATURE_COLS})
+
+
+def _group_layout(grouped: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lay every (student, module) group out contiguously, keeping row order inside groups.
+
+    Returns the row permutation, each permuted row's offset within its group, and the
+    permuted position of its group's first row.
+    """
+    codes = grouped.groupby(GROUP_KEYS, observed=True, sort=True).ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    is_start = np.empty(len(order), dtype=bool)
+    is_start[:1] = True
+    is_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    rows = np.arange(len(order))
+    group_start = np.maximum.accumulate(np.where(is_start, rows, 0))
+    return order, rows - group_start, group_start
+
+
+def _grouped_cumsum(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """Cumulative sum restarting at every group; NaNs are skipped but stay NaN."""
+    totals = np.cumsum(np.nan_to_num(values))
+    before_group = np.where(group_start > 0, totals[group_start - 1], 0.0)
+    return np.where(np.isnan(values), np.nan, totals - before_group)
+
+
+def _grouped_rolling_mean(values: np.ndarray, offset: np.ndarray, window: int) -> np.ndarray:
+    """Trailing `window`-row mean inside each group over non-NaN values (min_periods=1)."""
+    total = np.nan_to_num(values)
+    count = (~np.isnan(values)).astype(np.float64)
+    for lag in range(1, window):
+        in_group = offset[lag:] >= lag
+        lagged = values[:-lag]
+        total[lag:] += np.where(in_group, np.nan_to_num(lagged), 0.0)
+        count[lag:] += in_group & ~np.isnan(lagged)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _grouped_diff(values: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """Row-to-row difference inside each group; NaN at group starts."""
+    diff = np.full(len(values), np.nan)
+    diff[1:] = values[1:] - values[:-1]
+    return np.where(offset > 0, diff, np.nan)
+
+
+def _rolling_features(grouped: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Vectorized cumulative/rolling/diff history features over (student, module) groups.
+
+    Rows are permuted so each group is contiguous, the features are computed with
+    group-boundary-aware array arithmetic, and results are scattered back to row order.
+    """
+    order, offset, group_start = _group_layout(grouped)
+    submissions = grouped["weekly_submissions"].to_numpy(dtype=np.float64, na_value=np.nan)
+    scores = grouped["weekly_score_mean"].to_numpy(dtype=np.float64, na_value=np.nan)
+    submissions, scores = submissions[order], scores[order]
+
+    features = {
+        "cum_submissions": _grouped_cumsum(submissions, group_start),
+        "rolling_score_3w": _grouped_rolling_mean(scores, offset, ROLLING_WINDOW),
+        "score_trend_2w": np.nan_to_num(_grouped_diff(scores, offset), nan=0.0),
+    }
+    for name, sorted_values in features.items():
+        values = np.empty_like(sorted_values)
+        values[order] = sorted_values
+        features[name] = values
+    return features
+
+
+def add_risk_target(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Derive the risk target from the history features and enforce the feature schema."""
     score_factor = 1 - (grouped["rolling_score_3w"] / 100)
     submit_factor = np.clip(
         1 - grouped["cum_submissions"] / (grouped["week"].clip(lower=1) * 1.5), 0, 1
@@ -39,4 +197,21 @@ def build_time_sliced_features(clean_df: pd.DataFrame) -> pd.DataFrame:
     )
     grouped["dropout_risk_target"] = grouped["dropout_risk_target"].clip(0, 1)
     grouped["target_high_risk"] = (grouped["dropout_risk_target"] > 0.45).astype(int)
-    return grouped
+    return enforce_schema(grouped, "features")
+
+
+def add_time_features(grouped: pd.DataFrame) -> pd.DataFrame:
+    return add_risk_target(grouped.assign(**_rolling_features(grouped)))
+
+
+def build_time_sliced_features(
+    clean_df: pd.DataFrame, vle_weekly: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    return add_time_features(join_vle_features(aggregate_weekly(clean_df), vle_weekly))
+
+
+def build_time_sliced_features_from_chunks(
+    clean_chunks: Iterable[pd.DataFrame], vle_weekly: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Streaming counterpart of `build_time_sliced_features` for chunked ETL output."""
+    return add_time_features(join_vle_features(aggregate_weekly_chunks(clean_chunks), vle_weekly))
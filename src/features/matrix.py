@@ -0,0 +1,142 @@
+"""Memory-mapped float32 feature matrix shared by training, scoring and explanation.
+
+The feature stage writes `FEATURE_COLS` once as a C-contiguous float32 `.npy` array with
+rows ordered by week, next to int sidecars for student, module, week, target and the
+row's position in the source feature frame:
+
+    feature_matrix/
+      values.npy        (rows, len(FEATURE_COLS)) float32
+      id_student.npy    int32
+      code_module.npy   int16 codes into `modules` in meta.json
+      week.npy          int32, ascending
+      target.npy        int8 `target_high_risk`
+      source_row.npy    int64 row position in the feature frame
+      meta.json         columns, modules and the week -> [start, stop) row index
+
+Because rows are week-ordered, every week range is a contiguous slice, so the
+time-aware split and per-week scoring are views into the mapping rather than copies.
+Pickling a `FeatureMatrix` re-opens the files, so process-pool workers share the OS
+page cache instead of receiving a serialized copy.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_SIDECARS = {
+    "id_student": "int32",
+    "code_module": "int16",
+    "week": "int32",
+    "target": "int8",
+    "source_row": "int64",
+}
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    root: Path
+    columns: list[str]
+    modules: list[str]
+    week_index: dict[int, tuple[int, int]]
+    values: np.ndarray
+    id_student: np.ndarray
+    code_module: np.ndarray
+    week: np.ndarray
+    target: np.ndarray
+    source_row: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __reduce__(self):
+        return open_feature_matrix, (self.root,)
+
+    def week_rows(self, start: int | None = None, stop: int | None = None) -> slice:
+        """Contiguous rows whose week satisfies `start <= week < stop`."""
+        lo = 0 if start is None else int(np.searchsorted(self.week, start, side="left"))
+        hi = len(self) if stop is None else int(np.searchsorted(self.week, stop, side="left"))
+        return slice(lo, max(lo, hi))
+
+    def frame(self, rows: slice = slice(None)) -> pd.DataFrame:
+        """Zero-copy DataFrame view of `values[rows]` indexed by matrix row position."""
+        start, stop, _ = rows.indices(len(self))
+        return pd.DataFrame(
+            self.values[rows], columns=self.columns, index=pd.RangeIndex(start, stop), copy=False
+        )
+
+    def target_series(self, rows: slice = slice(None)) -> pd.Series:
+        start, stop, _ = rows.indices(len(self))
+        return pd.Series(
+            self.target[rows], index=pd.RangeIndex(start, stop), name="target_high_risk", copy=False
+        )
+
+
+def _write_npy(path: Path, array: np.ndarray) -> None:
+    tmp_path = path.with_suffix(".npy.tmp")
+    with tmp_path.open("wb") as handle:
+        np.save(handle, array)
+    tmp_path.replace(path)
+
+
+def write_feature_matrix(
+    features: pd.DataFrame, columns: list[str], root: Path, target: str = "target_high_risk"
+) -> FeatureMatrix:
+    """Write `features[columns]` as a week-ordered float32 matrix and return its mapping."""
+    root.mkdir(parents=True, exist_ok=True)
+    weeks = features["week"].to_numpy(dtype=np.int32)
+    order = np.argsort(weeks, kind="stable")
+    weeks = weeks[order]
+
+    values_tmp = root / "values.npy.tmp"
+    out = np.lib.format.open_memmap(
+        values_tmp, mode="w+", dtype=np.float32, shape=(len(features), len(columns))
+    )
+    # Filled column by column so only one column is ever re-materialized in memory.
+    for j, col in enumerate(columns):
+        out[:, j] = features[col].to_numpy(dtype=np.float32, na_value=np.nan)[order]
+    out.flush()
+    del out
+    values_tmp.replace(root / "values.npy")
+
+    modules = pd.Categorical(features["code_module"])
+    sidecars = {
+        "id_student": features["id_student"].to_numpy()[order],
+        "code_module": modules.codes[order],
+        "week": weeks,
+        "target": features[target].to_numpy()[order],
+        "source_row": order,
+    }
+    for name, dtype in _SIDECARS.items():
+        _write_npy(root / f"{name}.npy", sidecars[name].astype(dtype, copy=False))
+
+    starts = np.flatnonzero(np.r_[True, weeks[1:] != weeks[:-1]]) if len(weeks) else []
+    bounds = [*starts, len(weeks)]
+    meta = {
+        "columns": list(columns),
+        "modules": [str(module) for module in modules.categories],
+        "week_index": {
+            str(int(weeks[lo])): [int(lo), int(hi)] for lo, hi in zip(bounds[:-1], bounds[1:])
+        },
+    }
+    meta_tmp = root / "meta.json.tmp"
+    meta_tmp.write_text(json.dumps(meta, indent=2))
+    meta_tmp.replace(root / "meta.json")
+    return open_feature_matrix(root)
+
+
+def open_feature_matrix(root: Path) -> FeatureMatrix:
+    """Map an existing feature matrix read-only."""
+    meta = json.loads((root / "meta.json").read_text())
+    arrays = {name: np.load(root / f"{name}.npy", mmap_mode="r") for name in ["values", *_SIDECARS]}
+    return FeatureMatrix(
+        root=root,
+        columns=meta["columns"],
+        modules=meta["modules"],
+        week_index={int(week): (lo, hi) for week, (lo, hi) in meta["week_index"].items()},
+        **arrays,
+    )
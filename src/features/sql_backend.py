@@ -0,0 +1,102 @@
+"""SQL push-down feature backend (FEATURE_BACKEND=sql).
+
+Runs the weekly aggregation and window-function history features of
+`int_weekly_student_features.sql` inside the database and streams back only the final
+weekly rows; the risk target and VLE join are then applied with the same Python code as
+the pandas backend. The event source depends on the driver:
+
+- SQLite reads the `clean_events` table written by `load_processed_data`.
+- Postgres reads `raw.student_assessment`, `raw.assessments` and `raw.student_info`
+  as loaded by `scripts/ingest_raw_postgres.py`, applying the `transform_data` rules
+  in SQL, so no event rows are pulled into Python.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pandas as pd
+
+from src.etl.load import DBClient
+from src.features.build_features import (
+    ROLLING_WINDOW,
+    STATIC_COLS,
+    add_risk_target,
+    join_vle_features,
+)
+from src.schema import enforce_schema
+
+HISTORY_COLS = ["cum_submissions", "rolling_score_3w", "score_trend_2w"]
+
+_SQLITE_EVENTS = f"""
+select id_student, code_module, week, score, submitted, {", ".join(STATIC_COLS)}
+from clean_events
+"""
+
+# Mirrors transform_data: week from date_submitted falling back to the assessment date,
+# missing scores count as 0 and missing submission flags as 1.
+_POSTGRES_EVENTS = f"""
+select
+    cast(sa.id_student as bigint) as id_student,
+    cast(si.code_module as varchar(16)) as code_module,
+    cast(floor(coalesce(
+        cast(sa.date_submitted as double precision), cast(a.date as double precision), 0
+    ) / 7) as integer) as week,
+    coalesce(cast(sa.score as double precision), 0) as score,
+    coalesce(cast(sa.submitted as integer), 1) as submitted,
+    {", ".join(f"cast(si.{col} as double precision) as {col}" for col in STATIC_COLS)}
+from raw.student_assessment sa
+left join raw.assessments a on cast(sa.id_assessment as bigint) = cast(a.id_assessment as bigint)
+left join raw.student_info si on cast(sa.id_student as bigint) = cast(si.id_student as bigint)
+"""
+
+_FEATURES_SQL = """
+with events as ({events}),
+weekly as (
+    select
+        id_student,
+        week,
+        code_module,
+        avg(score) as weekly_score_mean,
+        cast(sum(submitted) as double precision) as weekly_submissions,
+        {static_max}
+    from events
+    group by id_student, week, code_module
+)
+select
+    *,
+    cast(sum(weekly_submissions) over history as double precision) as cum_submissions,
+    avg(weekly_score_mean) over (history rows between {lags} preceding and current row)
+        as rolling_score_3w,
+    coalesce(weekly_score_mean - lag(weekly_score_mean) over history, 0) as score_trend_2w
+from weekly
+window history as (partition by id_student, code_module order by week)
+order by id_student, week, code_module
+"""
+
+
+def features_sql(driver: str) -> str:
+    """The feature query for `driver` ("sqlite" or "postgres")."""
+    if driver not in {"sqlite", "postgres"}:
+        raise ValueError(f"Unsupported database driver for the SQL feature backend: {driver}")
+    return _FEATURES_SQL.format(
+        events=_SQLITE_EVENTS if driver == "sqlite" else _POSTGRES_EVENTS,
+        static_max=",\n        ".join(f"max({col}) as {col}" for col in STATIC_COLS),
+        lags=ROLLING_WINDOW - 1,
+    )
+
+
+def iter_weekly_features_sql(db: DBClient, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Stream weekly rows with the history features computed in the database."""
+    for chunk in pd.read_sql_query(features_sql(db.driver), db.conn, chunksize=chunksize):
+        yield enforce_schema(chunk, "features_sql")
+
+
+def build_time_sliced_features_sql(
+    db: DBClient, chunksize: int, vle_weekly: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """SQL counterpart of `build_time_sliced_features` over the events already in `db`."""
+    weekly = pd.concat(iter_weekly_features_sql(db, chunksize), ignore_index=True)
+    # Same column order as the pandas backend: VLE columns precede the history features.
+    joined = join_vle_features(weekly.drop(columns=HISTORY_COLS), vle_weekly)
+    return add_risk_target(joined.assign(**{col: weekly[col] for col in HISTORY_COLS}))
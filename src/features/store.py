@@ -0,0 +1,224 @@
+"""Persisted weekly feature store with per-(student, module) carry-over state.
+
+The history features only look back a bounded distance: `cum_submissions` needs the
+running submission count and `rolling_score_3w`/`score_trend_2w` need the previous
+`ROLLING_WINDOW - 1` weekly score means. Keeping exactly that per group lets a new week
+of aggregates be turned into feature rows without touching older weeks:
+
+    feature_store/
+      features/part-00000.parquet   feature rows, one part per append
+      state/part-00000.parquet      carry-over state of the groups each append touched
+      manifest.json                 part counter, highest stored week and row count
+
+Appends only add parts, so compact them periodically and rebuild from the processed
+event store after a backfill:
+
+    python -m src.features.store compact
+    python -m src.features.store rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import load_config
+from src.etl.incremental import iter_processed_events
+from src.etl.vle import load_vle_weekly
+from src.features.build_features import (
+    GROUP_KEYS,
+    ROLLING_WINDOW,
+    WEEKLY_KEYS,
+    _rolling_features,
+    add_risk_target,
+    aggregate_weekly_chunks,
+    join_vle_features,
+)
+from src.schema import enforce_schema
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SCORE_LAG_COLS = [f"score_lag{lag}" for lag in range(1, ROLLING_WINDOW)]
+
+
+def carry_state(grouped: pd.DataFrame, history: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Carry-over state after the last row of every group in week-ordered `grouped`.
+
+    Score lags are kept in float64 exactly as the history features consume them, so later
+    appends reproduce a full rebuild bit for bit.
+    """
+    scores = grouped["weekly_score_mean"].astype("float64")
+    by_key = scores.groupby([grouped[key] for key in GROUP_KEYS], observed=True, sort=False)
+    state = grouped[GROUP_KEYS + ["week"]].assign(cum_submissions=history["cum_submissions"])
+    for lag, col in enumerate(SCORE_LAG_COLS):
+        state[col] = by_key.shift(lag).to_numpy()
+    return state.drop_duplicates(GROUP_KEYS, keep="last").reset_index(drop=True)
+
+
+def _seed_rows(weekly: pd.DataFrame, state: pd.DataFrame) -> pd.DataFrame:
+    """Replay carried state as leading rows so the history features continue across appends.
+
+    A missing lag and a NaN weekly score are equivalent for every history feature, so
+    groups with a short history need no special casing.
+    """
+    carried = weekly[GROUP_KEYS].drop_duplicates().merge(state, on=GROUP_KEYS, how="inner")
+    seeds = [
+        carried[GROUP_KEYS + ["week"]].assign(
+            weekly_score_mean=carried[col],
+            weekly_submissions=carried["cum_submissions"] if col == SCORE_LAG_COLS[-1] else 0.0,
+        )
+        for col in reversed(SCORE_LAG_COLS)
+    ]
+    return pd.concat(seeds, ignore_index=True)
+
+
+class FeatureStore:
+    """Week-partitioned feature rows plus the carry-over state needed to extend them."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.features_dir = root / "features"
+        self.state_dir = root / "state"
+        self.manifest_path = root / "manifest.json"
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _manifest(self) -> dict[str, int | None]:
+        return json.loads(self.manifest_path.read_text())
+
+    def _write_manifest(self, manifest: dict[str, int | None]) -> None:
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        tmp_path.replace(self.manifest_path)
+
+    def _write_part(self, features: pd.DataFrame, state: pd.DataFrame, part: int) -> None:
+        name = f"part-{part:05d}.parquet"
+        features.to_parquet(self.features_dir / name, index=False)
+        state.to_parquet(self.state_dir / name, index=False)
+
+    def _reset(self, features: pd.DataFrame, state: pd.DataFrame) -> None:
+        shutil.rmtree(self.features_dir, ignore_errors=True)
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        self.features_dir.mkdir(parents=True)
+        self.state_dir.mkdir(parents=True)
+        self._write_part(features, state, 0)
+        self._write_manifest(
+            {
+                "next_part": 1,
+                "last_week": int(features["week"].max()) if len(features) else None,
+                "rows": len(features),
+            }
+        )
+
+    def clear(self) -> None:
+        """Drop the store; the next incremental run rebuilds it from processed events."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def rebuild(self, grouped: pd.DataFrame) -> pd.DataFrame:
+        """Replace the store with features built from the full weekly aggregate history."""
+        history = _rolling_features(grouped)
+        state = carry_state(grouped, history)
+        features = add_risk_target(grouped.assign(**history))
+        self._reset(features, state)
+        logger.info("Rebuilt feature store with %s rows, %s groups", len(features), len(state))
+        return features
+
+    def load_state(self) -> pd.DataFrame:
+        """Latest carry-over state per group; later parts override earlier ones."""
+        parts = [pd.read_parquet(path) for path in sorted(self.state_dir.glob("part-*.parquet"))]
+        state = pd.concat(parts, ignore_index=True)
+        return state.drop_duplicates(GROUP_KEYS, keep="last").reset_index(drop=True)
+
+    def last_weeks(self) -> pd.DataFrame:
+        """Last stored week per (student, module) group."""
+        return self.load_state()[GROUP_KEYS + ["week"]]
+
+    def append(self, weekly: pd.DataFrame) -> int:
+        """Add feature rows for weekly aggregates that are newer than each group's state.
+
+        Only the new rows and the carried state of their groups are processed. Returns the
+        number of feature rows written.
+        """
+        if weekly.empty:
+            return 0
+        seeds = _seed_rows(weekly, self.load_state())
+        stale = seeds.merge(weekly[GROUP_KEYS + ["week"]], on=GROUP_KEYS, suffixes=("", "_new"))
+        if (stale["week_new"] <= stale["week"]).any():
+            raise ValueError(
+                "Weekly aggregates overlap weeks already in the feature store; "
+                "run `python -m src.features.store rebuild` to backfill them."
+            )
+
+        combined = pd.concat([seeds, weekly], ignore_index=True)
+        history = _rolling_features(combined)
+        state = carry_state(combined, history)
+        is_new = np.arange(len(combined)) >= len(seeds)
+        features = add_risk_target(
+            weekly.assign(**{name: values[is_new] for name, values in history.items()})
+        )
+
+        manifest = self._manifest()
+        self._write_part(features, state, int(manifest["next_part"]))
+        latest = int(features["week"].max())
+        self._write_manifest(
+            {
+                "next_part": int(manifest["next_part"]) + 1,
+                "last_week": max(latest, manifest["last_week"] or latest),
+                "rows": int(manifest["rows"]) + len(features),
+            }
+        )
+        logger.info("Appended %s feature rows for %s groups", len(features), len(state))
+        return len(features)
+
+    def load(self) -> pd.DataFrame:
+        """All stored feature rows in the same order as a full `add_time_features` build."""
+        parts = [pd.read_parquet(path) for path in sorted(self.features_dir.glob("part-*.parquet"))]
+        features = pd.concat(parts, ignore_index=True)
+        features = features.sort_values(WEEKLY_KEYS, kind="stable").reset_index(drop=True)
+        return enforce_schema(features, "features")
+
+    def compact(self) -> dict[str, int]:
+        """Fold every feature and state part into a single part each."""
+        parts = len(list(self.features_dir.glob("part-*.parquet")))
+        features, state = self.load(), self.load_state()
+        self._reset(features, state)
+        logger.info("Compacted %s feature store parts", parts)
+        return {"parts_before": parts, "rows": len(features), "groups": len(state)}
+
+    def status(self) -> dict[str, object]:
+        if not self.exists():
+            return {"root": str(self.root), "exists": False}
+        return {
+            "root": str(self.root),
+            "exists": True,
+            **self._manifest(),
+            "parts": len(list(self.features_dir.glob("part-*.parquet"))),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the incremental feature store")
+    parser.add_argument("command", choices=["compact", "rebuild", "status"])
+    args = parser.parse_args()
+
+    config = load_config()
+    store = FeatureStore(config.feature_store_dir)
+    if args.command == "compact":
+        print(json.dumps(store.compact(), indent=2))
+    elif args.command == "rebuild":
+        features = store.rebuild(
+            join_vle_features(
+                aggregate_weekly_chunks(iter_processed_events(config, config.extract_chunk_size)),
+                load_vle_weekly(config),
+            )
+        )
+        print(f"Rebuilt {config.feature_store_dir} with {len(features)} feature rows")
+    else:
+        print(json.dumps(store.status(), indent=2))
@@ -2,77 +2,84 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime
 
 import pandas as pd
 
 from src.config import PipelineConfig
 from src.etl.load import DBClient
+from src.schema import enforce_schema
+
+MART_COLS = [
+    "run_date",
+    "id_student",
+    "code_module",
+    "week",
+    "risk_score",
+    "high_risk_flag",
+    "weekly_score_mean",
+    "cum_submissions",
+]
+SAMPLE_ROWS = 500
 
 
 def build_marts(
-    predictions: pd.DataFrame, config: PipelineConfig, db: DBClient
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+    weekly_predictions: Iterable[pd.DataFrame], config: PipelineConfig, db: DBClient
+) -> tuple[int, pd.DataFrame]:
+    """Write the marts one week of predictions at a time.
+
+    Each week's rows are inserted and summarised before the next week is drawn from
+    `weekly_predictions`, so only the per-course summary and the CSV sample accumulate.
+    Returns the number of student rows written and the course summary.
+    """
     run_ts = datetime.utcnow().replace(microsecond=0)
     run_date = run_ts.date().isoformat()
-    student_risk_daily = predictions[
-        [
-            "id_student",
-            "code_module",
-            "week",
-            "risk_score",
-            "high_risk_flag",
-            "weekly_score_mean",
-            "cum_submissions",
-        ]
-    ].copy()
-    student_risk_daily["run_date"] = run_date
-    student_risk_daily = student_risk_daily[
-        [
-            "run_date",
-            "id_student",
-            "code_module",
-            "week",
-            "risk_score",
-            "high_risk_flag",
-            "weekly_score_mean",
-            "cum_submissions",
-        ]
-    ]
-
-    course_summary_daily = (
-        student_risk_daily.groupby(["run_date", "week", "code_module"], as_index=False)
-        .agg(
-            student_count=("id_student", "nunique"),
-            avg_risk_score=("risk_score", "mean"),
-            high_risk_rate=("high_risk_flag", "mean"),
+    rows = 0
+    samples: list[pd.DataFrame] = []
+    summaries: list[pd.DataFrame] = []
+    for predictions in weekly_predictions:
+        student_risk_daily = enforce_schema(
+            predictions.assign(run_date=run_date)[MART_COLS], "marts"
         )
-        .sort_values(["week", "high_risk_rate"], ascending=[True, False])
-    )
+        summaries.append(
+            student_risk_daily.groupby(
+                ["run_date", "week", "code_module"], as_index=False, observed=True
+            ).agg(
+                student_count=("id_student", "nunique"),
+                avg_risk_score=("risk_score", "mean"),
+                high_risk_rate=("high_risk_flag", "mean"),
+            )
+        )
+        db.insert_df("student_risk_daily", student_risk_daily)
 
-    db.insert_df("student_risk_daily", student_risk_daily)
-    db.insert_df("course_summary_daily", course_summary_daily)
+        if db.driver == "postgres":
+            model_scores = student_risk_daily[
+                [
+                    "run_date",
+                    "week",
+                    "id_student",
+                    "code_module",
+                    "risk_score",
+                    "high_risk_flag",
+                ]
+            ].copy()
+            model_scores["run_date"] = run_ts.isoformat()
+            model_scores["model_version"] = "v1"
+            model_scores["model_backend"] = config.model_backend
+            model_scores["threshold"] = config.high_risk_threshold
+            model_scores["created_at"] = run_ts.isoformat()
+            db.insert_df("ml.student_risk_scores", model_scores)
 
-    if db.driver == "postgres":
-        model_scores = student_risk_daily[
-            [
-                "run_date",
-                "week",
-                "id_student",
-                "code_module",
-                "risk_score",
-                "high_risk_flag",
-            ]
-        ].copy()
-        model_scores["run_date"] = run_ts.isoformat()
-        model_scores["model_version"] = "v1"
-        model_scores["model_backend"] = config.model_backend
-        model_scores["threshold"] = config.high_risk_threshold
-        model_scores["created_at"] = run_ts.isoformat()
-        db.insert_df("ml.student_risk_scores", model_scores)
+        if rows < SAMPLE_ROWS:
+            samples.append(student_risk_daily.head(SAMPLE_ROWS - rows))
+        rows += len(student_risk_daily)
 
-    student_risk_daily.head(500).to_csv(
-        config.marts_dir / "student_risk_daily_sample.csv", index=False
+    course_summary_daily = pd.concat(summaries, ignore_index=True).sort_values(
+        ["week", "high_risk_rate"], ascending=[True, False]
     )
+    db.insert_df("course_summary_daily", course_summary_daily)
+
+    pd.concat(samples).to_csv(config.marts_dir / "student_risk_daily_sample.csv", index=False)
     course_summary_daily.to_csv(config.marts_dir / "course_summary_daily_sample.csv", index=False)
-    return student_risk_daily, course_summary_daily
+    return rows, course_summary_daily
@@ -5,24 +5,43 @@ from __future__ import annotations
 import json
 
 import numpy as np
-from sklearn.metrics import auc, confusion_matrix, precision_recall_curve, roc_auc_score
+from sklearn.metrics import (
+    auc,
+    average_precision_score,
+    confusion_matrix,
+    precision_recall_curve,
+    roc_auc_score,
+)
 
 from src.config import PipelineConfig
 
 
+def ranking_metrics(y_true, probs) -> dict[str, float]:
+    """ROC AUC, the trapezoidal `pr_auc` and the step-wise `average_precision`.
+
+    The trapezoidal area interpolates linearly between PR operating points, so it shifts
+    with how tied scores fall; average precision does not interpolate.
+    """
+    precision, recall, _ = precision_recall_curve(y_true, probs)
+    return {
+        "auc": float(roc_auc_score(y_true, probs)),
+        "pr_auc": float(auc(recall, precision)),
+        "average_precision": float(average_precision_score(y_true, probs)),
+    }
+
+
 def evaluate_model(
     model: object,
     X_test,
     y_test,
     config: PipelineConfig,
     backend_hyperparams: dict,
+    walk_forward: dict | None = None,
 ) -> dict:
     probs = model.predict_proba(X_test)[:, 1]
     preds = (probs >= 0.5).astype(int)
-    precision, recall, _ = precision_recall_curve(y_test, probs)
     metrics = {
-        "auc": float(roc_auc_score(y_test, probs)),
-        "pr_auc": float(auc(recall, precision)),
+        **ranking_metrics(y_test, probs),
         "precision_at_0_5": float(
             np.sum((preds == 1) & (y_test == 1)) / max(np.sum(preds == 1), 1)
         ),
@@ -31,5 +50,7 @@ def evaluate_model(
         "model_backend": config.model_backend,
         "backend_hyperparams": backend_hyperparams,
     }
+    if walk_forward is not None:
+        metrics["walk_forward"] = walk_forward
     (config.outputs_dir / "metrics_latest.json").write_text(json.dumps(metrics, indent=2))
     return metrics
@@ -24,7 +24,8 @@ def _generate_shap_top_features(
         explainer = shap.Explainer(model.model, sample_scaled)
         shap_values = explainer(sample_scaled)
     else:
-        explainer = shap.Explainer(model, sample)
+        # Tree ensembles (hgb) are explained on raw features with shap's tree explainer.
+        explainer = shap.Explainer(getattr(model, "model", model), sample)
         shap_values = explainer(sample)
 
     plt.figure(figsize=(8, 5))
@@ -63,7 +64,7 @@ def generate_shap_artifacts(
     y_train: pd.Series,
     config: PipelineConfig,
 ) -> dict:
-    if config.model_backend == "sklearn":
+    if config.model_backend in {"sklearn", "sgd", "hgb"}:
         top_features = _generate_shap_top_features(model, X_train, config)
     else:
         top_features = _generate_permutation_top_features(model, X_train, y_train, config)
@@ -0,0 +1,147 @@
+"""Dependency-free NumPy inference for every model backend.
+
+`export_numpy_model` flattens a trained `SklearnRiskModel`, `TorchRiskModel` or
+`TensorFlowRiskModel` into one `.npz` weights file holding the standard-scaler
+statistics and a stack of dense layers with their activations. `NumpyRiskModel` replays
+that stack with batched matrix products, so scoring jobs can load a model of any backend
+without importing torch or tensorflow.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ACTIVATIONS = {
+    "linear": lambda z: z,
+    "relu": lambda z: np.maximum(z, 0),
+    # tanh form of the logistic function: accurate and overflow-free for large |z|.
+    "sigmoid": lambda z: 0.5 * (1.0 + np.tanh(0.5 * z)),
+}
+
+
+@dataclass(frozen=True)
+class DenseLayer:
+    weights: np.ndarray  # (in_features, out_features)
+    bias: np.ndarray
+    activation: str
+
+
+@dataclass(frozen=True)
+class NumpyRiskModel:
+    mean: np.ndarray
+    scale: np.ndarray
+    layers: list[DenseLayer]
+    model_backend: str
+    batch_size: int = 65_536
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.layers[0].weights.dtype
+
+    def predict_proba(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        probs = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.batch_size):
+            h = (X[start : start + self.batch_size].astype(np.float64) - self.mean) / self.scale
+            h = h.astype(self.dtype, copy=False)
+            for layer in self.layers:
+                h = ACTIVATIONS[layer.activation](h @ layer.weights + layer.bias)
+            probs[start : start + len(h)] = h.reshape(-1)
+        return np.column_stack([1 - probs, probs])
+
+
+def _sklearn_layers(model) -> list[DenseLayer]:
+    estimator = model.model
+    return [DenseLayer(estimator.coef_.T.copy(), estimator.intercept_.copy(), "sigmoid")]
+
+
+def _torch_layers(model) -> list[DenseLayer]:
+    layers: list[DenseLayer] = []
+    for module in model.model.net:
+        name = type(module).__name__
+        if name == "Linear":
+            weights = module.weight.detach().cpu().numpy().T.copy()
+            bias = module.bias.detach().cpu().numpy().copy()
+            layers.append(DenseLayer(weights, bias, "linear"))
+        elif name in {"ReLU", "Sigmoid"}:
+            layers[-1] = DenseLayer(layers[-1].weights, layers[-1].bias, name.lower())
+        elif name != "Dropout":
+            raise ValueError(f"Cannot export torch module {name} to NumPy")
+    # TorchRiskModel applies the sigmoid to the network's logits.
+    last = layers[-1]
+    layers[-1] = DenseLayer(last.weights, last.bias, "sigmoid")
+    return layers
+
+
+def _tensorflow_layers(model) -> list[DenseLayer]:
+    layers: list[DenseLayer] = []
+    for layer in model.model.layers:
+        name = type(layer).__name__
+        if name == "Dense":
+            weights, bias = layer.get_weights()
+            layers.append(DenseLayer(weights, bias, layer.activation.__name__))
+        elif name not in {"Dropout", "InputLayer"}:
+            raise ValueError(f"Cannot export Keras layer {name} to NumPy")
+    return layers
+
+
+_EXPORTERS = {
+    "SklearnRiskModel": ("sklearn", _sklearn_layers),
+    "IncrementalRiskModel": ("sgd", _sklearn_layers),
+    "TorchRiskModel": ("pytorch", _torch_layers),
+    "TensorFlowRiskModel": ("tensorflow", _tensorflow_layers),
+}
+
+
+def to_numpy_model(model: object) -> NumpyRiskModel:
+    """Flatten a backend risk model into a `NumpyRiskModel` without copying framework state."""
+    kind = type(model).__name__
+    if kind not in _EXPORTERS:
+        raise TypeError(f"No NumPy exporter for {kind}; expected one of {sorted(_EXPORTERS)}")
+    backend, layers_of = _EXPORTERS[kind]
+    layers = layers_of(model)
+    unknown = {layer.activation for layer in layers} - set(ACTIVATIONS)
+    if unknown:
+        raise ValueError(f"Unsupported activations for NumPy export: {sorted(unknown)}")
+    return NumpyRiskModel(
+        mean=model.scaler.mean_.astype(np.float64),
+        scale=model.scaler.scale_.astype(np.float64),
+        layers=layers,
+        model_backend=backend,
+    )
+
+
+def export_numpy_model(model: object, path: Path) -> NumpyRiskModel:
+    """Write `model` as a single `.npz` weights file and return its NumPy counterpart."""
+    exported = model if isinstance(model, NumpyRiskModel) else to_numpy_model(model)
+    arrays = {"mean": exported.mean, "scale": exported.scale}
+    for i, layer in enumerate(exported.layers):
+        arrays[f"layer{i}_weights"] = layer.weights
+        arrays[f"layer{i}_bias"] = layer.bias
+    tmp_path = path.with_suffix(".tmp.npz")
+    np.savez(
+        tmp_path,
+        activations=np.array([layer.activation for layer in exported.layers]),
+        model_backend=np.array(exported.model_backend),
+        **arrays,
+    )
+    tmp_path.replace(path)
+    return exported
+
+
+def load_numpy_model(path: Path) -> NumpyRiskModel:
+    with np.load(path, allow_pickle=False) as data:
+        layers = [
+            DenseLayer(data[f"layer{i}_weights"], data[f"layer{i}_bias"], str(activation))
+            for i, activation in enumerate(data["activations"])
+        ]
+        return NumpyRiskModel(
+            mean=data["mean"],
+            scale=data["scale"],
+            layers=layers,
+            model_backend=str(data["model_backend"]),
+        )
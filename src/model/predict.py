@@ -1,31 +1,215 @@
-"""Prediction utilities for full-history risk scoring and snapshot views."""
+"""Prediction utilities for full-history risk scoring and snapshot views.
+
+Scoring runs over fixed-size row chunks, optionally across a thread pool, so memory is
+bounded by the chunk size rather than the history length. A `ScoreCache` keyed by a hash
+of each feature row and the model version lets daily runs skip rows an identical model
+has already scored, so only new or changed rows reach `predict_proba`.
+"""
 
 from __future__ import annotations
 
+import json
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+from src.features.matrix import FeatureMatrix
 from src.model.train import FEATURE_COLS
+from src.schema import COLUMN_SCHEMA, enforce_schema
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class ScoreCache:
+    """Risk scores of previously seen feature rows for one model version.
+
+    Stored as `<model_version>.npz` holding sorted 64-bit row hashes and their scores;
+    files of other model versions are removed on save.
+    """
+
+    def __init__(self, root: Path, model_version: str) -> None:
+        self.root = root
+        self.path = root / f"{model_version}.npz"
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.scores = np.empty(0, dtype=np.float64)
+        if self.path.exists():
+            with np.load(self.path) as data:
+                self.hashes, self.scores = data["hashes"], data["scores"]
+        self._new: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def lookup(self, hashes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Cached scores for `hashes` (NaN where missing) and the hit mask."""
+        scores = np.full(len(hashes), np.nan)
+        if not len(self.hashes):
+            return scores, np.zeros(len(hashes), dtype=bool)
+        positions = np.searchsorted(self.hashes, hashes).clip(max=len(self.hashes) - 1)
+        hits = self.hashes[positions] == hashes
+        scores[hits] = self.scores[positions[hits]]
+        return scores, hits
+
+    def add(self, hashes: np.ndarray, scores: np.ndarray) -> None:
+        self._new.append((hashes, scores))
+
+    def save(self) -> None:
+        if self._new:
+            hashes = np.concatenate([self.hashes, *(h for h, _ in self._new)])
+            scores = np.concatenate([self.scores, *(s for _, s in self._new)])
+            self.hashes, first = np.unique(hashes, return_index=True)
+            self.scores = scores[first]
+            self._new = []
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, hashes=self.hashes, scores=self.scores)
+        tmp_path.replace(self.path)
+        for stale in self.root.glob("*.npz"):
+            if stale != self.path:
+                stale.unlink()
+
+
+def row_hashes(X: pd.DataFrame) -> np.ndarray:
+    """Stable 64-bit hash of every feature row's values."""
+    return pd.util.hash_pandas_object(X, index=False).to_numpy()
+
+
+def _score_chunk(
+    model: object, X: pd.DataFrame, cache: ScoreCache | None
+) -> tuple[np.ndarray, int]:
+    if cache is None:
+        return model.predict_proba(X)[:, 1], len(X)
+    hashes = row_hashes(X)
+    scores, hits = cache.lookup(hashes)
+    misses = ~hits
+    if misses.any():
+        scores[misses] = model.predict_proba(X[misses])[:, 1]
+        cache.add(hashes[misses], scores[misses])
+    return scores, int(misses.sum())
+
+
+def score_rows(
+    model: object,
+    values: np.ndarray,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+    cache: ScoreCache | None = None,
+) -> np.ndarray:
+    """Risk scores for the `FEATURE_COLS` rows of `values`, chunk by chunk."""
+    start = time.perf_counter()
+    chunks = [slice(lo, lo + chunk_rows) for lo in range(0, len(values), chunk_rows)]
+
+    def score(rows: slice) -> tuple[np.ndarray, int]:
+        X = pd.DataFrame(values[rows], columns=FEATURE_COLS, copy=False)
+        return _score_chunk(model, X, cache)
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(score, chunks))
+    else:
+        results = [score(rows) for rows in chunks]
+
+    risk_score = np.empty(len(values), dtype=np.float64)
+    for rows, (scores, _) in zip(chunks, results):
+        risk_score[rows] = scores
+    scored = sum(n for _, n in results)
+    if cache is not None:
+        cache.save()
+    logger.info(
+        json.dumps(
+            {
+                "event": "batch_scoring",
+                "rows": len(values),
+                "scored_rows": scored,
+                "cached_rows": len(values) - scored,
+                "chunks": len(chunks),
+                "workers": workers,
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+        )
+    )
+    return risk_score
+
+
+def iter_weekly_predictions(
+    features: pd.DataFrame,
+    risk_score: np.ndarray,
+    high_risk_threshold: float,
+) -> Iterator[pd.DataFrame]:
+    """Yield one scored frame per week, ascending, each sorted by risk descending.
+
+    The schema is applied to `features` and the score columns once, up front; each week's
+    rows are only gathered when the consumer asks for that week, so streaming consumers
+    never hold a scored copy of the full history. Without rows, a single empty scored
+    frame is yielded so consumers still see the columns.
+    """
+    features = enforce_schema(features, "predict")
+    scores = risk_score.astype(COLUMN_SCHEMA["risk_score"])
+    flags = (risk_score >= high_risk_threshold).astype(COLUMN_SCHEMA["high_risk_flag"])
+    weeks = features["week"].to_numpy()
+    order = np.argsort(weeks, kind="stable")
+    bounds = np.flatnonzero(np.diff(weeks[order])) + 1
+    for positions in np.split(order, bounds):
+        week = features.iloc[positions].assign(
+            risk_score=scores[positions], high_risk_flag=flags[positions]
+        )
+        yield week.sort_values("risk_score", ascending=False, kind="stable")
+
+
+def score_risk(
+    model: object,
+    features: pd.DataFrame,
+    matrix: FeatureMatrix | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+    cache: ScoreCache | None = None,
+) -> np.ndarray:
+    """Risk score per `features` row, in `features` order.
+
+    With `matrix`, rows are scored from its memory-mapped view and scattered back to
+    `features` order instead of slicing `features[FEATURE_COLS]` again.
+    """
+    if matrix is None:
+        return score_rows(model, features[FEATURE_COLS].to_numpy(), chunk_rows, workers, cache)
+    risk_score = np.empty(len(features), dtype=np.float64)
+    risk_score[matrix.source_row] = score_rows(model, matrix.values, chunk_rows, workers, cache)
+    return risk_score
 
 
 def predict_risk_timeseries(
-    model: object, features: pd.DataFrame, high_risk_threshold: float
+    model: object,
+    features: pd.DataFrame,
+    high_risk_threshold: float,
+    matrix: FeatureMatrix | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+    cache: ScoreCache | None = None,
 ) -> pd.DataFrame:
-    """Score risk for every weekly feature row."""
-    scored = features.copy()
-    scored["risk_score"] = model.predict_proba(scored[FEATURE_COLS])[:, 1]
-    scored["high_risk_flag"] = (scored["risk_score"] >= high_risk_threshold).astype(int)
-    return scored.sort_values(["week", "risk_score"], ascending=[True, False])
-
+    """Score risk for every weekly feature row and collect all weeks into one frame."""
+    risk_score = score_risk(model, features, matrix, chunk_rows, workers, cache)
+    return pd.concat(iter_weekly_predictions(features, risk_score, high_risk_threshold))
 
-def select_prediction_snapshot(predictions: pd.DataFrame, current_week: int | None) -> pd.DataFrame:
-    """Return latest-week snapshot, optionally overridden by CURRENT_WEEK."""
-    if predictions.empty:
-        return predictions.copy()
 
-    max_week = int(predictions["week"].max())
-    target_week = max_week if current_week is None else current_week
-    snapshot = predictions[predictions["week"] == target_week].copy()
-    if snapshot.empty:
-        snapshot = predictions[predictions["week"] == max_week].copy()
+def select_prediction_snapshot(
+    weekly_predictions: Iterable[pd.DataFrame], current_week: int | None
+) -> pd.DataFrame:
+    """Return latest-week snapshot, optionally overridden by CURRENT_WEEK.
 
-    return snapshot.sort_values("risk_score", ascending=False)
+    `weekly_predictions` is consumed in ascending week order and only up to CURRENT_WEEK
+    when that week exists, so at most two weeks are held at a time.
+    """
+    latest = None
+    for week in weekly_predictions:
+        if week.empty:
+            return week.copy()
+        latest = week
+        if current_week is not None and int(week["week"].iloc[0]) == current_week:
+            break
+    return latest.sort_values("risk_score", ascending=False)
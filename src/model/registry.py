@@ -0,0 +1,89 @@
+"""Persisted-model lookup for score-only runs and the retraining cadence.
+
+Score-only runs load the model file named in `model_metadata.json`: the NumPy export
+written by `train_model` for dense backends, so they never import torch or tensorflow,
+or the joblib file for tree ensembles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+
+import joblib
+
+from src.config import PipelineConfig
+from src.model.numpy_export import load_numpy_model
+from src.model.train import (
+    FEATURE_COLS,
+    INCREMENTAL_BACKENDS,
+    JOBLIB_MODEL_FILE,
+    NUMPY_MODEL_FILE,
+)
+
+
+def load_model_metadata(config: PipelineConfig) -> dict | None:
+    path = config.models_dir / "model_metadata.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _model_file(metadata: dict) -> str:
+    return metadata.get("model_file", NUMPY_MODEL_FILE)
+
+
+def model_version(config: PipelineConfig, metadata: dict) -> str:
+    """Content hash of the persisted model file; changes whenever the model is rewritten."""
+    digest = hashlib.sha256((config.models_dir / _model_file(metadata)).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def retrain_due(metadata: dict | None, config: PipelineConfig, now: datetime | None = None) -> bool:
+    """True when no usable model is stored or it is older than RETRAIN_EVERY_DAYS."""
+    if metadata is None or "trained_at" not in metadata:
+        return True
+    if not (config.models_dir / _model_file(metadata)).exists():
+        return True
+    if metadata.get("feature_columns") != FEATURE_COLS:
+        return True
+    if metadata.get("model_backend") != config.model_backend:
+        return True
+    trained_at = datetime.fromisoformat(metadata["trained_at"])
+    age = (now or datetime.now(timezone.utc)) - trained_at
+    return age.total_seconds() >= config.retrain_every_days * 86400
+
+
+def can_update_in_place(metadata: dict | None, config: PipelineConfig) -> bool:
+    """True when a compatible incremental model is stored that `update_model` can extend.
+
+    Such a model absorbs new weeks on every score-only run, so RETRAIN_EVERY_DAYS does
+    not apply to it.
+    """
+    return (
+        config.model_backend in INCREMENTAL_BACKENDS
+        and metadata is not None
+        and metadata.get("model_backend") == config.model_backend
+        and metadata.get("feature_columns") == FEATURE_COLS
+        and "trained_through_week" in metadata
+        and (config.models_dir / JOBLIB_MODEL_FILE).exists()
+    )
+
+
+def load_persisted_model(config: PipelineConfig) -> tuple[object, dict]:
+    """Load the persisted model and check it was trained on the current `FEATURE_COLS`."""
+    metadata = load_model_metadata(config)
+    if metadata is None or not (config.models_dir / _model_file(metadata)).exists():
+        raise FileNotFoundError(
+            f"No persisted model in {config.models_dir}; run the full pipeline first."
+        )
+    if metadata.get("feature_columns") != FEATURE_COLS:
+        raise ValueError(
+            "Persisted model was trained on different feature_columns than FEATURE_COLS: "
+            f"{metadata.get('feature_columns')} != {FEATURE_COLS}. Retrain the model."
+        )
+    model_path = config.models_dir / _model_file(metadata)
+    if model_path.name == JOBLIB_MODEL_FILE:
+        return joblib.load(model_path), metadata
+    return load_numpy_model(model_path), metadata
@@ -0,0 +1,244 @@
+"""Parallel hyperparameter search with successive-halving pruning (SEARCH_TRIALS > 0).
+
+Candidates are sampled from `SEARCH_SPACES[MODEL_BACKEND]` and scored by validation
+AUC on the time-aware split: fit on training weeks before the last VALID_WEEKS, score
+those weeks, never touching the test weeks. Trials run in a SEARCH_WORKERS process pool
+in two rungs. Rung 0 fits every candidate on only the most recent third of the fit
+weeks; the top `1 / PRUNE_FACTOR` then get the full fit weeks and the rest are recorded
+as pruned. A trial that exceeds SEARCH_TRIAL_TIMEOUT seconds is interrupted and recorded
+as timed out. Every trial lands in `outputs/experiments/hparam_trials.csv`, and the best
+configuration is handed to `train_model`, which records it in `model_metadata.json`.
+
+    python -m src.model.search --trials 12 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import itertools
+import json
+import math
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from src.config import PipelineConfig, load_config
+from src.features.matrix import FeatureMatrix, open_feature_matrix
+from src.model.evaluate import ranking_metrics
+from src.model.train import (
+    _backend_fit_inputs,
+    _get_backend_trainer,
+    _split_xy,
+    resolve_split_week,
+    usable_rows,
+)
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_SPACES: dict[str, dict[str, list]] = {
+    "sklearn": {"C": [0.01, 0.1, 1.0, 10.0, 100.0], "max_iter": [200, 1000]},
+    "sgd": {"alpha": [1e-5, 1e-4, 1e-3, 1e-2], "epochs": [1, 3, 5]},
+    "hgb": {
+        "learning_rate": [0.03, 0.1, 0.3],
+        "max_iter": [100, 300],
+        "max_leaf_nodes": [15, 31, 63],
+    },
+    "pytorch": {
+        "hidden_layers": [[16], [32, 16], [64, 32]],
+        "lr": [3e-4, 1e-3, 3e-3, 1e-2],
+        "epochs": [20, 60, 120],
+    },
+    "tensorflow": {
+        "hidden_layers": [[16], [32, 16], [64, 32]],
+        "lr": [3e-4, 1e-3, 3e-3, 1e-2],
+        "epochs": [10, 40, 80],
+    },
+}
+PRUNE_FACTOR = 3
+TRIAL_COLUMNS = [
+    "trial",
+    "rung",
+    "status",
+    "auc",
+    "pr_auc",
+    "average_precision",
+    "train_rows",
+    "seconds",
+    "params",
+]
+
+
+class TrialTimeout(Exception):
+    pass
+
+
+def sample_candidates(backend: str, n_trials: int, seed: int) -> list[dict]:
+    """Up to `n_trials` distinct configurations drawn from the backend's grid."""
+    if backend not in SEARCH_SPACES:
+        raise ValueError(
+            f"Unsupported MODEL_BACKEND='{backend}' for search. "
+            f"Valid options: {sorted(SEARCH_SPACES)}"
+        )
+    space = SEARCH_SPACES[backend]
+    grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    order = np.random.default_rng(seed).permutation(len(grid))
+    return [grid[i] for i in order[:n_trials]]
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise TrialTimeout
+
+
+def run_trial(
+    matrix: FeatureMatrix,
+    params: dict,
+    fit_start: int,
+    valid_start: int,
+    valid_stop: int,
+    config: PipelineConfig,
+) -> dict:
+    """Fit on weeks [fit_start, valid_start) with `params` and score the validation weeks."""
+    start = time.perf_counter()
+    complete = usable_rows(matrix, config.model_backend)
+    X_fit, y_fit = _split_xy(matrix, matrix.week_rows(fit_start, valid_start), complete)
+    X_valid, y_valid = _split_xy(matrix, matrix.week_rows(valid_start, valid_stop), complete)
+    # Backend runtime options (batch size, threads, tf.data) without early stopping.
+    no_stopping = dataclasses.replace(config, early_stopping_patience=0)
+    kwargs = _backend_fit_inputs(matrix, valid_start, complete, no_stopping, fit_start)
+    trial = {"train_rows": len(X_fit), "auc": None, "pr_auc": None, "average_precision": None}
+
+    # SIGALRM interrupts the trial between Python-level steps of any backend's fit loop.
+    timed = (
+        config.search_trial_timeout > 0 and threading.current_thread() is threading.main_thread()
+    )
+    if timed:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    try:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, config.search_trial_timeout)
+        trainer = _get_backend_trainer(config.model_backend)
+        model, _ = trainer(X_fit, y_fit, config.random_seed, config.demo_mode, **kwargs, **params)
+        if y_fit.nunique() > 1 and y_valid.nunique() > 1:
+            trial.update(ranking_metrics(y_valid, model.predict_proba(X_valid)[:, 1]))
+        trial["status"] = "complete"
+    except TrialTimeout:
+        trial["status"] = "timeout"
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    trial["seconds"] = round(time.perf_counter() - start, 3)
+    return trial
+
+
+def _run_rung(
+    matrix: FeatureMatrix,
+    candidates: list[dict],
+    fit_start: int,
+    valid_start: int,
+    valid_stop: int,
+    config: PipelineConfig,
+) -> list[dict]:
+    workers = min(config.search_workers, len(candidates))
+    if workers <= 1:
+        return [
+            run_trial(matrix, params, fit_start, valid_start, valid_stop, config)
+            for params in candidates
+        ]
+    # Deep-learning runtimes are not fork-safe once initialised; spawn fresh workers.
+    context = None if config.model_backend == "sklearn" else multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(
+            executor.map(
+                run_trial,
+                repeat(matrix),
+                candidates,
+                repeat(fit_start),
+                repeat(valid_start),
+                repeat(valid_stop),
+                repeat(config),
+            )
+        )
+
+
+def hyperparameter_search(matrix: FeatureMatrix, config: PipelineConfig) -> dict:
+    """Search on the weeks before the time-aware split and write the trials table."""
+    split_week = resolve_split_week(matrix, config)
+    weeks = sorted(week for week in matrix.week_index if week < split_week)
+    valid_start = split_week - config.valid_weeks
+    fit_weeks = [week for week in weeks if week < valid_start]
+    if not fit_weeks or valid_start >= split_week:
+        raise ValueError(
+            f"Hyperparameter search needs training weeks before and after week {valid_start} "
+            f"(SPLIT_WEEK={split_week}, VALID_WEEKS={config.valid_weeks})."
+        )
+
+    start = time.perf_counter()
+    candidates = sample_candidates(config.model_backend, config.search_trials, config.random_seed)
+    rung0_start = fit_weeks[-math.ceil(len(fit_weeks) / PRUNE_FACTOR)]
+    rung0 = _run_rung(matrix, candidates, rung0_start, valid_start, split_week, config)
+
+    ranked = sorted(
+        (i for i, trial in enumerate(rung0) if trial["auc"] is not None),
+        key=lambda i: rung0[i]["auc"],
+        reverse=True,
+    )
+    survivors = ranked[: math.ceil(len(candidates) / PRUNE_FACTOR)]
+    rung1 = _run_rung(
+        matrix, [candidates[i] for i in survivors], fit_weeks[0], valid_start, split_week, config
+    )
+
+    rows = []
+    for i, trial in enumerate(rung0):
+        status = trial["status"] if trial["status"] != "complete" or i in survivors else "pruned"
+        rows.append({"trial": i, "rung": 0, **trial, "status": status})
+    rows += [{"trial": i, "rung": 1, **trial} for i, trial in zip(survivors, rung1)]
+    trials = pd.DataFrame(rows)
+    trials["params"] = [json.dumps(candidates[i]) for i in trials["trial"]]
+    trials = trials[TRIAL_COLUMNS]
+    trials_path = config.experiments_dir / "hparam_trials.csv"
+    trials.to_csv(trials_path, index=False)
+
+    final = trials[(trials["rung"] == 1) & trials["auc"].notna()]
+    if final.empty:
+        raise ValueError(f"No search trial completed with a usable score; see {trials_path}")
+    best = final.loc[final["auc"].idxmax()]
+    summary = {
+        "best_params": candidates[int(best["trial"])],
+        "best_valid_auc": float(best["auc"]),
+        "best_valid_pr_auc": float(best["pr_auc"]),
+        "best_valid_average_precision": float(best["average_precision"]),
+        "n_trials": len(candidates),
+        "n_pruned": int((trials["status"] == "pruned").sum()),
+        "n_timeout": int((trials["status"] == "timeout").sum()),
+        "valid_weeks": [valid_start, split_week - 1],
+        "trials_path": str(trials_path),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(json.dumps({"event": "hyperparameter_search", **summary}))
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter search over the feature matrix")
+    parser.add_argument("--trials", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    config = load_config()
+    config = dataclasses.replace(
+        config,
+        search_trials=args.trials or config.search_trials or 12,
+        search_workers=args.workers or config.search_workers,
+    )
+    config.experiments_dir.mkdir(parents=True, exist_ok=True)
+    matrix = open_feature_matrix(config.feature_matrix_dir)
+    print(json.dumps(hyperparameter_search(matrix, config), indent=2))
@@ -0,0 +1,304 @@
+"""Warm-model HTTP scoring service for on-demand risk scores.
+
+The persisted model (the same file `--score-only` runs use) is loaded once. Request
+threads hand their rows to a `MicroBatcher`, which waits up to SERVE_MAX_WAIT_MS for
+concurrent requests, stacks them into one batch of at most SERVE_MAX_BATCH_ROWS rows and
+calls `predict_proba` once for the whole batch. Endpoints:
+
+    POST /score    {"features": {...}} for one row or {"rows": [{...}, ...]} for many
+    GET  /metrics  latency percentiles (ms), throughput and micro-batch sizes
+    GET  /health   model backend and version
+
+    python -m src.model.serve --port 8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from src.config import PipelineConfig, load_config
+from src.model.registry import load_persisted_model, model_version
+from src.model.train import FEATURE_COLS, NAN_NATIVE_BACKENDS
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_WINDOW = 10_000
+
+
+class MicroBatcher:
+    """Groups rows from concurrent requests into single `predict_proba` calls."""
+
+    def __init__(self, model: object, max_batch_rows: int, max_wait_ms: float) -> None:
+        self.model = model
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.batched_rows = 0
+        self._queue: queue.Queue[tuple[np.ndarray, Future] | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, values: np.ndarray) -> Future:
+        future: Future = Future()
+        self._queue.put((values, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            rows = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch_rows:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                pending.append(item)
+                rows += len(item[0])
+            self._score(pending)
+
+    def _score(self, pending: list[tuple[np.ndarray, Future]]) -> None:
+        try:
+            X = pd.DataFrame(
+                np.concatenate([values for values, _ in pending]), columns=FEATURE_COLS
+            )
+            scores = self.model.predict_proba(X)[:, 1]
+        except Exception as exc:  # surfaced to every waiting request
+            for _, future in pending:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.batched_rows += len(X)
+        bounds = np.cumsum([len(values) for values, _ in pending])[:-1]
+        for (_, future), part in zip(pending, np.split(scores, bounds)):
+            future.set_result(part)
+
+
+class ServingMetrics:
+    """Request latencies over a sliding window plus lifetime request and row counts."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, rows: int, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += rows
+            self._latencies.append(seconds * 1000)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self, batcher: MicroBatcher) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies)
+            uptime = time.perf_counter() - self.started
+            stats = {
+                "requests": self.requests,
+                "rows": self.rows,
+                "errors": self.errors,
+                "uptime_seconds": round(uptime, 3),
+                "requests_per_second": round(self.requests / uptime, 2),
+                "rows_per_second": round(self.rows / uptime, 2),
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            stats["latency_ms"] = {
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(latencies.max()), 3),
+            }
+        stats["batches"] = batcher.batches
+        stats["mean_batch_rows"] = round(batcher.batched_rows / max(batcher.batches, 1), 2)
+        return stats
+
+
+def parse_payload(payload: object, allow_nan: bool = False) -> np.ndarray:
+    """Feature rows of a `/score` body as a float array in `FEATURE_COLS` order.
+
+    JSON nulls become NaN, which only `allow_nan` (a NaN-native backend) accepts; a
+    missing feature, a non-numeric or infinite value, or a disallowed NaN raises
+    ValueError.
+    """
+    if isinstance(payload, dict) and "rows" in payload:
+        rows = payload["rows"]
+    elif isinstance(payload, dict) and "features" in payload:
+        rows = [payload["features"]]
+    else:
+        raise ValueError('Expected {"features": {...}} or {"rows": [{...}, ...]}')
+    if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+        raise ValueError("Expected a non-empty list of feature objects")
+    missing = sorted({col for row in rows for col in FEATURE_COLS if col not in row})
+    if missing:
+        raise ValueError(f"Missing feature columns: {missing}")
+    values = [[np.nan if row[col] is None else row[col] for col in FEATURE_COLS] for row in rows]
+    try:
+        array = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Feature values must be numeric: {exc}") from exc
+    if np.isinf(array).any():
+        raise ValueError("Feature values must be finite")
+    if not allow_nan and np.isnan(array).any():
+        raise ValueError(
+            "Null or NaN feature values are only accepted by NaN-native backends: "
+            f"{sorted(NAN_NATIVE_BACKENDS)}"
+        )
+    return array
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connection bursts into one-second SYN retries.
+    request_queue_size = 128
+
+    def __init__(
+        self, address: tuple[str, int], model: object, metadata: dict, config: PipelineConfig
+    ) -> None:
+        super().__init__(address, ScoringHandler)
+        self.metadata = metadata
+        # Other backends were trained on complete rows only and would score NaN as NaN.
+        self.allow_nan = metadata.get("model_backend") in NAN_NATIVE_BACKENDS
+        self.version = model_version(config, metadata)
+        self.threshold = config.high_risk_threshold
+        self.batcher = MicroBatcher(model, config.serve_max_batch_rows, config.serve_max_wait_ms)
+        self.metrics = ServingMetrics()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.batcher.close()
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    server: ScoringServer
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._send(200, self.server.metrics.snapshot(self.server.batcher))
+        elif self.path == "/health":
+            self._send(
+                200,
+                {
+                    "status": "ok",
+                    "model_backend": self.server.metadata.get("model_backend"),
+                    "model_version": self.server.version,
+                },
+            )
+        else:
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path != "/score":
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        start = time.perf_counter()
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            values = parse_payload(json.loads(body), self.server.allow_nan)
+        except ValueError as exc:  # includes malformed JSON
+            self.server.metrics.record_error()
+            self._send(400, {"error": str(exc)})
+            return
+        try:
+            scores = self.server.batcher.submit(values).result()
+            if not np.isfinite(scores).all():
+                raise ValueError("Model returned a non-finite risk score")
+        except Exception as exc:
+            self.server.metrics.record_error()
+            self._send(500, {"error": str(exc)})
+            return
+        self.server.metrics.record(len(values), time.perf_counter() - start)
+        self._send(
+            200,
+            {
+                "risk_scores": scores.tolist(),
+                "high_risk_flags": (scores >= self.server.threshold).astype(int).tolist(),
+                "model_version": self.server.version,
+            },
+        )
+
+    def _send(self, status: int, payload: dict) -> None:
+        # Bare NaN/Infinity tokens are not JSON; refuse to emit them rather than send a 200.
+        body = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # Per-request access lines would swamp the JSON log; /metrics aggregates them.
+        pass
+
+
+def make_server(config: PipelineConfig) -> ScoringServer:
+    """Load the persisted model once and bind a scoring server to SERVE_HOST:SERVE_PORT."""
+    model, metadata = load_persisted_model(config)
+    return ScoringServer((config.serve_host, config.serve_port), model, metadata, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the persisted risk model over HTTP")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--max-batch-rows", type=int, default=None)
+    parser.add_argument("--max-wait-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    config = load_config()
+    overrides = {
+        "serve_host": args.host,
+        "serve_port": args.port,
+        "serve_max_batch_rows": args.max_batch_rows,
+        "serve_max_wait_ms": args.max_wait_ms,
+    }
+    config = dataclasses.replace(
+        config, **{key: value for key, value in overrides.items() if value is not None}
+    )
+    server = make_server(config)
+    host, port = server.server_address[:2]
+    logger.info(
+        json.dumps(
+            {
+                "event": "scoring_service_started",
+                "url": f"http://{host}:{port}",
+                "model_version": server.version,
+                "max_batch_rows": config.serve_max_batch_rows,
+                "max_wait_ms": config.serve_max_wait_ms,
+            }
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timezone
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
 
 from src.config import PipelineConfig
+from src.etl.vle import VLE_FEATURE_COLS
+from src.features.matrix import FeatureMatrix
+from src.model.numpy_export import export_numpy_model
+from src.model.train_hgb import train_hgb
+from src.model.train_sgd import iter_matrix_chunks, train_sgd
 from src.model.train_sklearn import train_sklearn
 
 FEATURE_COLS = [
@@ -21,12 +28,25 @@ FEATURE_COLS = [
     "cum_submissions",
     "rolling_score_3w",
     "score_trend_2w",
+    *VLE_FEATURE_COLS,
 ]
+NUMPY_MODEL_FILE = "risk_model.npz"
+JOBLIB_MODEL_FILE = "risk_model.joblib"
+# Backends that split on missing values themselves, so incomplete rows stay in training.
+NAN_NATIVE_BACKENDS = {"hgb"}
+# Tree ensembles have no dense-layer NumPy export; score-only runs load their joblib file.
+JOBLIB_ONLY_BACKENDS = {"hgb"}
+# Backends whose persisted joblib state can absorb new weeks with `update_model`.
+INCREMENTAL_BACKENDS = {"sgd"}
 
 
 def _get_backend_trainer(backend: str):
     if backend == "sklearn":
         return train_sklearn
+    if backend == "hgb":
+        return train_hgb
+    if backend == "sgd":
+        return train_sgd
     if backend == "pytorch":
         try:
             from src.model.train_torch import train_torch
@@ -48,29 +68,117 @@ def _get_backend_trainer(backend: str):
 
     raise ValueError(
         f"Unsupported MODEL_BACKEND='{backend}'. "
-        "Valid options: ['pytorch', 'sklearn', 'tensorflow']"
+        "Valid options: ['hgb', 'pytorch', 'sgd', 'sklearn', 'tensorflow']"
     )
 
 
+def usable_rows(matrix: FeatureMatrix, backend: str) -> np.ndarray:
+    """Rows the backend can train and evaluate on: complete rows unless it handles NaN."""
+    if backend in NAN_NATIVE_BACKENDS:
+        return np.ones(len(matrix), dtype=bool)
+    return ~np.isnan(matrix.values).any(axis=1)
+
+
+def _split_xy(
+    matrix: FeatureMatrix, rows: slice, complete: np.ndarray
+) -> tuple[pd.DataFrame, pd.Series]:
+    X, y = matrix.frame(rows), matrix.target_series(rows)
+    keep = complete[rows]
+    if keep.all():
+        return X, y
+    return X[keep], y[keep]
+
+
+def _row_mask(matrix: FeatureMatrix, rows: slice, complete: np.ndarray) -> np.ndarray:
+    """Boolean mask over the whole matrix selecting the usable rows of `rows`."""
+    mask = np.zeros(len(matrix), dtype=bool)
+    mask[rows] = complete[rows]
+    return mask
+
+
+def _backend_fit_inputs(
+    matrix: FeatureMatrix,
+    split_week: int,
+    complete: np.ndarray,
+    config: PipelineConfig,
+    fit_start: int | None = None,
+) -> dict:
+    """Backend-specific trainer options for fitting on weeks [fit_start, split_week).
+
+    SGD, PyTorch and TensorFlow read their training rows from the matrix itself through
+    boolean row masks instead of a fit DataFrame, next to their chunk size, batch size and
+    threads or tf.data parallelism. With EARLY_STOPPING_PATIENCE the last
+    VALID_WEEKS fit weeks become the validation mask and the model is fit on the weeks
+    before them.
+    """
+    if config.model_backend == "hgb":
+        return {"threads": config.hgb_threads}
+    if config.model_backend == "sgd":
+        return {
+            "chunk_rows": config.sgd_chunk_rows,
+            "matrix": matrix,
+            "rows": _row_mask(matrix, matrix.week_rows(start=fit_start, stop=split_week), complete),
+        }
+    if config.model_backend == "tensorflow":
+        kwargs = {
+            "chunk_rows": config.tf_data_chunk_rows,
+            "parallelism": config.tf_data_parallelism,
+        }
+    elif config.model_backend == "pytorch":
+        kwargs = {"batch_size": config.torch_batch_size, "num_threads": config.torch_num_threads}
+    else:
+        return {}
+    kwargs.update(
+        matrix=matrix,
+        rows=_row_mask(matrix, matrix.week_rows(start=fit_start, stop=split_week), complete),
+    )
+    first_week = int(matrix.week[0]) if fit_start is None else fit_start
+    valid_start = split_week - config.valid_weeks
+    if config.early_stopping_patience <= 0 or valid_start <= first_week:
+        return kwargs
+
+    kwargs.update(
+        rows=_row_mask(matrix, matrix.week_rows(start=fit_start, stop=valid_start), complete),
+        valid_rows=_row_mask(
+            matrix, matrix.week_rows(start=valid_start, stop=split_week), complete
+        ),
+        patience=config.early_stopping_patience,
+    )
+    return kwargs
+
+
+def resolve_split_week(matrix: FeatureMatrix, config: PipelineConfig) -> int:
+    """SPLIT_WEEK, or the 70% week quantile when it leaves either side of the split empty."""
+    weeks = matrix.week[usable_rows(matrix, config.model_backend)]
+    split_week = min(config.split_week, int(weeks.max()))
+    if not (weeks < split_week).any() or not (weeks >= split_week).any():
+        split_week = int(np.quantile(weeks, 0.7))
+    return split_week
+
+
 def train_model(
-    features: pd.DataFrame, config: PipelineConfig
+    matrix: FeatureMatrix, config: PipelineConfig, search: dict | None = None
 ) -> tuple[object, pd.DataFrame, pd.Series, pd.DataFrame, pd.Series, dict]:
-    model_df = features.dropna(subset=FEATURE_COLS + ["target_high_risk"]).copy()
+    """Train on a time-aware split of the memory-mapped feature matrix.
 
-    split_week = min(config.split_week, int(model_df["week"].max()))
-    train_df = model_df[model_df["week"] < split_week]
-    test_df = model_df[model_df["week"] >= split_week]
-    if train_df.empty or test_df.empty:
-        split_week = int(model_df["week"].quantile(0.7))
-        train_df = model_df[model_df["week"] < split_week]
-        test_df = model_df[model_df["week"] >= split_week]
+    Rows are week-ordered, so both sides of the split are views into the mapping unless
+    rows with missing features have to be dropped. With a `hyperparameter_search`
+    summary the trainer receives its best parameters.
+    """
+    complete = usable_rows(matrix, config.model_backend)
+    split_week = resolve_split_week(matrix, config)
 
-    X_train, y_train = train_df[FEATURE_COLS], train_df["target_high_risk"]
-    X_test, y_test = test_df[FEATURE_COLS], test_df["target_high_risk"]
+    X_train, y_train = _split_xy(matrix, matrix.week_rows(stop=split_week), complete)
+    X_test, y_test = _split_xy(matrix, matrix.week_rows(start=split_week), complete)
 
     trainer = _get_backend_trainer(config.model_backend)
+    trainer_kwargs = _backend_fit_inputs(matrix, split_week, complete, config)
+    if search is not None:
+        trainer_kwargs.update(search["best_params"])
     try:
-        model, backend_params = trainer(X_train, y_train, config.random_seed, config.demo_mode)
+        model, backend_params = trainer(
+            X_train, y_train, config.random_seed, config.demo_mode, **trainer_kwargs
+        )
     except ImportError as exc:
         if config.model_backend == "pytorch":
             raise ImportError(
@@ -82,17 +190,72 @@ def train_model(
             ) from exc
         raise
 
-    if config.model_backend == "sklearn":
-        joblib.dump(model, config.models_dir / "risk_model.joblib")
-
     metadata = {
         "model_backend": config.model_backend,
         "feature_columns": FEATURE_COLS,
         "random_seed": config.random_seed,
         "split_week": split_week,
-        "train_rows": len(train_df),
-        "test_rows": len(test_df),
+        "trained_through_week": split_week - 1,
+        # metrics_latest.json scores the model as trained through this week.
+        "evaluated_through_week": split_week - 1,
+        "train_rows": len(X_train),
+        "test_rows": len(X_test),
         "backend_hyperparams": backend_params,
+        "hyperparameter_search": search,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
     }
-    Path(config.models_dir / "model_metadata.json").write_text(json.dumps(metadata, indent=2))
+    _persist_model(model, metadata, config)
     return model, X_train, y_train, X_test, y_test, metadata
+
+
+def _persist_model(model: object, metadata: dict, config: PipelineConfig) -> None:
+    # Never leave a model from another backend behind for score-only runs to pick up.
+    joblib_path = config.models_dir / JOBLIB_MODEL_FILE
+    numpy_path = config.models_dir / NUMPY_MODEL_FILE
+    if config.model_backend in {"sklearn", *JOBLIB_ONLY_BACKENDS, *INCREMENTAL_BACKENDS}:
+        joblib.dump(model, joblib_path)
+    else:
+        joblib_path.unlink(missing_ok=True)
+    if config.model_backend in JOBLIB_ONLY_BACKENDS:
+        numpy_path.unlink(missing_ok=True)
+        metadata["model_file"] = JOBLIB_MODEL_FILE
+    else:
+        # Framework-free weights; score-only runs load this file.
+        export_numpy_model(model, numpy_path)
+        metadata["model_file"] = NUMPY_MODEL_FILE
+    Path(config.models_dir / "model_metadata.json").write_text(json.dumps(metadata, indent=2))
+
+
+def update_model(
+    matrix: FeatureMatrix, config: PipelineConfig, metadata: dict
+) -> tuple[object, dict]:
+    """Fold weeks after `trained_through_week` into the persisted incremental model.
+
+    The new rows stream through `partial_fit` in week order, so the cost and memory of an
+    update depend only on the new weeks, not on the training history.
+
+    The first update folds in the held-out test weeks, so `split_week` and `test_rows` are
+    dropped from the metadata; `evaluated_through_week` keeps the week the stored
+    evaluation metrics refer to, which now lags `trained_through_week`.
+    """
+    model = joblib.load(config.models_dir / JOBLIB_MODEL_FILE)
+    rows = matrix.week_rows(start=int(metadata["trained_through_week"]) + 1)
+    if rows.stop == rows.start:
+        return model, metadata
+
+    chunks = iter_matrix_chunks(
+        matrix, rows, usable_rows(matrix, config.model_backend), config.sgd_chunk_rows
+    )
+    added = model.partial_update(chunks)
+    evaluated_through_week = metadata.get(
+        "evaluated_through_week", int(metadata["trained_through_week"])
+    )
+    metadata = {
+        **{k: v for k, v in metadata.items() if k not in ("split_week", "test_rows")},
+        "evaluated_through_week": evaluated_through_week,
+        "trained_through_week": int(matrix.week[rows.stop - 1]),
+        "incremental_rows": int(metadata.get("incremental_rows", 0)) + added,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _persist_model(model, metadata, config)
+    return model, metadata
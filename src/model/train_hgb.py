@@ -0,0 +1,58 @@
+"""Histogram gradient-boosting backend training (MODEL_BACKEND=hgb).
+
+`HistGradientBoostingClassifier` bins features into histograms and builds trees with
+OpenMP threads. It splits on missing values natively, so it needs no scaler, and rows
+with missing features are kept for training. HGB_THREADS caps the OpenMP pool for fit
+and predict (0 uses every core).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from threadpoolctl import threadpool_limits
+
+
+@dataclass
+class HGBRiskModel:
+    model: HistGradientBoostingClassifier
+    threads: int = 0
+
+    def predict_proba(self, X: pd.DataFrame):
+        with threadpool_limits(limits=self.threads or None, user_api="openmp"):
+            return self.model.predict_proba(X)
+
+
+def train_hgb(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    random_seed: int,
+    demo_mode: bool = False,
+    threads: int = 0,
+    learning_rate: float = 0.1,
+    max_iter: int | None = None,
+    max_leaf_nodes: int = 31,
+):
+    if max_iter is None:
+        max_iter = 50 if demo_mode else 200
+    model = HistGradientBoostingClassifier(
+        learning_rate=learning_rate,
+        max_iter=max_iter,
+        max_leaf_nodes=max_leaf_nodes,
+        early_stopping="auto",
+        random_state=random_seed,
+    )
+    with threadpool_limits(limits=threads or None, user_api="openmp"):
+        model.fit(X_train, y_train)
+    params = {
+        "model_type": "HistGradientBoostingClassifier",
+        "learning_rate": learning_rate,
+        "max_iter": max_iter,
+        "n_iter": int(model.n_iter_),
+        "max_leaf_nodes": max_leaf_nodes,
+        "threads": threads or "all",
+        "random_seed": random_seed,
+    }
+    return HGBRiskModel(model=model, threads=threads), params
@@ -0,0 +1,140 @@
+"""Out-of-core incremental backend (MODEL_BACKEND=sgd).
+
+A logistic-loss `SGDClassifier` and a running `StandardScaler` are fitted with
+`partial_fit` on row chunks of at most SGD_CHUNK_ROWS rows, streamed in week order from
+the memory-mapped feature matrix through a boolean mask of the training rows. Rows the
+mask drops (e.g. those with a missing feature) are filtered per chunk, and only one
+chunk is ever scaled in memory, so training memory stays flat however many weeks of history there are. Because both the scaler and
+the model keep their running state, a persisted model can absorb newly arrived weeks in
+place (`update_model`) instead of being retrained from scratch.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.features.matrix import FeatureMatrix
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+@dataclass
+class IncrementalRiskModel:
+    model: SGDClassifier
+    scaler: StandardScaler
+    rows_seen: int = 0
+
+    def predict_proba(self, X: pd.DataFrame):
+        # The running scaler is fitted on bare chunk arrays, so score arrays too.
+        return self.model.predict_proba(self.scaler.transform(np.asarray(X)))
+
+    def fit_scaler(self, chunks: Iterable[tuple[np.ndarray, np.ndarray]]) -> int:
+        """Fold `(X, y)` chunks into the running scaler only; returns rows consumed."""
+        rows = 0
+        for X, _ in chunks:
+            if len(X):
+                self.scaler.partial_fit(X)
+                rows += len(X)
+        self.rows_seen += rows
+        return rows
+
+    def partial_update(
+        self, chunks: Iterable[tuple[np.ndarray, np.ndarray]], update_scaler: bool = True
+    ) -> int:
+        """Fold `(X, y)` chunks into the running scaler and model; returns rows consumed.
+
+        With `update_scaler=False` the chunks are another pass over rows the scaler has
+        already absorbed: only the model learns from them and `rows_seen` is unchanged.
+        """
+        rows = 0
+        for X, y in chunks:
+            if len(X) == 0:
+                continue
+            if update_scaler:
+                self.scaler.partial_fit(X)
+            self.model.partial_fit(self.scaler.transform(X), y, classes=np.array([0, 1]))
+            rows += len(X)
+        if update_scaler:
+            self.rows_seen += rows
+        return rows
+
+
+def iter_frame_chunks(
+    X: pd.DataFrame, y: pd.Series, chunk_rows: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Consecutive row chunks of `X`/`y`; views when `X` is a slice of the feature matrix."""
+    for start in range(0, len(X), chunk_rows):
+        yield X.iloc[start : start + chunk_rows].to_numpy(), y.iloc[start : start + chunk_rows]
+
+
+def mask_span(mask: np.ndarray) -> slice:
+    """Smallest row slice holding every row selected by the boolean `mask`."""
+    if not mask.any():
+        return slice(0, 0)
+    return slice(int(mask.argmax()), len(mask) - int(mask[::-1].argmax()))
+
+
+def iter_matrix_chunks(
+    matrix: FeatureMatrix, rows: slice, usable: np.ndarray, chunk_rows: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Week-ordered chunks of `matrix` rows, skipping rows the backend cannot use.
+
+    Chunks are views into the mapping unless `usable` drops rows from them.
+    """
+    start, stop, _ = rows.indices(len(matrix))
+    for lo in range(start, stop, chunk_rows):
+        chunk = slice(lo, min(lo + chunk_rows, stop))
+        keep = usable[chunk]
+        if keep.all():
+            yield matrix.values[chunk], matrix.target[chunk]
+        else:
+            yield matrix.values[chunk][keep], matrix.target[chunk][keep]
+
+
+def train_sgd(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    random_seed: int,
+    demo_mode: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    matrix: FeatureMatrix | None = None,
+    rows: np.ndarray | None = None,
+    alpha: float = 1e-4,
+    epochs: int = 1,
+):
+    """Fit the scaler in one streaming pass, then run `epochs` passes of `partial_fit`.
+
+    Given the feature `matrix`, chunks come straight from the mapping and the boolean
+    `rows` mask selects the training rows, so `X_train`/`y_train` are ignored.
+    """
+    del demo_mode
+
+    def chunks() -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        if matrix is None:
+            return iter_frame_chunks(X_train, y_train, chunk_rows)
+        return iter_matrix_chunks(matrix, mask_span(rows), rows, chunk_rows)
+
+    model = IncrementalRiskModel(
+        model=SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_seed),
+        scaler=StandardScaler(),
+    )
+    # One pass fixes the scaling before any epoch, so every epoch sees identically scaled
+    # rows and `rows_seen` counts each training row once.
+    model.fit_scaler(chunks())
+    for _ in range(epochs):
+        model.partial_update(chunks(), update_scaler=False)
+    params = {
+        "model_type": "SGDClassifier",
+        "loss": "log_loss",
+        "alpha": alpha,
+        "epochs": epochs,
+        "chunk_rows": chunk_rows,
+        "random_seed": random_seed,
+    }
+    return model, params
@@ -24,15 +24,18 @@ def train_sklearn(
     y_train: pd.Series,
     random_seed: int,
     demo_mode: bool = False,
+    C: float = 1.0,
+    max_iter: int = 1000,
 ):
     del demo_mode
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
-    model = LogisticRegression(max_iter=1000, random_state=random_seed)
+    model = LogisticRegression(C=C, max_iter=max_iter, random_state=random_seed)
     model.fit(X_train_scaled, y_train)
     params = {
         "model_type": "LogisticRegression",
-        "max_iter": 1000,
+        "C": C,
+        "max_iter": max_iter,
         "random_seed": random_seed,
     }
     return SklearnRiskModel(model=model, scaler=scaler), params
@@ -1,22 +1,161 @@
-"""TensorFlow backend training."""
+"""TensorFlow backend training.
+
+Training and inference stream through a `tf.data` pipeline instead of handing Keras one
+in-memory array: row chunks are read by parallel `numpy_function` calls, scaled in-graph,
+re-batched and prefetched. Training reads the memory-mapped feature matrix directly and
+drops unusable rows per chunk through a boolean row mask, and the scaler is fitted in a
+streaming pass over the same chunks, so no copy of the training rows is made. Inference
+streams whatever rows it is given; a `FeatureMatrix.frame` view keeps that zero-copy too.
+Each phase logs a `tf_data_phase` event with its throughput and the process peak RSS.
+"""
 
 from __future__ import annotations
 
+import json
+import resource
+import sys
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
+from src.features.matrix import FeatureMatrix
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_ROWS = 8192
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux.
+    return round(peak / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def _log_phase(phase: str, rows: int, seconds: float) -> dict:
+    stats = {
+        "phase": phase,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / max(seconds, 1e-9)),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    logger.info(json.dumps({"event": "tf_data_phase", **stats}))
+    return stats
+
+
+def _chunk_reader(
+    values: np.ndarray,
+    targets: np.ndarray | None,
+    chunk_rows: int,
+    mask: np.ndarray | None = None,
+) -> tuple[int, Callable[[int], tuple[np.ndarray, np.ndarray]]]:
+    """Chunk count plus a reader returning chunk `index` as float32 `(X, y)`.
+
+    With a boolean `mask` only the span between its first and last selected row is
+    chunked, and each chunk keeps just its selected rows.
+    """
+    start, stop = 0, len(values)
+    if mask is not None:
+        if mask.any():
+            start, stop = int(mask.argmax()), len(mask) - int(mask[::-1].argmax())
+        else:
+            stop = 0
+
+    def read_chunk(index) -> tuple[np.ndarray, np.ndarray]:
+        lo = start + int(index) * chunk_rows
+        rows = slice(lo, min(lo + chunk_rows, stop))
+        X = np.asarray(values[rows], dtype=np.float32)
+        y = np.zeros(len(X), np.float32) if targets is None else targets[rows]
+        y = np.asarray(y, dtype=np.float32)
+        if mask is not None:
+            keep = mask[rows]
+            X, y = X[keep], y[keep]
+        return X, y
+
+    return -(-(stop - start) // chunk_rows), read_chunk
+
+
+def make_dataset(
+    values: np.ndarray,
+    targets: np.ndarray | None,
+    scaler: StandardScaler,
+    batch_size: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    parallelism: int = 0,
+    seed: int | None = None,
+    mask: np.ndarray | None = None,
+):
+    """Batched, prefetching `tf.data.Dataset` over row chunks of `values`.
+
+    With `seed` the chunk order and the rows inside a shuffle buffer of one chunk are
+    reshuffled every epoch; without it rows keep their order, as inference requires.
+    A boolean `mask` limits the dataset to the selected rows. `parallelism=0` lets
+    tf.data autotune the number of concurrent chunk reads.
+    """
+    import tensorflow as tf
+
+    n_features = values.shape[1]
+    n_chunks, read_chunk = _chunk_reader(values, targets, chunk_rows, mask)
+    calls = parallelism if parallelism > 0 else tf.data.AUTOTUNE
+    mean = tf.constant(scaler.mean_, dtype=tf.float32)
+    scale = tf.constant(scaler.scale_, dtype=tf.float32)
+
+    def load(index):
+        X, y = tf.numpy_function(read_chunk, [index], [tf.float32, tf.float32])
+        X.set_shape([None, n_features])
+        y.set_shape([None])
+        return (X - mean) / scale, y
+
+    dataset = tf.data.Dataset.range(n_chunks)
+    if seed is not None:
+        dataset = dataset.shuffle(n_chunks, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.map(load, num_parallel_calls=calls, deterministic=seed is None)
+    dataset = dataset.unbatch()
+    if seed is not None:
+        dataset = dataset.shuffle(chunk_rows, seed=seed, reshuffle_each_iteration=True)
+    if targets is None:
+        dataset = dataset.map(lambda X, y: X)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def fit_scaler(
+    values: np.ndarray, columns: list[str], chunk_rows: int, mask: np.ndarray | None = None
+) -> StandardScaler:
+    """StandardScaler fitted chunk by chunk on the rows of `values` selected by `mask`."""
+    scaler = StandardScaler()
+    n_chunks, read_chunk = _chunk_reader(values, None, chunk_rows, mask)
+    for index in range(n_chunks):
+        X, _ = read_chunk(index)
+        if len(X):
+            scaler.partial_fit(pd.DataFrame(X, columns=columns))
+    return scaler
+
 
 @dataclass
 class TensorFlowRiskModel:
     model: object
     scaler: StandardScaler
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+    parallelism: int = 0
+    batch_size: int = 1024
 
     def predict_proba(self, X: pd.DataFrame):
-        X_scaled = self.scaler.transform(X)
-        probs = self.model.predict(X_scaled, verbose=0).reshape(-1)
+        start = time.perf_counter()
+        dataset = make_dataset(
+            np.asarray(X),
+            None,
+            self.scaler,
+            self.batch_size,
+            self.chunk_rows,
+            self.parallelism,
+        )
+        probs = self.model.predict(dataset, verbose=0).reshape(-1)
+        _log_phase("predict", len(probs), time.perf_counter() - start)
         return np.column_stack([1 - probs, probs])
 
 
@@ -25,39 +164,83 @@ def train_tf(
     y_train: pd.Series,
     random_seed: int,
     demo_mode: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    parallelism: int = 0,
+    patience: int = 0,
+    matrix: FeatureMatrix | None = None,
+    rows: np.ndarray | None = None,
+    valid_rows: np.ndarray | None = None,
+    hidden_layers: tuple[int, ...] = (32, 16),
+    lr: float = 1e-3,
+    epochs: int | None = None,
 ):
+    """Train the Keras MLP on `tf.data` chunks.
+
+    Given the feature `matrix`, the boolean `rows` mask selects the training rows and
+    `X_train`/`y_train` are ignored. With `patience > 0` and a `valid_rows` mask, training
+    stops once the validation loss has not improved for `patience` epochs and the best
+    weights are restored.
+    """
     import tensorflow as tf
 
     tf.random.set_seed(random_seed)
     np.random.seed(random_seed)
 
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-
-    model = tf.keras.Sequential(
-        [
-            tf.keras.layers.Input(shape=(X_train.shape[1],)),
-            tf.keras.layers.Dense(32, activation="relu"),
-            tf.keras.layers.Dropout(0.1),
-            tf.keras.layers.Dense(16, activation="relu"),
-            tf.keras.layers.Dense(1, activation="sigmoid"),
-        ]
-    )
+    if matrix is not None:
+        values, targets, columns = matrix.values, matrix.target, matrix.columns
+    else:
+        values, targets, columns = X_train.to_numpy(), y_train.to_numpy(), list(X_train.columns)
+    n_rows = len(values) if rows is None else int(np.count_nonzero(rows))
+    scaler = fit_scaler(values, columns, chunk_rows, rows)
+
+    layers = [tf.keras.layers.Input(shape=(len(columns),))]
+    for i, width in enumerate(hidden_layers):
+        layers.append(tf.keras.layers.Dense(width, activation="relu"))
+        if i == 0:
+            layers.append(tf.keras.layers.Dropout(0.1))
+    model = tf.keras.Sequential([*layers, tf.keras.layers.Dense(1, activation="sigmoid")])
     model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+        optimizer=tf.keras.optimizers.Adam(learning_rate=lr),
         loss="binary_crossentropy",
     )
-    epochs = 3 if demo_mode else 40
-    model.fit(X_train_scaled, y_train.values, epochs=epochs, batch_size=64, verbose=0)
+    if epochs is None:
+        epochs = 3 if demo_mode else 40
+    dataset = make_dataset(
+        values, targets, scaler, 64, chunk_rows, parallelism, seed=random_seed, mask=rows
+    )
+    fit_kwargs = {}
+    early_stopping = patience > 0 and valid_rows is not None and bool(valid_rows.any())
+    if early_stopping:
+        fit_kwargs = {
+            "validation_data": make_dataset(
+                values, targets, scaler, 1024, chunk_rows, parallelism, mask=valid_rows
+            ),
+            "callbacks": [
+                tf.keras.callbacks.EarlyStopping(
+                    monitor="val_loss", patience=patience, restore_best_weights=True
+                )
+            ],
+        }
+    start = time.perf_counter()
+    history = model.fit(dataset, epochs=epochs, verbose=0, **fit_kwargs)
+    epochs_run = len(history.history["loss"])
+    _log_phase("train", n_rows * epochs_run, time.perf_counter() - start)
 
     params = {
         "model_type": "KerasMLPClassifier",
-        "hidden_layers": [32, 16],
+        "hidden_layers": list(hidden_layers),
         "dropout": 0.1,
         "optimizer": "Adam",
-        "lr": 1e-3,
+        "lr": lr,
         "epochs": epochs,
+        "epochs_run": epochs_run,
         "batch_size": 64,
+        "tf_data_chunk_rows": chunk_rows,
+        "tf_data_parallelism": parallelism or "autotune",
+        "early_stopping_patience": patience if early_stopping else None,
         "random_seed": random_seed,
     }
-    return TensorFlowRiskModel(model=model, scaler=scaler), params
+    model_wrapper = TensorFlowRiskModel(
+        model=model, scaler=scaler, chunk_rows=chunk_rows, parallelism=parallelism
+    )
+    return model_wrapper, params
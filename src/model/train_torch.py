@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
+from src.features.matrix import FeatureMatrix
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
 
 @dataclass
 class TorchRiskModel:
@@ -24,60 +33,189 @@ class TorchRiskModel:
         return np.column_stack([1 - probs, probs])
 
 
+def iter_minibatches(
+    values: np.ndarray,
+    targets: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    batch_size: int,
+    rng: np.random.Generator | None = None,
+    mask: np.ndarray | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Scaled float32 batches gathered from `values`, which may be a read-only memmap.
+
+    Only the rows selected by the boolean `mask` (all rows by default) are used, and only
+    one batch is materialised at a time. With `rng` the batch order and membership are
+    shuffled every pass; row indices within a batch are sorted so memmapped reads stay
+    mostly sequential.
+    """
+    mean = mean.astype(np.float32)
+    scale = scale.astype(np.float32)
+    index = np.arange(len(values)) if mask is None else np.flatnonzero(mask)
+    order = index[rng.permutation(len(index))] if rng is not None else index
+    for start in range(0, len(order), batch_size):
+        rows = np.sort(order[start : start + batch_size])
+        X_batch = (values[rows].astype(np.float32) - mean) / scale
+        yield X_batch, targets[rows].astype(np.float32).reshape(-1, 1)
+
+
+def _fit_scaler(
+    values: np.ndarray, columns: list[str], index: np.ndarray, chunk_rows: int
+) -> StandardScaler:
+    scaler = StandardScaler()
+    for start in range(0, len(index), chunk_rows):
+        chunk = values[index[start : start + chunk_rows]]
+        scaler.partial_fit(pd.DataFrame(chunk, columns=columns))
+    return scaler
+
+
+@contextmanager
+def _intra_op_threads(torch, num_threads: int) -> Iterator[None]:
+    """Pin torch's process-wide intra-op thread count, restoring the previous one on exit."""
+    previous = torch.get_num_threads()
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
 def train_torch(
     X_train: pd.DataFrame,
     y_train: pd.Series,
     random_seed: int,
     demo_mode: bool = False,
+    batch_size: int = 0,
+    num_threads: int = 0,
+    patience: int = 0,
+    matrix: FeatureMatrix | None = None,
+    rows: np.ndarray | None = None,
+    valid_rows: np.ndarray | None = None,
+    hidden_layers: tuple[int, ...] = (32, 16),
+    lr: float = 1e-3,
+    epochs: int | None = None,
 ):
+    """Train the MLP full-batch (`batch_size=0`) or on shuffled mini-batches.
+
+    Given the feature `matrix`, the boolean `rows` mask selects the training rows and
+    batches are gathered straight from the memmap, so `X_train`/`y_train` are ignored and
+    mini-batch training never holds more than one batch of features. `num_threads > 0`
+    pins torch's intra-op thread pool for the duration of the call. With `patience > 0`
+    and a `valid_rows` mask, training stops once the validation loss has not improved
+    for `patience` epochs and the best weights are restored.
+    """
     import torch
     import torch.nn as nn
 
     torch.manual_seed(random_seed)
     np.random.seed(random_seed)
 
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train).astype(np.float32)
-    y_train_arr = y_train.values.astype(np.float32).reshape(-1, 1)
+    if matrix is not None:
+        values, targets, columns = matrix.values, matrix.target, matrix.columns
+    else:
+        values, targets, columns = X_train.to_numpy(), y_train.to_numpy(), list(X_train.columns)
+    index = np.arange(len(values)) if rows is None else np.flatnonzero(rows)
+    n_rows = len(index)
+    epoch_batch = batch_size if batch_size > 0 else n_rows
+    scaler = _fit_scaler(values, columns, index, epoch_batch)
 
     class MLP(nn.Module):
         def __init__(self, in_features: int):
             super().__init__()
-            self.net = nn.Sequential(
-                nn.Linear(in_features, 32),
-                nn.ReLU(),
-                nn.Dropout(0.1),
-                nn.Linear(32, 16),
-                nn.ReLU(),
-                nn.Linear(16, 1),
-            )
+            layers: list[nn.Module] = []
+            for i, width in enumerate(hidden_layers):
+                layers += [nn.Linear(in_features, width), nn.ReLU()]
+                if i == 0:
+                    layers.append(nn.Dropout(0.1))
+                in_features = width
+            self.net = nn.Sequential(*layers, nn.Linear(in_features, 1))
 
         def forward(self, x):
             return self.net(x)
 
-    model = MLP(X_train.shape[1])
+    model = MLP(len(columns))
     loss_fn = nn.BCEWithLogitsLoss()
-    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
-
-    X_tensor = torch.tensor(X_train_scaled)
-    y_tensor = torch.tensor(y_train_arr)
-
-    epochs = 3 if demo_mode else 60
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+
+    rng = np.random.default_rng(random_seed) if batch_size > 0 else None
+    # Full-batch training scales the training set once and reuses it every epoch.
+    full_batch = None
+    if rng is None:
+        full_batch = list(
+            iter_minibatches(values, targets, scaler.mean_, scaler.scale_, epoch_batch, mask=rows)
+        )
+
+    def valid_loss() -> float:
+        model.eval()
+        total = 0.0
+        with torch.no_grad():
+            for X_batch, y_batch in iter_minibatches(
+                values, targets, scaler.mean_, scaler.scale_, epoch_batch, mask=valid_rows
+            ):
+                logits = model(torch.from_numpy(X_batch))
+                total += loss_fn(logits, torch.from_numpy(y_batch)).item() * len(X_batch)
+        model.train()
+        return total / n_valid
+
+    n_valid = 0 if valid_rows is None else int(np.count_nonzero(valid_rows))
+    early_stopping = patience > 0 and n_valid > 0
+    best_loss, best_state, stale_epochs = float("inf"), None, 0
+
+    if epochs is None:
+        epochs = 3 if demo_mode else 60
+    epochs_run = 0
     model.train()
-    for _ in range(epochs):
-        optimizer.zero_grad()
-        logits = model(X_tensor)
-        loss = loss_fn(logits, y_tensor)
-        loss.backward()
-        optimizer.step()
+    with _intra_op_threads(torch, num_threads):
+        threads_used = torch.get_num_threads()
+        for epoch in range(epochs):
+            start = time.perf_counter()
+            epoch_loss = 0.0
+            batches = full_batch or iter_minibatches(
+                values, targets, scaler.mean_, scaler.scale_, epoch_batch, rng, rows
+            )
+            for X_batch, y_batch in batches:
+                optimizer.zero_grad()
+                logits = model(torch.from_numpy(X_batch))
+                loss = loss_fn(logits, torch.from_numpy(y_batch))
+                loss.backward()
+                optimizer.step()
+                epoch_loss += loss.item() * len(X_batch)
+            seconds = time.perf_counter() - start
+            epochs_run = epoch + 1
+
+            event = {
+                "event": "torch_epoch",
+                "epoch": epochs_run,
+                "train_loss": round(epoch_loss / n_rows, 6),
+                "rows_per_second": round(n_rows / max(seconds, 1e-9)),
+            }
+            if early_stopping:
+                event["valid_loss"] = round(valid_loss(), 6)
+            logger.info(json.dumps(event))
+
+            if early_stopping:
+                if event["valid_loss"] < best_loss:
+                    best_loss, stale_epochs = event["valid_loss"], 0
+                    best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+                else:
+                    stale_epochs += 1
+                    if stale_epochs >= patience:
+                        break
+    if best_state is not None:
+        model.load_state_dict(best_state)
 
     params = {
         "model_type": "TorchMLPClassifier",
-        "hidden_layers": [32, 16],
+        "hidden_layers": list(hidden_layers),
         "dropout": 0.1,
         "optimizer": "Adam",
-        "lr": 1e-3,
+        "lr": lr,
         "epochs": epochs,
+        "epochs_run": epochs_run,
+        "batch_size": batch_size or "full",
+        "num_threads": threads_used,
+        "early_stopping_patience": patience if early_stopping else None,
         "random_seed": random_seed,
     }
     return TorchRiskModel(model=model, scaler=scaler, torch=torch), params
@@ -0,0 +1,133 @@
+"""Walk-forward time-split cross-validation (EVAL_MODE=walk_forward).
+
+Every week from `CV_MIN_TRAIN_WEEKS` weeks after the first one is a cut-off: its fold
+trains on all earlier weeks and scores the cut-off week itself, exactly as the model is
+used in production. Folds run in a process pool of CV_WORKERS; the memory-mapped
+`FeatureMatrix` pickles as its directory path, so workers map the same files instead of
+receiving copies. Per-fold AUC/PR-AUC and their mean, std, min and max are stored under
+`walk_forward` in `metrics_latest.json`.
+
+    python -m src.model.walk_forward --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from src.config import PipelineConfig, load_config
+from src.features.matrix import FeatureMatrix, open_feature_matrix
+from src.model.evaluate import ranking_metrics
+from src.model.train import (
+    _backend_fit_inputs,
+    _get_backend_trainer,
+    _split_xy,
+    usable_rows,
+)
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+EVAL_MODES = ["split", "walk_forward"]
+
+
+def cutoff_weeks(matrix: FeatureMatrix, min_train_weeks: int) -> list[int]:
+    weeks = sorted(matrix.week_index)
+    return [week for week in weeks if week >= weeks[0] + min_train_weeks]
+
+
+def run_fold(matrix: FeatureMatrix, cutoff: int, config: PipelineConfig) -> dict:
+    """Train on weeks before `cutoff` and score week `cutoff`; nothing is persisted."""
+    start = time.perf_counter()
+    complete = usable_rows(matrix, config.model_backend)
+    X_train, y_train = _split_xy(matrix, matrix.week_rows(stop=cutoff), complete)
+    X_test, y_test = _split_xy(matrix, matrix.week_rows(cutoff, cutoff + 1), complete)
+
+    trainer_kwargs = _backend_fit_inputs(matrix, cutoff, complete, config)
+    trainer = _get_backend_trainer(config.model_backend)
+    model, _ = trainer(X_train, y_train, config.random_seed, config.demo_mode, **trainer_kwargs)
+
+    fold = {"cutoff_week": cutoff, "train_rows": len(X_train), "test_rows": len(X_test)}
+    # Ranking metrics are undefined when either class is missing on either side.
+    if y_train.nunique() < 2 or y_test.nunique() < 2:
+        fold.update(auc=None, pr_auc=None, average_precision=None)
+    else:
+        fold.update(ranking_metrics(y_test, model.predict_proba(X_test)[:, 1]))
+    fold["seconds"] = round(time.perf_counter() - start, 3)
+    return fold
+
+
+def _dispersion(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    array = np.asarray(values)
+    return {
+        "mean": float(array.mean()),
+        "std": float(array.std(ddof=1)) if len(array) > 1 else 0.0,
+        "min": float(array.min()),
+        "max": float(array.max()),
+    }
+
+
+def walk_forward_cv(matrix: FeatureMatrix, config: PipelineConfig) -> dict:
+    cutoffs = cutoff_weeks(matrix, config.cv_min_train_weeks)
+    if not cutoffs:
+        raise ValueError(
+            f"No walk-forward cut-off weeks: the matrix spans {len(matrix.week_index)} weeks "
+            f"but CV_MIN_TRAIN_WEEKS={config.cv_min_train_weeks}."
+        )
+
+    start = time.perf_counter()
+    workers = min(config.cv_workers, len(cutoffs))
+    if workers <= 1:
+        folds = [run_fold(matrix, cutoff, config) for cutoff in cutoffs]
+    else:
+        # Deep-learning runtimes are not fork-safe once initialised; spawn fresh workers.
+        context = (
+            None if config.model_backend == "sklearn" else multiprocessing.get_context("spawn")
+        )
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            folds = list(executor.map(run_fold, repeat(matrix), cutoffs, repeat(config)))
+
+    scored = [fold for fold in folds if fold["auc"] is not None]
+    summary = {
+        "folds": folds,
+        "n_folds": len(folds),
+        "n_scored_folds": len(scored),
+        "auc": _dispersion([fold["auc"] for fold in scored]),
+        "pr_auc": _dispersion([fold["pr_auc"] for fold in scored]),
+        "average_precision": _dispersion([fold["average_precision"] for fold in scored]),
+        "workers": max(workers, 1),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(
+        json.dumps(
+            {
+                "event": "walk_forward_cv",
+                **{
+                    k: summary[k]
+                    for k in ["n_folds", "auc", "pr_auc", "average_precision", "workers", "seconds"]
+                },
+            }
+        )
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward CV over the feature matrix")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.workers is not None:
+        config = dataclasses.replace(config, cv_workers=args.workers)
+    summary = walk_forward_cv(open_feature_matrix(config.feature_matrix_dir), config)
+    print(json.dumps({k: v for k, v in summary.items() if k != "folds"}, indent=2))
@@ -5,20 +5,55 @@ from __future__ import annotations
 import argparse
 import json
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+import pandas as pd
+
 from src.alerts.alert import generate_alert
 from src.config import ensure_directories, load_config
-from src.etl.extract import extract_data
-from src.etl.load import get_database_client, initialize_schema, load_processed_data
-from src.etl.transform import transform_data
+from src.etl.extract import extract_data, extract_data_chunked
+from src.etl.incremental import EventWatermark, iter_processed_events
+from src.etl.load import (
+    get_database_client,
+    initialize_schema,
+    load_processed_chunks,
+    load_processed_data,
+)
+from src.etl.transform import transform_data, transform_data_chunked
+from src.etl.vle import load_vle_weekly
 from src.experiments.ab_simulation import run_ab_simulation
-from src.features.build_features import build_time_sliced_features
+from src.features.build_features import (
+    add_time_features,
+    aggregate_weekly,
+    aggregate_weekly_chunks,
+    join_vle_features,
+)
+from src.features.matrix import write_feature_matrix
+from src.features.parallel import SHARD_STRATEGIES, map_shards
+from src.features.sql_backend import build_time_sliced_features_sql
+from src.features.store import FeatureStore
 from src.marts.build_marts import build_marts
 from src.model.evaluate import evaluate_model
 from src.model.explain import generate_shap_artifacts
-from src.model.predict import predict_risk_timeseries, select_prediction_snapshot
-from src.model.train import train_model
+from src.model.predict import (
+    ScoreCache,
+    iter_weekly_predictions,
+    score_risk,
+    select_prediction_snapshot,
+)
+from src.model.registry import (
+    can_update_in_place,
+    load_model_metadata,
+    load_persisted_model,
+    model_version,
+    retrain_due,
+)
+from src.model.search import hyperparameter_search
+from src.model.train import FEATURE_COLS, train_model, update_model
+from src.model.walk_forward import EVAL_MODES, walk_forward_cv
+from src.schema import memory_report, reset_memory_report
 from src.storage import S3Storage
 from src.utils.logging import get_logger
 
@@ -167,41 +202,239 @@ def publish_artifacts_manifest(config, db_mode: str) -> None:
     )
 
 
-def run_pipeline(demo_mode: bool) -> None:
+def build_features_for_run(config, db) -> pd.DataFrame:
+    """Extract, transform and load raw data, then build weekly features for this run.
+
+    EXTRACT_MODE selects in-memory or chunked processing; ETL_MODE=incremental limits the
+    transform/load to assessment rows beyond the persisted watermark and extends the
+    feature store with only the new weeks' feature rows. FEATURE_WORKERS > 1 shards the
+    weekly aggregation and history features across a process pool. FEATURE_BACKEND=sql
+    computes them in the database instead: on SQLite from the freshly loaded
+    `clean_events` table, on Postgres directly from the ingested raw.* tables.
+    """
+    if config.extract_mode not in {"full", "streaming"}:
+        raise ValueError(
+            f"Unsupported EXTRACT_MODE='{config.extract_mode}'. Valid options: ['full', 'streaming']"
+        )
+    if config.etl_mode not in {"full", "incremental"}:
+        raise ValueError(
+            f"Unsupported ETL_MODE='{config.etl_mode}'. Valid options: ['full', 'incremental']"
+        )
+    if config.feature_shard_strategy not in SHARD_STRATEGIES:
+        raise ValueError(
+            f"Unsupported FEATURE_SHARD_STRATEGY='{config.feature_shard_strategy}'. "
+            f"Valid options: {SHARD_STRATEGIES}"
+        )
+    if config.feature_backend not in {"pandas", "sql"}:
+        raise ValueError(
+            f"Unsupported FEATURE_BACKEND='{config.feature_backend}'. "
+            "Valid options: ['pandas', 'sql']"
+        )
+    workers = config.feature_workers
+
+    incremental = config.etl_mode == "incremental"
+    sql_features = config.feature_backend == "sql"
+    if sql_features:
+        if incremental:
+            raise ValueError("FEATURE_BACKEND=sql requires ETL_MODE=full")
+        if db.driver == "postgres":
+            # Features are computed from the raw.* tables already ingested into Postgres.
+            return build_time_sliced_features_sql(
+                db, config.extract_chunk_size, load_vle_weekly(config)
+            )
+    watermark = EventWatermark.load(config, db) if incremental else EventWatermark()
+    append = watermark.is_set
+
+    if config.extract_mode == "streaming":
+        student_info, assessment_chunks, assessments = extract_data_chunked(config)
+        assessment_chunks = (
+            watermark.new_events(chunk, assessments) for chunk in assessment_chunks
+        )
+        # Chunks are written to the processed store as they are consumed.
+        clean_chunks = load_processed_chunks(
+            transform_data_chunked(student_info, assessment_chunks, assessments),
+            config,
+            db,
+            append=append,
+        )
+        if sql_features:
+            deque(clean_chunks, maxlen=0)
+        else:
+            weekly = aggregate_weekly_chunks(clean_chunks)
+    else:
+        student_info, student_assessment, assessments = extract_data(config)
+        student_assessment = watermark.new_events(student_assessment, assessments)
+        clean_df = transform_data(student_info, student_assessment, assessments)
+        load_processed_data(clean_df, config, db, append=append)
+        if not sql_features:
+            weekly = map_shards(aggregate_weekly, clean_df, workers, config.feature_shard_strategy)
+
+    # A full run has just rewritten clean_events, so its watermark replaces the stored one
+    # and the feature store built on the old events is dropped.
+    watermark.save(db)
+    store = FeatureStore(config.feature_store_dir)
+    if not incremental:
+        store.clear()
+
+    extend_store = append and store.exists()
+    # Clicks up to a group's last stored week are already in its stored feature rows.
+    vle_weekly = load_vle_weekly(config, after=store.last_weeks() if extend_store else None)
+    if sql_features:
+        return build_time_sliced_features_sql(db, config.extract_chunk_size, vle_weekly)
+    weekly = join_vle_features(weekly, vle_weekly)
+    if not incremental:
+        return map_shards(add_time_features, weekly, workers, config.feature_shard_strategy)
+
+    if not append:
+        return store.rebuild(weekly)
+    if extend_store:
+        store.append(weekly)
+        return store.load()
+    logger.info("No feature store at %s; rebuilding it from processed events", store.root)
+    return store.rebuild(
+        join_vle_features(
+            aggregate_weekly_chunks(iter_processed_events(config, config.extract_chunk_size)),
+            vle_weekly,
+        )
+    )
+
+
+def _run_db_stages(db, stages: dict) -> dict:
+    """Run independent DB-writing stages, each committing once in its own transaction.
+
+    When the pool has a spare connection per stage they run concurrently on checked-out
+    sessions; otherwise they run one after another on the main connection.
+    """
+    if db.pool is None or db.pool.max_size <= len(stages):
+        results = {}
+        for name, stage in stages.items():
+            with db.transaction():
+                results[name] = stage(db)
+        return results
+
+    def run(stage):
+        with db.session() as session, session.transaction():
+            return stage(session)
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        futures = {name: executor.submit(run, stage) for name, stage in stages.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def run_pipeline(demo_mode: bool, score_only: bool = False) -> None:
+    """Run the pipeline end to end, or with `score_only` reuse the persisted model.
+
+    SEARCH_TRIALS > 0 tunes the backend's hyperparameters before training and
+    EVAL_MODE=walk_forward adds per-cut-off-week fold metrics to `metrics_latest.json`.
+    Score-only runs build features, score them and refresh marts and alerts; training,
+    evaluation, SHAP and the A/B/ROI stages only run when the stored model is missing,
+    incompatible or older than RETRAIN_EVERY_DAYS. With MODEL_BACKEND=sgd the stored model
+    is instead updated in place with the weeks it has not seen yet.
+    """
     config = load_config(demo_mode=demo_mode)
     ensure_directories(config)
+    if config.eval_mode not in EVAL_MODES:
+        raise ValueError(f"Unsupported EVAL_MODE='{config.eval_mode}'. Valid options: {EVAL_MODES}")
 
     logger.info("Starting pipeline")
+    reset_memory_report(track=config.schema_memory_report)
     db = get_database_client(config)
-    initialize_schema(config, db)
-
-    student_info, student_assessment, assessments = extract_data(config)
-    clean_df = transform_data(student_info, student_assessment, assessments)
-    load_processed_data(clean_df, config, db)
-
-    features = build_time_sliced_features(clean_df)
-    model, X_train, y_train, X_test, y_test, model_metadata = train_model(features, config)
-    metrics = evaluate_model(
-        model,
-        X_test,
-        y_test,
-        config,
-        backend_hyperparams=model_metadata["backend_hyperparams"],
-    )
-    top_features = generate_shap_artifacts(model, X_train, y_train, config)
-
-    predictions = predict_risk_timeseries(model, features, config.high_risk_threshold)
-    latest_predictions = select_prediction_snapshot(predictions, config.current_week)
-    latest_predictions.to_csv(config.outputs_dir / "predictions_latest.csv", index=False)
+    # Close the pool even when a stage fails, so no connection or SQLite lock leaks.
+    try:
+        with db.transaction():
+            initialize_schema(config, db)
+
+        with db.transaction():
+            features = build_features_for_run(config, db)
+        matrix = write_feature_matrix(features, FEATURE_COLS, config.feature_matrix_dir)
+
+        stored_metadata = load_model_metadata(config) if score_only else None
+        update_in_place = score_only and can_update_in_place(stored_metadata, config)
+        if score_only and not update_in_place and retrain_due(stored_metadata, config):
+            logger.info(
+                "Persisted model is missing, incompatible or due for retraining; retraining"
+            )
+            score_only = False
+
+        metrics = top_features = roi_topline = None
+        if update_in_place:
+            model, model_metadata = update_model(matrix, config, stored_metadata)
+            logger.info(
+                json.dumps(
+                    {
+                        "event": "score_only_incremental_update",
+                        "trained_through_week": model_metadata["trained_through_week"],
+                        "evaluated_through_week": model_metadata["evaluated_through_week"],
+                        "incremental_rows": model_metadata.get("incremental_rows", 0),
+                    }
+                )
+            )
+        elif score_only:
+            model, model_metadata = load_persisted_model(config)
+            logger.info(
+                json.dumps(
+                    {"event": "score_only", "model_trained_at": model_metadata["trained_at"]}
+                )
+            )
+        else:
+            search = hyperparameter_search(matrix, config) if config.search_trials > 0 else None
+            model, X_train, y_train, X_test, y_test, model_metadata = train_model(
+                matrix, config, search
+            )
+            walk_forward = None
+            if config.eval_mode == "walk_forward":
+                walk_forward = walk_forward_cv(matrix, config)
+            metrics = evaluate_model(
+                model,
+                X_test,
+                y_test,
+                config,
+                backend_hyperparams=model_metadata["backend_hyperparams"],
+                walk_forward=walk_forward,
+            )
+            top_features = generate_shap_artifacts(model, X_train, y_train, config)
+
+        cache = None
+        if config.score_cache:
+            cache = ScoreCache(config.score_cache_dir, model_version(config, model_metadata))
+        risk_score = score_risk(
+            model,
+            features,
+            matrix=matrix,
+            chunk_rows=config.score_chunk_rows,
+            workers=config.score_workers,
+            cache=cache,
+        )
 
-    build_marts(predictions, config, db)
-    generate_alert(latest_predictions, features, config, db)
-    _, _, roi_df = run_ab_simulation(latest_predictions, config, db)
+        def weekly_predictions():
+            # Weeks are scored once above and gathered lazily on each pass.
+            return iter_weekly_predictions(features, risk_score, config.high_risk_threshold)
 
-    roi_topline = roi_df.sort_values("roi", ascending=False).iloc[0].to_dict()
-    write_executive_summary(metrics, roi_topline, demo_mode=demo_mode)
-    publish_artifacts_manifest(config, db_mode=db.driver)
+        latest_predictions = select_prediction_snapshot(weekly_predictions(), config.current_week)
+        latest_predictions.to_csv(config.outputs_dir / "predictions_latest.csv", index=False)
 
+        stages = {
+            "marts": lambda conn: build_marts(weekly_predictions(), config, conn),
+            "alert": lambda conn: generate_alert(latest_predictions, features, config, conn),
+        }
+        if not score_only:
+            stages["ab_simulation"] = lambda conn: run_ab_simulation(
+                latest_predictions, config, conn
+            )
+        stage_results = _run_db_stages(db, stages)
+
+        if not score_only:
+            _, _, roi_df = stage_results["ab_simulation"]
+            roi_topline = roi_df.sort_values("roi", ascending=False).iloc[0].to_dict()
+            write_executive_summary(metrics, roi_topline, demo_mode=demo_mode)
+        publish_artifacts_manifest(config, db_mode=db.driver)
+
+        if config.schema_memory_report:
+            logger.info(json.dumps({"event": "schema_memory_report", "stages": memory_report()}))
+        if db.pool is not None:
+            logger.info(json.dumps({"event": "db_pool_stats", **db.pool.stats()}))
+    finally:
+        db.close()
     logger.info("Pipeline completed successfully")
     logger.info(
         json.dumps(
@@ -209,7 +442,8 @@ def run_pipeline(demo_mode: bool) -> None:
                 "metrics": metrics,
                 "top_shap_features": top_features,
                 "best_roi": roi_topline,
-                "model_backend": config.model_backend,
+                "model_backend": model_metadata["model_backend"],
+                "score_only": score_only,
             }
         )
     )
@@ -218,5 +452,10 @@ def run_pipeline(demo_mode: bool) -> None:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run OULAD end-to-end pipeline")
     parser.add_argument("--demo", action="store_true", help="Force demo mode with synthetic data")
+    parser.add_argument(
+        "--score-only",
+        action="store_true",
+        help="Score with the persisted model; retrain only when RETRAIN_EVERY_DAYS has elapsed",
+    )
     args = parser.parse_args()
-    run_pipeline(demo_mode=args.demo)
+    run_pipeline(demo_mode=args.demo, score_only=args.score_only)
@@ -0,0 +1,144 @@
+"""Central column-schema registry shared by every pipeline stage.
+
+Stages call `enforce_schema` on the frames they hand to the next stage, so compact dtypes
+(categorical modules, int32 ids/weeks, float32 features) are set once and preserved
+end to end. With SCHEMA_MEMORY_REPORT=true, memory before/after each enforcement is
+accumulated per stage and reported in the run log via `memory_report`; measuring takes a
+deep `memory_usage` scan, so it is off by default.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+
+COLUMN_SCHEMA: dict[str, str] = {
+    # keys
+    "id_student": "int32",
+    "id_assessment": "int32",
+    "code_module": "category",
+    "code_presentation": "category",
+    "week": "int32",
+    # cleaned events
+    "score": "float32",
+    "submitted": "int8",
+    "date": "float32",
+    "date_submitted": "float32",
+    "weight": "float32",
+    "is_banked": "int8",
+    "assessment_type": "category",
+    "id_site": "int32",
+    "sum_click": "int32",
+    # features
+    "studied_credits": "float32",
+    "age_band_num": "float32",
+    "imd_band_num": "float32",
+    "disability_flag": "float32",
+    "pass_probability_base": "float32",
+    "weekly_score_mean": "float32",
+    "weekly_submissions": "float32",
+    "cum_submissions": "float32",
+    "rolling_score_3w": "float32",
+    "score_trend_2w": "float32",
+    "vle_clicks": "float32",
+    "vle_active_days": "float32",
+    "vle_clicks_forumng": "float32",
+    "vle_clicks_homepage": "float32",
+    "vle_clicks_oucontent": "float32",
+    "vle_clicks_quiz": "float32",
+    "vle_clicks_resource": "float32",
+    "vle_clicks_subpage": "float32",
+    "vle_clicks_url": "float32",
+    "vle_clicks_other": "float32",
+    "dropout_risk_target": "float32",
+    "target_high_risk": "int8",
+    # predictions
+    "risk_score": "float32",
+    "high_risk_flag": "int8",
+}
+
+# Raw CSV columns that may be missing ("?" or empty) are read as float32 so they can hold NaN.
+_RAW_NULLABLE_OVERRIDES = {"submitted": "float32"}
+_RAW_COLUMNS = {
+    "studentInfo.csv": [
+        "id_student",
+        "code_module",
+        "code_presentation",
+        "studied_credits",
+        "age_band_num",
+        "imd_band_num",
+        "disability_flag",
+        "pass_probability_base",
+    ],
+    "studentAssessment.csv": [
+        "id_assessment",
+        "id_student",
+        "date_submitted",
+        "is_banked",
+        "score",
+        "submitted",
+    ],
+    "assessments.csv": [
+        "code_module",
+        "code_presentation",
+        "id_assessment",
+        "assessment_type",
+        "date",
+        "weight",
+    ],
+    "studentVle.csv": ["code_module", "id_student", "id_site", "date", "sum_click"],
+}
+RAW_DTYPES: dict[str, dict[str, str]] = {
+    name: {col: _RAW_NULLABLE_OVERRIDES.get(col, COLUMN_SCHEMA[col]) for col in cols}
+    for name, cols in _RAW_COLUMNS.items()
+}
+
+_MEMORY_BY_STAGE: dict[str, dict[str, int]] = {}
+# Stages run on pipeline threads concurrently, so accumulate under a lock.
+_MEMORY_LOCK = threading.Lock()
+_TRACK_MEMORY = False
+
+
+def enforce_schema(
+    df: pd.DataFrame, stage: str, schema: dict[str, str] | None = None
+) -> pd.DataFrame:
+    """Cast registered columns of `df` to their schema dtype, recording memory if tracked.
+
+    `schema` defaults to `COLUMN_SCHEMA`; the extract stage passes the matching
+    `RAW_DTYPES` entry, which keeps nullable raw columns as float32.
+    """
+    casts = {
+        col: dtype
+        for col, dtype in (schema or COLUMN_SCHEMA).items()
+        if col in df.columns and str(df[col].dtype) != dtype
+    }
+    if not _TRACK_MEMORY:
+        return df.astype(casts) if casts else df
+
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    if casts:
+        df = df.astype(casts)
+    bytes_after = int(df.memory_usage(deep=True).sum()) if casts else bytes_before
+    with _MEMORY_LOCK:
+        entry = _MEMORY_BY_STAGE.setdefault(stage, {"bytes_before": 0, "bytes_after": 0})
+        entry["bytes_before"] += bytes_before
+        entry["bytes_after"] += bytes_after
+    return df
+
+
+def memory_report() -> dict[str, dict[str, int]]:
+    """Per-stage bytes before/after schema enforcement since the last reset."""
+    with _MEMORY_LOCK:
+        return {
+            stage: {**entry, "bytes_saved": entry["bytes_before"] - entry["bytes_after"]}
+            for stage, entry in _MEMORY_BY_STAGE.items()
+        }
+
+
+def reset_memory_report(track: bool = True) -> None:
+    """Clear the report and turn memory tracking on or off for subsequent enforcements."""
+    global _TRACK_MEMORY
+    with _MEMORY_LOCK:
+        _MEMORY_BY_STAGE.clear()
+        _TRACK_MEMORY = track
@@ -0,0 +1,104 @@
+"""Chunked batch scoring matches a single pass, reuses cached scores and streams by week."""
+
+import dataclasses
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.load import DBClient
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.marts.build_marts import build_marts
+from src.model.predict import (
+    ScoreCache,
+    iter_weekly_predictions,
+    predict_risk_timeseries,
+    score_risk,
+    select_prediction_snapshot,
+)
+from src.model.registry import model_version
+from src.model.train import FEATURE_COLS, train_model
+
+
+class CountingModel:
+    def __init__(self, model: object) -> None:
+        self.model = model
+        self.rows = 0
+
+    def predict_proba(self, X: pd.DataFrame):
+        self.rows += len(X)
+        return self.model.predict_proba(X)
+
+
+def test_chunked_cached_scoring_matches_single_pass(tmp_path: Path) -> None:
+    config = dataclasses.replace(load_config(demo_mode=True), models_dir=tmp_path)
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    model, *_, metadata = train_model(matrix, config)
+    threshold = config.high_risk_threshold
+
+    expected = predict_risk_timeseries(model, features, threshold, matrix=matrix, chunk_rows=10**9)
+    assert expected["week"].is_monotonic_increasing
+    for _, week in expected.groupby("week"):
+        assert week["risk_score"].is_monotonic_decreasing
+
+    counting = CountingModel(model)
+    version = model_version(config, metadata)
+    chunked = predict_risk_timeseries(
+        counting,
+        features,
+        threshold,
+        matrix=matrix,
+        chunk_rows=97,
+        workers=3,
+        cache=ScoreCache(tmp_path / "cache", version),
+    )
+    pd.testing.assert_frame_equal(chunked, expected)
+    assert 0 < counting.rows <= len(features)
+
+    # A re-run with the same model scores nothing; a new model version starts cold.
+    counting.rows = 0
+    cached = predict_risk_timeseries(
+        counting, features, threshold, matrix=matrix, cache=ScoreCache(tmp_path / "cache", version)
+    )
+    pd.testing.assert_frame_equal(cached, expected)
+    assert counting.rows == 0
+
+    assert len(ScoreCache(tmp_path / "cache", "other-version")) == 0
+
+
+def test_snapshot_and_marts_consume_weekly_predictions_lazily(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), models_dir=tmp_path, marts_dir=tmp_path, current_week=3
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    model, *_ = train_model(matrix, config)
+    risk_score = score_risk(model, features, matrix=matrix)
+    expected = predict_risk_timeseries(model, features, config.high_risk_threshold, matrix=matrix)
+
+    drawn = []
+
+    def weekly():
+        for week in iter_weekly_predictions(features, risk_score, config.high_risk_threshold):
+            drawn.append(int(week["week"].iloc[0]))
+            yield week
+
+    snapshot = select_prediction_snapshot(weekly(), config.current_week)
+    assert drawn[-1] == 3 and (snapshot["week"] == 3).all()
+    pd.testing.assert_frame_equal(snapshot, expected[expected["week"] == 3])
+
+    db = DBClient(conn=sqlite3.connect(":memory:"), driver="sqlite")
+    rows, course_summary = build_marts(weekly(), config, db)
+    assert (
+        rows
+        == len(expected)
+        == db.conn.execute("SELECT COUNT(*) FROM student_risk_daily").fetchone()[0]
+    )
+    assert course_summary["student_count"].sum() == len(expected)
+    sample = pd.read_csv(tmp_path / "student_risk_daily_sample.csv")
+    assert sample["id_student"].tolist() == expected["id_student"].head(500).tolist()
@@ -0,0 +1,157 @@
+"""DBClient.insert_df: batched SQLite inserts, transactional rollback and the Postgres COPY path."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.etl.load import DBClient
+
+
+class RecordingCursor:
+    """Cursor stand-in that records statements; optionally delegates to a real cursor."""
+
+    def __init__(self, inner=None, copy_error: Exception | None = None) -> None:
+        self.inner = inner
+        self.copy_error = copy_error
+        self.statements: list[str] = []
+        self.batches: list[int] = []
+        self.copies: list[str] = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+        return self.inner.execute(sql, params) if self.inner else None
+
+    def fetchone(self):
+        return self.inner.fetchone()
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self.batches.append(len(rows))
+        return self.inner.executemany(sql, rows) if self.inner else None
+
+    def copy_expert(self, sql, buffer):
+        if self.copy_error is not None:
+            raise self.copy_error
+        self.copies.append(buffer.read())
+
+
+class RecordingConnection:
+    def __init__(self, cursor: RecordingCursor, inner=None) -> None:
+        self._cursor = cursor
+        self.inner = inner
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+        if self.inner is not None:
+            self.inner.commit()
+
+    def rollback(self):
+        if self.inner is not None:
+            self.inner.rollback()
+
+
+def _frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"id_student": range(n), "score": [float(i) for i in range(n)]})
+
+
+@pytest.mark.parametrize(("rows", "batches"), [(6, [3, 3]), (7, [3, 3, 1]), (2, [2])])
+def test_sqlite_inserts_in_batch_size_chunks(rows: int, batches: list[int]) -> None:
+    sqlite_conn = sqlite3.connect(":memory:")
+    sqlite_conn.execute("CREATE TABLE t (id_student INTEGER, score REAL)")
+    cursor = RecordingCursor(inner=sqlite_conn.cursor())
+    conn = RecordingConnection(cursor, inner=sqlite_conn)
+    db = DBClient(conn=conn, driver="sqlite", batch_size=3)
+
+    db.insert_df("t", _frame(rows))
+
+    assert cursor.batches == batches
+    assert conn.commits == 1
+    assert sqlite_conn.execute("SELECT COUNT(*), SUM(score) FROM t").fetchone() == (
+        rows,
+        float(sum(range(rows))),
+    )
+
+
+def test_sqlite_creates_missing_table_then_appends_in_batches() -> None:
+    sqlite_conn = sqlite3.connect(":memory:")
+    db = DBClient(conn=sqlite_conn, driver="sqlite", batch_size=2)
+
+    db.insert_df("t", _frame(3))
+    db.insert_df("t", _frame(5))
+    db.insert_df("t", _frame(0))
+
+    assert sqlite_conn.execute("SELECT COUNT(*) FROM t").fetchone() == (8,)
+
+
+def test_sqlite_batches_commit_once_with_the_enclosing_transaction() -> None:
+    sqlite_conn = sqlite3.connect(":memory:")
+    sqlite_conn.execute("CREATE TABLE t (id_student INTEGER, score REAL)")
+    conn = RecordingConnection(RecordingCursor(inner=sqlite_conn.cursor()), inner=sqlite_conn)
+    db = DBClient(conn=conn, driver="sqlite", batch_size=2)
+
+    with db.transaction():
+        db.insert_df("t", _frame(5))
+        db.insert_df("t", _frame(3))
+        assert conn.commits == 0
+    assert conn.commits == 1
+    assert sqlite_conn.execute("SELECT COUNT(*) FROM t").fetchone() == (8,)
+
+
+def test_postgres_copy_streams_batches_inside_a_savepoint() -> None:
+    pytest.importorskip("psycopg2")
+    cursor = RecordingCursor()
+    conn = RecordingConnection(cursor)
+    db = DBClient(conn=conn, driver="postgres", batch_size=2)
+
+    db.insert_df("t", pd.DataFrame({"id_student": [1, 2, 3], "score": [1.5, None, 3.0]}))
+
+    assert cursor.copies == ["1,1.5\n2,\n", "3,3.0\n"]
+    assert cursor.statements == ["SAVEPOINT bulk_copy", "RELEASE SAVEPOINT bulk_copy"]
+    assert cursor.batches == []
+    assert conn.commits == 1
+
+
+def test_postgres_copy_failure_rolls_back_to_savepoint_and_uses_executemany() -> None:
+    psycopg2 = pytest.importorskip("psycopg2")
+    cursor = RecordingCursor(copy_error=psycopg2.DataError("bad row"))
+    conn = RecordingConnection(cursor)
+    db = DBClient(conn=conn, driver="postgres", batch_size=2)
+
+    with db.transaction():
+        db.insert_df("t", _frame(3))
+
+    assert cursor.statements == ["SAVEPOINT bulk_copy", "ROLLBACK TO SAVEPOINT bulk_copy"]
+    assert cursor.batches == [3]
+    # The fallback joins the enclosing transaction: one commit, from the scope itself.
+    assert conn.commits == 1
+
+
+def test_postgres_without_bulk_insert_skips_copy() -> None:
+    cursor = RecordingCursor()
+    db = DBClient(conn=RecordingConnection(cursor), driver="postgres", bulk_insert=False)
+
+    db.insert_df("t", _frame(4))
+
+    assert cursor.copies == [] and cursor.statements == []
+    assert cursor.batches == [4]
+
+
+def test_sqlite_rollback_undoes_inserts_and_created_tables() -> None:
+    sqlite_conn = sqlite3.connect(":memory:")
+    sqlite_conn.execute("CREATE TABLE t (id_student INTEGER, score REAL)")
+    db = DBClient(conn=sqlite_conn, driver="sqlite", batch_size=2)
+
+    with pytest.raises(RuntimeError), db.transaction():
+        db.insert_df("t", _frame(3))
+        db.insert_df("created", _frame(3))
+        db.replace_table("t", _frame(5))
+        raise RuntimeError("later stage failed")
+
+    assert sqlite_conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+    tables = sqlite_conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+    assert tables == [("t",)]
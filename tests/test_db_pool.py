@@ -0,0 +1,80 @@
+"""Pooled DB client: transaction scopes, concurrent sessions and pool metrics."""
+
+import dataclasses
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import src.pipeline
+from src.config import load_config
+from src.etl.load import get_database_client
+from src.etl.pool import ConnectionPool, PoolTimeoutError
+
+
+def test_transaction_commits_once_and_rolls_back_on_error(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), db_path=tmp_path / "pool.db", db_pool_size=3
+    )
+    db = get_database_client(config)
+    db.execute("CREATE TABLE t (x INTEGER)")
+
+    with db.transaction():
+        db.execute("INSERT INTO t VALUES (?)", (1,))
+        db.insert_df("t", pd.DataFrame({"x": [2, 3]}))
+        with db.session() as other:
+            # Uncommitted rows are invisible to a second pooled connection.
+            assert other.conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("INSERT INTO t VALUES (?)", (4,))
+            raise RuntimeError("stage failed")
+
+    with db.session() as other:
+        assert other.conn.execute("SELECT x FROM t ORDER BY x").fetchall() == [(1,), (2,), (3,)]
+
+    stats = db.pool.stats()
+    assert stats["size"] == 2 and stats["in_use"] == 1 and stats["checkouts"] == 3
+    db.close()
+
+
+def test_pool_blocks_at_capacity_and_records_waits() -> None:
+    pool = ConnectionPool(object, max_size=1)
+    held = pool.checkout()
+    with pytest.raises(PoolTimeoutError):
+        pool.checkout(timeout=0.01)
+
+    threading.Timer(0.05, pool.checkin, args=(held,)).start()
+    assert pool.checkout(timeout=5) is held
+
+    stats = pool.stats()
+    assert stats["size"] == 1 and stats["timeouts"] == 1 and stats["checkouts"] == 2
+    assert stats["wait_seconds_max"] >= 0.04
+
+
+def test_pipeline_closes_pool_when_a_stage_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = dataclasses.replace(load_config(demo_mode=True), db_path=tmp_path / "pool.db")
+    clients = []
+
+    def client(_config):
+        db = get_database_client(config)
+        clients.append(db)
+        return db
+
+    def failing_stage(_config, _db):
+        raise RuntimeError("feature build failed")
+
+    monkeypatch.setattr(src.pipeline, "load_config", lambda demo_mode: config)
+    monkeypatch.setattr(src.pipeline, "ensure_directories", lambda _config: None)
+    monkeypatch.setattr(src.pipeline, "get_database_client", client)
+    monkeypatch.setattr(src.pipeline, "build_features_for_run", failing_stage)
+
+    with pytest.raises(RuntimeError, match="feature build failed"):
+        src.pipeline.run_pipeline(demo_mode=True)
+
+    stats = clients[0].pool.stats()
+    assert stats["size"] == 0 and stats["in_use"] == 0
@@ -0,0 +1,49 @@
+"""The memory-mapped feature matrix should serve zero-copy views of the feature frame."""
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import open_feature_matrix, write_feature_matrix
+from src.model.train import FEATURE_COLS
+
+
+def _demo_features() -> pd.DataFrame:
+    config = load_config(demo_mode=True)
+    return build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+
+
+def test_feature_matrix_round_trips_in_week_order(tmp_path: Path) -> None:
+    features = _demo_features()
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+    assert matrix.values.dtype == np.float32 and matrix.values.flags.c_contiguous
+    assert np.all(np.diff(matrix.week) >= 0)
+    np.testing.assert_array_equal(
+        matrix.values, features[FEATURE_COLS].to_numpy(np.float32)[matrix.source_row]
+    )
+    np.testing.assert_array_equal(
+        matrix.id_student, features["id_student"].to_numpy()[matrix.source_row]
+    )
+    for week, (lo, hi) in matrix.week_index.items():
+        assert (matrix.week[lo:hi] == week).all()
+
+
+def test_feature_matrix_views_share_the_mapping(tmp_path: Path) -> None:
+    features = _demo_features()
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+    rows = matrix.week_rows(start=2, stop=5)
+    X = matrix.frame(rows)
+    assert np.shares_memory(X.to_numpy(), matrix.values)
+    assert set(np.unique(matrix.week[X.index])) == {2, 3, 4}
+
+    reopened = pickle.loads(pickle.dumps(matrix))
+    assert isinstance(reopened.values, np.memmap)
+    assert open_feature_matrix(tmp_path / "matrix").week_index == matrix.week_index
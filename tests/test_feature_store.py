@@ -0,0 +1,44 @@
+"""Feature store appends should reproduce a full feature rebuild exactly."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.etl.synthetic import generate_synthetic_oulad
+from src.etl.transform import transform_data
+from src.features.build_features import add_time_features, aggregate_weekly
+from src.features.store import FeatureStore
+
+
+def _weekly_history() -> pd.DataFrame:
+    clean_df = transform_data(*generate_synthetic_oulad(n_students=150, n_modules=3, n_weeks=10))
+    weekly = aggregate_weekly(clean_df)
+    # Holes in the score history exercise NaN lags in the carried state.
+    weekly.loc[weekly.index % 11 == 0, "weekly_score_mean"] = float("nan")
+    return weekly
+
+
+def test_appended_weeks_match_full_rebuild(tmp_path: Path) -> None:
+    weekly = _weekly_history()
+    store = FeatureStore(tmp_path / "feature_store")
+    store.rebuild(weekly[weekly["week"] <= 3])
+    for week in range(4, 7):
+        store.append(weekly[weekly["week"] == week])
+    store.append(weekly[weekly["week"] >= 7])
+
+    expected = add_time_features(weekly.copy())
+    pd.testing.assert_frame_equal(store.load(), expected, check_categorical=False)
+
+    assert store.compact()["parts_before"] == 5
+    pd.testing.assert_frame_equal(store.load(), expected, check_categorical=False)
+    assert store.status()["parts"] == 1
+
+
+def test_append_rejects_weeks_already_stored(tmp_path: Path) -> None:
+    weekly = _weekly_history()
+    store = FeatureStore(tmp_path / "feature_store")
+    store.rebuild(weekly[weekly["week"] <= 5])
+
+    with pytest.raises(ValueError, match="rebuild"):
+        store.append(weekly[weekly["week"] == 5])
@@ -0,0 +1,37 @@
+"""The gradient-boosting backend keeps incomplete rows and round-trips through score-only."""
+
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.registry import load_persisted_model, retrain_due
+from src.model.train import FEATURE_COLS, train_model
+
+
+def test_hgb_trains_on_rows_with_missing_features_and_reloads(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), models_dir=tmp_path, model_backend="hgb", hgb_threads=2
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    features.loc[features.index[::7], "rolling_score_3w"] = np.nan
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+    model, X_train, _, X_test, _, metadata = train_model(matrix, config)
+
+    assert X_train["rolling_score_3w"].isna().any()
+    assert len(X_train) + len(X_test) == len(matrix)
+    assert metadata["model_file"] == "risk_model.joblib"
+    assert metadata["backend_hyperparams"]["threads"] == 2
+    assert not (tmp_path / "risk_model.npz").exists()
+
+    assert not retrain_due(metadata, config)
+    loaded, _ = load_persisted_model(config)
+    np.testing.assert_array_equal(
+        loaded.predict_proba(matrix.frame()), model.predict_proba(matrix.frame())
+    )
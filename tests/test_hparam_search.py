@@ -0,0 +1,53 @@
+"""Hyperparameter search: pruned trials table, best config in metadata, time budget."""
+
+import dataclasses
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.search import hyperparameter_search
+from src.model.train import FEATURE_COLS, train_model
+
+
+def _setup(tmp_path: Path, **overrides):
+    config = dataclasses.replace(
+        load_config(demo_mode=True),
+        models_dir=tmp_path,
+        experiments_dir=tmp_path,
+        search_trials=6,
+        **overrides,
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    return config, write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+
+def test_search_prunes_trials_and_records_the_best_config(tmp_path: Path) -> None:
+    config, matrix = _setup(tmp_path, search_workers=2)
+
+    search = hyperparameter_search(matrix, config)
+    trials = pd.read_csv(tmp_path / "hparam_trials.csv")
+
+    assert (trials["rung"] == 0).sum() == 6 and (trials["rung"] == 1).sum() == 2
+    assert (trials["status"] == "pruned").sum() == 4 == search["n_pruned"]
+    best = trials[trials["rung"] == 1].sort_values("auc").iloc[-1]
+    assert json.loads(best["params"]) == search["best_params"]
+
+    _, _, _, _, _, metadata = train_model(matrix, config, search)
+    stored = json.loads((tmp_path / "model_metadata.json").read_text())
+    assert stored["hyperparameter_search"]["best_params"] == search["best_params"]
+    assert metadata["backend_hyperparams"]["C"] == search["best_params"]["C"]
+
+
+def test_trials_over_the_time_budget_are_recorded_as_timeouts(tmp_path: Path) -> None:
+    config, matrix = _setup(tmp_path, search_workers=1, search_trial_timeout=1e-6)
+
+    with pytest.raises(ValueError, match="No search trial completed"):
+        hyperparameter_search(matrix, config)
+    assert set(pd.read_csv(tmp_path / "hparam_trials.csv")["status"]) == {"timeout"}
@@ -0,0 +1,139 @@
+"""Incremental ETL should append only rows beyond the watermark and match a full rebuild."""
+
+import dataclasses
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.config import load_config
+from src.etl.load import get_database_client, initialize_schema
+from src.etl.synthetic import write_synthetic_raw
+from src.pipeline import build_features_for_run
+
+
+def _incremental_config(tmp_path: Path, extract_mode: str):
+    config = dataclasses.replace(
+        load_config(demo_mode=False),
+        data_raw_dir=tmp_path / "raw",
+        data_processed_dir=tmp_path / "processed",
+        raw_cache_dir=tmp_path / "processed" / "raw_cache",
+        feature_store_dir=tmp_path / "processed" / "feature_store",
+        db_path=tmp_path / "pipeline.db",
+        extract_mode=extract_mode,
+        extract_chunk_size=500,
+        etl_mode="incremental",
+    )
+    config.data_processed_dir.mkdir()
+    db = get_database_client(config)
+    initialize_schema(config, db)
+    return config, db
+
+
+@pytest.mark.parametrize("extract_mode", ["full", "streaming"])
+def test_incremental_run_matches_full_rebuild(tmp_path: Path, extract_mode: str) -> None:
+    config, db = _incremental_config(tmp_path, extract_mode)
+
+    write_synthetic_raw(config.data_raw_dir, n_students=200, n_modules=3, n_weeks=10)
+    assessment_path = config.data_raw_dir / "studentAssessment.csv"
+    history = pd.read_csv(assessment_path)
+    history[history["date_submitted"] <= 6 * 7].to_csv(assessment_path, index=False)
+    build_features_for_run(config, db)
+
+    history.to_csv(assessment_path, index=False)
+    incremental = build_features_for_run(config, db)
+
+    watermarks = pd.read_sql_query(
+        "SELECT watermark_week, rows_processed FROM etl_watermark ORDER BY updated_at", db.conn
+    )
+    assert watermarks.values.tolist() == [[6, 1200], [10, 800]]
+
+    full = build_features_for_run(dataclasses.replace(config, etl_mode="full"), db)
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False, check_categorical=False)
+
+
+def test_full_run_resets_watermark_for_later_incremental_runs(tmp_path: Path) -> None:
+    config, db = _incremental_config(tmp_path, "full")
+    write_synthetic_raw(config.data_raw_dir, n_students=100, n_modules=2, n_weeks=10)
+    assessment_path = config.data_raw_dir / "studentAssessment.csv"
+    history = pd.read_csv(assessment_path)
+
+    def run_through_week(week: int, etl_mode: str) -> pd.DataFrame:
+        history[history["date_submitted"] <= week * 7].to_csv(assessment_path, index=False)
+        return build_features_for_run(dataclasses.replace(config, etl_mode=etl_mode), db)
+
+    run_through_week(4, "incremental")
+    run_through_week(7, "full")
+    incremental = run_through_week(10, "incremental")
+
+    watermarks = pd.read_sql_query(
+        "SELECT watermark_week, rows_processed FROM etl_watermark ORDER BY updated_at", db.conn
+    )
+    assert watermarks.values.tolist() == [[4, 400], [7, 700], [10, 300]]
+    loaded = pd.read_sql_query("SELECT COUNT(*) AS n FROM clean_events", db.conn)["n"].iloc[0]
+    assert loaded == len(history)
+    assert len(pd.read_csv(config.data_processed_dir / "clean_events.csv")) == len(history)
+
+    full = build_features_for_run(dataclasses.replace(config, etl_mode="full"), db)
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False, check_categorical=False)
+
+
+def test_incremental_vle_features_match_full_rebuild_across_assessment_gaps(
+    tmp_path: Path,
+) -> None:
+    config, db = _incremental_config(tmp_path, "full")
+    write_synthetic_raw(
+        config.data_raw_dir, n_students=60, n_modules=2, n_weeks=10, vle_rows_per_week=3
+    )
+    assessment_path = config.data_raw_dir / "studentAssessment.csv"
+    history = pd.read_csv(assessment_path)
+    # Half the students skip weeks 4, 5 and 7, so their clicks there must carry forward.
+    week = history["date_submitted"] // 7
+    history = history[~(week.isin([4, 5, 7]) & (history["id_student"] % 2 == 0))]
+    history[history["date_submitted"] <= 6 * 7].to_csv(assessment_path, index=False)
+    build_features_for_run(config, db)
+
+    history.to_csv(assessment_path, index=False)
+    incremental = build_features_for_run(config, db)
+    full = build_features_for_run(dataclasses.replace(config, etl_mode="full"), db)
+
+    assert (full["vle_active_days"] > 7).any()
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False, check_categorical=False)
+
+
+def test_failed_run_rolls_back_loaded_events_and_watermark(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config, db = _incremental_config(tmp_path, "full")
+    write_synthetic_raw(config.data_raw_dir, n_students=50, n_modules=2, n_weeks=8)
+    assessment_path = config.data_raw_dir / "studentAssessment.csv"
+    history = pd.read_csv(assessment_path)
+    history[history["date_submitted"] <= 4 * 7].to_csv(assessment_path, index=False)
+    with db.transaction():
+        build_features_for_run(config, db)
+    csv_path = config.data_processed_dir / "clean_events.csv"
+
+    def snapshot():
+        events = pd.read_sql_query("SELECT COUNT(*) AS n FROM clean_events", db.conn)
+        watermarks = pd.read_sql_query("SELECT * FROM etl_watermark", db.conn)
+        return events["n"].iloc[0], watermarks, csv_path.read_bytes()
+
+    before = snapshot()
+    history.to_csv(assessment_path, index=False)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("stage failed after load_processed_data")
+
+    for mode in ["incremental", "full"]:
+        with monkeypatch.context() as patch:
+            patch.setattr("src.pipeline.load_vle_weekly", fail)
+            with pytest.raises(RuntimeError), db.transaction():
+                build_features_for_run(dataclasses.replace(config, etl_mode=mode), db)
+        after = snapshot()
+        assert after[0] == before[0] and after[2] == before[2]
+        pd.testing.assert_frame_equal(after[1], before[1])
+
+    with db.transaction():
+        incremental = build_features_for_run(config, db)
+    full = build_features_for_run(dataclasses.replace(config, etl_mode="full"), db)
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False, check_categorical=False)
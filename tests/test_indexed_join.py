@@ -0,0 +1,38 @@
+"""Parity tests for the indexed dimension join used by transform_data."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl.indexed_join import indexed_left_join
+
+
+@pytest.mark.parametrize("key_stride", [1, 10_000_000])
+def test_indexed_join_matches_left_merge(key_stride: int) -> None:
+    """Dense and sparse key lookups should reproduce a left merge, including misses."""
+    rng = np.random.default_rng(0)
+    dim = pd.DataFrame(
+        {
+            "key": np.arange(50, dtype=np.int64) * key_stride + 3,
+            "value": rng.random(50),
+            "label": pd.Categorical(rng.choice(["a", "b", "c"], size=50)),
+        }
+    )
+    fact_keys = rng.choice(dim["key"].to_numpy(), size=500)
+    fact_keys[::7] = -99
+    fact = pd.DataFrame({"key": fact_keys, "amount": rng.random(500)}, index=range(100, 600))
+
+    expected = fact.merge(dim, on="key", how="left")
+    actual = indexed_left_join(fact, dim, "key")
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_indexed_join_falls_back_for_duplicate_keys() -> None:
+    """One-to-many dimensions are not positional, so the join should defer to merge."""
+    dim = pd.DataFrame({"key": [1, 1, 2], "value": [10, 11, 20]})
+    fact = pd.DataFrame({"key": [1, 2]})
+
+    actual = indexed_left_join(fact, dim, "key")
+
+    assert actual["value"].tolist() == [10, 11, 20]
@@ -0,0 +1,55 @@
+"""Score-only runs should reuse a compatible persisted model until it is due for retraining."""
+
+import dataclasses
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.registry import load_model_metadata, load_persisted_model, retrain_due
+from src.model.train import FEATURE_COLS, train_model
+
+
+def test_persisted_model_is_reused_until_the_cadence_elapses(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), models_dir=tmp_path, retrain_every_days=7.0
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    assert retrain_due(load_model_metadata(config), config)
+
+    model, *_ = train_model(matrix, config)
+    metadata = load_model_metadata(config)
+    assert not retrain_due(metadata, config)
+    later = datetime.now(timezone.utc) + timedelta(days=8)
+    assert retrain_due(metadata, config, now=later)
+
+    loaded, _ = load_persisted_model(config)
+    np.testing.assert_allclose(
+        loaded.predict_proba(matrix.frame()), model.predict_proba(matrix.frame()), atol=1e-6
+    )
+
+
+def test_persisted_model_with_other_feature_columns_is_rejected(tmp_path: Path) -> None:
+    config = dataclasses.replace(load_config(demo_mode=True), models_dir=tmp_path)
+    (tmp_path / "risk_model.npz").write_bytes(b"")
+    (tmp_path / "model_metadata.json").write_text(
+        json.dumps(
+            {
+                "model_backend": "sklearn",
+                "feature_columns": FEATURE_COLS[:-1],
+                "trained_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+    )
+
+    assert retrain_due(load_model_metadata(config), config)
+    with pytest.raises(ValueError, match="feature_columns"):
+        load_persisted_model(config)
@@ -0,0 +1,37 @@
+"""The NumPy export must reproduce each backend's probabilities without its framework."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.model.numpy_export import export_numpy_model, load_numpy_model
+from src.model.train import FEATURE_COLS, _get_backend_trainer
+
+
+@pytest.mark.parametrize(
+    ("backend", "module", "tolerance"),
+    [("sklearn", "sklearn", 1e-6), ("pytorch", "torch", 1e-5), ("tensorflow", "tensorflow", 1e-5)],
+)
+def test_numpy_export_matches_backend_predictions(
+    tmp_path: Path, backend: str, module: str, tolerance: float
+) -> None:
+    pytest.importorskip(module)
+    config = load_config(demo_mode=True)
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config))).dropna(
+        subset=FEATURE_COLS
+    )
+    X, y = features[FEATURE_COLS], features["target_high_risk"]
+    model, _ = _get_backend_trainer(backend)(X, y, config.random_seed, demo_mode=True)
+
+    exported = export_numpy_model(model, tmp_path / "risk_model.npz")
+    loaded = load_numpy_model(tmp_path / "risk_model.npz")
+
+    assert loaded.model_backend == backend
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(exported.predict_proba(X), expected, atol=tolerance)
+    np.testing.assert_allclose(loaded.predict_proba(X.to_numpy()), expected, atol=tolerance)
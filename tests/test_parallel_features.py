@@ -0,0 +1,26 @@
+"""Sharded feature builds should match the single-process build exactly."""
+
+import pandas as pd
+import pytest
+
+from src.etl.synthetic import generate_synthetic_oulad
+from src.etl.transform import transform_data
+from src.features.build_features import add_time_features, aggregate_weekly
+from src.features.parallel import map_shards
+
+
+@pytest.mark.parametrize("strategy", ["module", "student"])
+def test_sharded_feature_build_matches_single_process(strategy: str) -> None:
+    clean_df = transform_data(*generate_synthetic_oulad(n_students=400, n_modules=5, n_weeks=8))
+    expected = add_time_features(aggregate_weekly(clean_df))
+
+    weekly = map_shards(aggregate_weekly, clean_df, workers=3, strategy=strategy)
+    actual = map_shards(add_time_features, weekly, workers=3, strategy=strategy)
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_unknown_shard_strategy_is_rejected() -> None:
+    clean_df = transform_data(*generate_synthetic_oulad(n_students=20, n_modules=2, n_weeks=2))
+    with pytest.raises(ValueError, match="FEATURE_SHARD_STRATEGY"):
+        map_shards(aggregate_weekly, clean_df, workers=2, strategy="round_robin")
@@ -0,0 +1,39 @@
+"""Tests for the fingerprint-keyed raw CSV cache."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.etl.cache import clear_cache, read_csv_cached
+
+pytest.importorskip("pyarrow")
+
+
+def test_cache_reused_until_source_changes(tmp_path: Path) -> None:
+    """The CSV should be parsed once, then re-parsed only after the source changes."""
+    csv_path = tmp_path / "assessments.csv"
+    pd.DataFrame({"id_assessment": [1, 2], "date": [7, 14]}).to_csv(csv_path, index=False)
+    cache_dir = tmp_path / "cache"
+    calls: list[Path] = []
+
+    def reader(path: Path) -> pd.DataFrame:
+        calls.append(path)
+        return pd.read_csv(path)
+
+    first = read_csv_cached(csv_path, cache_dir, "raw", reader)
+    second = read_csv_cached(csv_path, cache_dir, "raw", reader)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    pd.DataFrame({"id_assessment": [1, 2, 3], "date": [7, 14, 21]}).to_csv(csv_path, index=False)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    third = read_csv_cached(csv_path, cache_dir, "raw", reader)
+    assert len(calls) == 2
+    assert len(third) == 3
+
+    assert clear_cache(cache_dir) == 2
+    read_csv_cached(csv_path, cache_dir, "raw", reader)
+    assert len(calls) == 3
@@ -0,0 +1,40 @@
+"""Parity tests for the vectorized history features in add_time_features."""
+
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import GROUP_KEYS, ROLLING_WINDOW, _rolling_features
+
+
+def _groupby_features(grouped: pd.DataFrame) -> pd.DataFrame:
+    by_key = grouped.groupby(GROUP_KEYS, observed=True)
+    return pd.DataFrame(
+        {
+            "cum_submissions": by_key["weekly_submissions"].cumsum(),
+            "rolling_score_3w": by_key["weekly_score_mean"].transform(
+                lambda s: s.rolling(ROLLING_WINDOW, min_periods=1).mean()
+            ),
+            "score_trend_2w": by_key["weekly_score_mean"].diff().fillna(0),
+        }
+    )
+
+
+def test_rolling_features_match_groupby_reference() -> None:
+    """Interleaved groups, single-row groups and missing scores should match per-group pandas."""
+    rng = np.random.default_rng(0)
+    n_rows = 2_000
+    grouped = pd.DataFrame(
+        {
+            "id_student": rng.integers(0, 150, size=n_rows).astype(np.int32),
+            "code_module": pd.Categorical(rng.choice(["AAA", "BBB", "CCC"], size=n_rows)),
+            "week": rng.integers(0, 12, size=n_rows).astype(np.int32),
+            "weekly_submissions": rng.integers(0, 4, size=n_rows).astype(np.float32),
+            "weekly_score_mean": rng.uniform(0, 100, size=n_rows).astype(np.float32),
+        }
+    )
+    grouped.loc[rng.random(n_rows) < 0.15, "weekly_score_mean"] = np.nan
+
+    expected = _groupby_features(grouped)
+    actual = pd.DataFrame(_rolling_features(grouped), index=grouped.index)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-6)
@@ -0,0 +1,83 @@
+"""Tests for the central dtype schema and its memory report."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.schema import RAW_DTYPES, enforce_schema, memory_report, reset_memory_report
+
+
+@pytest.fixture(autouse=True)
+def _reset_report() -> Iterator[None]:
+    reset_memory_report(track=True)
+    yield
+    reset_memory_report(track=False)
+
+
+def _frame(n: int = 100) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id_student": np.arange(n, dtype=np.int64),
+            "code_module": np.array(["AAA", "BBB"] * (n // 2), dtype=object),
+            "week": np.arange(n, dtype=np.int64) % 10,
+            "score": np.linspace(0, 100, n),
+            "unregistered": np.arange(n, dtype=np.int64),
+        }
+    )
+
+
+def test_enforce_schema_casts_registered_columns_only() -> None:
+    out = enforce_schema(_frame(), "transform")
+    assert out.dtypes.astype(str).to_dict() == {
+        "id_student": "int32",
+        "code_module": "category",
+        "week": "int32",
+        "score": "float32",
+        "unregistered": "int64",
+    }
+
+
+def test_enforce_schema_leaves_conforming_frames_untouched() -> None:
+    conforming = enforce_schema(_frame(), "transform")
+    assert enforce_schema(conforming, "marts") is conforming
+    report = memory_report()["marts"]
+    assert report["bytes_before"] == report["bytes_after"]
+
+
+def test_raw_schema_keeps_nullable_columns_as_float() -> None:
+    raw = pd.DataFrame({"submitted": [1.0, np.nan], "id_student": [1, 2]})
+    out = enforce_schema(raw, "extract", RAW_DTYPES["studentAssessment.csv"])
+    assert str(out["submitted"].dtype) == "float32"
+    assert out["submitted"].isna().sum() == 1
+
+
+def test_memory_report_accumulates_per_stage() -> None:
+    enforce_schema(_frame(), "extract")
+    enforce_schema(_frame(), "extract")
+    enforce_schema(_frame(), "transform")
+
+    report = memory_report()
+    assert set(report) == {"extract", "transform"}
+    single = report["transform"]
+    assert single["bytes_saved"] == single["bytes_before"] - single["bytes_after"] > 0
+    assert report["extract"]["bytes_before"] == 2 * single["bytes_before"]
+
+
+def test_memory_report_is_consistent_under_concurrent_stages() -> None:
+    frame = _frame()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: enforce_schema(frame, "marts"), range(200)))
+    enforce_schema(frame, "single")
+
+    report = memory_report()
+    assert report["marts"]["bytes_before"] == 200 * report["single"]["bytes_before"]
+
+
+def test_untracked_enforcement_casts_without_reporting() -> None:
+    reset_memory_report(track=False)
+    out = enforce_schema(_frame(), "transform")
+    assert str(out["week"].dtype) == "int32"
+    assert memory_report() == {}
@@ -0,0 +1,105 @@
+"""The scoring service micro-batches concurrent requests and reports its latency."""
+
+import dataclasses
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.serve import MicroBatcher, make_server, parse_payload
+from src.model.train import FEATURE_COLS, train_model
+
+
+def _post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_service_scores_concurrent_requests_in_micro_batches(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), models_dir=tmp_path, serve_port=0, serve_max_wait_ms=50
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    model, *_ = train_model(matrix, config)
+
+    server = make_server(config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        rows = [dict(zip(FEATURE_COLS, map(float, row))) for row in matrix.values[:40]]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            singles = list(executor.map(lambda row: _post(f"{url}/score", {"features": row}), rows))
+        bulk = _post(f"{url}/score", {"rows": rows})
+
+        # The service scores the persisted float32 NumPy export of the trained estimator.
+        expected = model.predict_proba(matrix.frame(slice(0, 40)))[:, 1]
+        np.testing.assert_allclose([r["risk_scores"][0] for r in singles], expected, atol=1e-5)
+        np.testing.assert_allclose(bulk["risk_scores"], expected, atol=1e-5)
+
+        for bad in ({"weekly_score_mean": 1.0}, {**rows[0], "weekly_score_mean": None}):
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                _post(f"{url}/score", {"features": bad})
+            assert excinfo.value.code == 400
+
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            metrics = json.loads(response.read())
+        assert metrics["requests"] == 41 and metrics["rows"] == 80 and metrics["errors"] == 2
+        assert metrics["batches"] < 41
+        assert set(metrics["latency_ms"]) == {"p50", "p95", "p99", "max"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class RowIdModel:
+    """Scores each row with its first feature so results can be traced back to requests."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def predict_proba(self, X):
+        self.batch_sizes.append(len(X))
+        first = X.iloc[:, 0].to_numpy()
+        return np.column_stack([1 - first, first])
+
+
+def test_micro_batch_mixing_bulk_and_single_requests_splits_scores_back() -> None:
+    model = RowIdModel()
+    # Seven rows fill the batch, so it is scored as soon as the last request arrives.
+    batcher = MicroBatcher(model, max_batch_rows=7, max_wait_ms=10_000)
+    single, bulk = np.zeros((1, len(FEATURE_COLS))), np.zeros((5, len(FEATURE_COLS)))
+    single[:, 0], bulk[:, 0] = 0.1, [0.2, 0.3, 0.4, 0.5, 0.6]
+    requests = [single, bulk, single + 0.6]
+    try:
+        futures = [batcher.submit(values) for values in requests]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.close()
+
+    assert model.batch_sizes == [7]
+    np.testing.assert_allclose(results[0], [0.1])
+    np.testing.assert_allclose(results[1], [0.2, 0.3, 0.4, 0.5, 0.6])
+    np.testing.assert_allclose(results[2], [0.7])
+
+
+def test_payload_nulls_are_only_accepted_for_nan_native_backends() -> None:
+    row = {col: 1.0 for col in FEATURE_COLS}
+    payload = {"rows": [row, {**row, FEATURE_COLS[0]: None}]}
+
+    with pytest.raises(ValueError, match="NaN-native"):
+        parse_payload(payload)
+    assert np.isnan(parse_payload(payload, allow_nan=True)[1, 0])
+    with pytest.raises(ValueError, match="finite"):
+        parse_payload({"features": {**row, FEATURE_COLS[0]: float("inf")}}, allow_nan=True)
@@ -0,0 +1,96 @@
+"""The partial_fit backend streams the matrix in chunks and extends itself with new weeks."""
+
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.evaluate import ranking_metrics
+from src.model.registry import can_update_in_place, load_model_metadata
+from src.model.train import (
+    FEATURE_COLS,
+    _backend_fit_inputs,
+    train_model,
+    update_model,
+    usable_rows,
+)
+from src.model.train_sgd import iter_matrix_chunks, train_sgd
+
+
+def test_sgd_trains_in_chunks_and_updates_with_new_weeks(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), models_dir=tmp_path, model_backend="sgd", sgd_chunk_rows=97
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+    model, X_train, _, X_test, y_test, metadata = train_model(matrix, config)
+    assert model.rows_seen == len(X_train)
+    assert ranking_metrics(y_test, model.predict_proba(X_test)[:, 1])["auc"] > 0.9
+    assert can_update_in_place(load_model_metadata(config), config)
+
+    updated, updated_metadata = update_model(matrix, config, metadata)
+    assert updated.rows_seen == len(matrix)
+    assert updated_metadata["incremental_rows"] == len(X_test)
+    assert updated_metadata["trained_through_week"] == int(matrix.week.max())
+    # The test weeks are now training data, so the held-out split no longer describes it.
+    assert "split_week" not in updated_metadata and "test_rows" not in updated_metadata
+    assert updated_metadata["evaluated_through_week"] == metadata["trained_through_week"]
+    assert load_model_metadata(config)["trained_through_week"] == int(matrix.week.max())
+
+    # Nothing new to learn: a second update leaves the model untouched.
+    again, _ = update_model(matrix, config, load_model_metadata(config))
+    np.testing.assert_array_equal(again.model.coef_, updated.model.coef_)
+
+
+def test_matrix_chunks_are_bounded_and_in_week_order(tmp_path: Path) -> None:
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(load_config(True))))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    usable = np.ones(len(matrix), dtype=bool)
+
+    chunks = list(iter_matrix_chunks(matrix, matrix.week_rows(start=3), usable, 128))
+
+    assert max(len(X) for X, _ in chunks) == 128
+    np.testing.assert_array_equal(
+        np.concatenate([X for X, _ in chunks]), matrix.values[matrix.week_rows(start=3)]
+    )
+
+
+def test_sgd_epochs_reuse_one_scaler_fit(tmp_path: Path) -> None:
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(load_config(True))))
+    X = features[FEATURE_COLS].dropna()
+    y = features.loc[X.index, "target_high_risk"]
+
+    one, _ = train_sgd(X, y, random_seed=0, chunk_rows=97, epochs=1)
+    three, params = train_sgd(X, y, random_seed=0, chunk_rows=97, epochs=3)
+
+    assert params["epochs"] == 3
+    assert one.rows_seen == three.rows_seen == len(X)
+    assert three.scaler.n_samples_seen_ == len(X)
+    np.testing.assert_allclose(three.scaler.mean_, X.to_numpy().mean(axis=0), rtol=1e-5)
+    assert three.model.t_ > one.model.t_
+
+
+def test_sgd_streams_training_rows_from_the_matrix_mask(tmp_path: Path) -> None:
+    config = dataclasses.replace(load_config(demo_mode=True), model_backend="sgd")
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    features.loc[features.index[::7], FEATURE_COLS[0]] = np.nan
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+    split_week = int(matrix.week[-1])
+
+    kwargs = _backend_fit_inputs(matrix, split_week, usable_rows(matrix, "sgd"), config)
+    assert kwargs["matrix"] is matrix
+    expected = kwargs["rows"]
+    assert expected.any() and not np.isnan(matrix.values[expected]).any()
+
+    model, _ = train_sgd(None, None, random_seed=0, **kwargs)
+
+    assert model.rows_seen == model.scaler.n_samples_seen_ == expected.sum()
+    np.testing.assert_allclose(
+        model.scaler.mean_, matrix.values[expected].mean(axis=0, dtype=np.float64), rtol=1e-5
+    )
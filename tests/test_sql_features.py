@@ -0,0 +1,28 @@
+"""The SQL push-down feature backend should match the pandas feature build."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.etl.load import DBClient
+from src.etl.synthetic import generate_synthetic_oulad
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.sql_backend import build_time_sliced_features_sql
+
+
+@pytest.mark.parametrize("chunksize", [64, 100_000])
+def test_sqlite_backend_matches_pandas_backend(chunksize: int) -> None:
+    clean_df = transform_data(
+        *generate_synthetic_oulad(n_students=200, n_modules=3, n_weeks=8, missing_rate=0.1)
+    )
+    conn = sqlite3.connect(":memory:")
+    clean_df.to_sql("clean_events", conn, index=False)
+
+    expected = build_time_sliced_features(clean_df)
+    actual = build_time_sliced_features_sql(DBClient(conn=conn, driver="sqlite"), chunksize)
+
+    pd.testing.assert_frame_equal(
+        actual, expected, check_dtype=False, check_categorical=False, rtol=1e-5
+    )
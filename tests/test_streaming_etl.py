@@ -0,0 +1,29 @@
+"""Parity tests for the chunked extract/transform/feature path."""
+
+import pandas as pd
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data, _iter_frame_chunks
+from src.etl.transform import transform_data, transform_data_chunked
+from src.features.build_features import (
+    build_time_sliced_features,
+    build_time_sliced_features_from_chunks,
+)
+
+
+@pytest.mark.parametrize("chunksize", [7, 257, 10_000])
+def test_chunked_features_match_full_build(chunksize: int) -> None:
+    """Streaming features should match the in-memory build regardless of chunk size."""
+    config = load_config(demo_mode=True)
+    student_info, student_assessment, assessments = _generate_demo_data(config)
+
+    expected = build_time_sliced_features(
+        transform_data(student_info, student_assessment, assessments)
+    )
+    chunks = transform_data_chunked(
+        student_info, _iter_frame_chunks(student_assessment, chunksize), assessments
+    )
+    actual = build_time_sliced_features_from_chunks(chunks)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
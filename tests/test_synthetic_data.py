@@ -0,0 +1,82 @@
+"""Tests for the vectorized synthetic OULAD generator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl.synthetic import generate_synthetic_oulad, module_codes
+from src.etl.transform import transform_data
+
+
+@pytest.mark.parametrize(
+    ("n_students", "n_modules", "n_weeks"), [(1, 1, 1), (50, 3, 4), (200, 30, 7)]
+)
+def test_row_counts_scale_with_students_and_weeks(
+    n_students: int, n_modules: int, n_weeks: int
+) -> None:
+    student_info, student_assessment, assessments = generate_synthetic_oulad(
+        n_students=n_students, n_modules=n_modules, n_weeks=n_weeks
+    )
+    assert len(student_info) == n_students
+    assert len(student_assessment) == n_students * n_weeks
+    assert len(assessments) == n_modules * n_weeks
+    assert len(transform_data(student_info, student_assessment, assessments)) == len(
+        student_assessment
+    )
+
+
+@pytest.mark.parametrize("missing_rate", [-0.1, 1.5])
+def test_missing_rate_outside_unit_interval_is_rejected(missing_rate: float) -> None:
+    with pytest.raises(ValueError, match="missing_rate"):
+        generate_synthetic_oulad(n_students=10, missing_rate=missing_rate)
+
+
+def test_missing_rate_blanks_submitted_scores() -> None:
+    _, complete, _ = generate_synthetic_oulad(n_students=500, n_weeks=4, missing_rate=0.0)
+    _, blanked, _ = generate_synthetic_oulad(n_students=500, n_weeks=4, missing_rate=1.0)
+    assert complete.loc[complete["submitted"] == 1, "score"].notna().all()
+    assert complete.loc[complete["submitted"] == 0, "score"].isna().all()
+    assert blanked["score"].isna().all()
+
+
+def test_id_and_week_layout_supports_downstream_joins() -> None:
+    n_students, n_modules, n_weeks = 40, 3, 5
+    student_info, student_assessment, assessments = generate_synthetic_oulad(
+        n_students=n_students, n_modules=n_modules, n_weeks=n_weeks
+    )
+
+    assert student_info["id_student"].is_unique
+    assert assessments["id_assessment"].is_unique
+    assert set(student_info["code_module"]) <= set(module_codes(n_modules))
+    assert not student_assessment.duplicated(["id_student", "id_assessment"]).any()
+
+    # Week-major: block w holds every student's week-w row, each student once.
+    weeks = student_assessment["date_submitted"].to_numpy() // 7
+    np.testing.assert_array_equal(weeks, np.repeat(np.arange(1, n_weeks + 1), n_students))
+    np.testing.assert_array_equal(
+        student_assessment["id_student"].to_numpy(),
+        np.tile(student_info["id_student"].to_numpy(), n_weeks),
+    )
+
+    # Every assessment row resolves to its student's module and to the assessment of its week.
+    merged = student_assessment.merge(assessments, on="id_assessment", validate="many_to_one")
+    assert len(merged) == len(student_assessment)
+    assert (merged["date"] == merged["date_submitted"]).all()
+    module_of_assessment = (merged["id_assessment"] - 1) // n_weeks
+    module_of_student = merged["id_student"].map(
+        student_info.set_index("id_student")["code_module"].map(
+            {code: i for i, code in enumerate(module_codes(n_modules))}
+        )
+    )
+    pd.testing.assert_series_equal(
+        module_of_assessment, module_of_student, check_names=False, check_dtype=False
+    )
+
+
+def test_generation_is_deterministic_per_seed() -> None:
+    first = generate_synthetic_oulad(n_students=30, seed=7)
+    second = generate_synthetic_oulad(n_students=30, seed=7)
+    other = generate_synthetic_oulad(n_students=30, seed=8)
+    for a, b in zip(first, second):
+        pd.testing.assert_frame_equal(a, b)
+    assert not first[1]["score"].equals(other[1]["score"])
@@ -0,0 +1,75 @@
+"""The tf.data input pipeline streams every selected row, in order for inference."""
+
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.train import FEATURE_COLS, _backend_fit_inputs, usable_rows
+from src.model.train_tf import fit_scaler
+
+
+def test_inference_dataset_streams_scaled_rows_in_order() -> None:
+    pytest.importorskip("tensorflow")
+    from src.model.train_tf import make_dataset
+
+    values = np.random.default_rng(0).normal(size=(1000, 5)).astype(np.float32)
+    scaler = StandardScaler().fit(values)
+
+    dataset = make_dataset(values, None, scaler, batch_size=64, chunk_rows=96, parallelism=4)
+    streamed = np.concatenate([batch.numpy() for batch in dataset])
+
+    np.testing.assert_allclose(streamed, scaler.transform(values), atol=1e-5)
+
+
+def test_training_dataset_shuffles_but_keeps_rows_paired_with_targets() -> None:
+    pytest.importorskip("tensorflow")
+    from src.model.train_tf import make_dataset
+
+    values = np.arange(600, dtype=np.float32).reshape(-1, 1)
+    scaler = StandardScaler().fit(values)
+    dataset = make_dataset(values, values[:, 0] % 2, scaler, 50, chunk_rows=128, seed=7)
+
+    batches = [(X.numpy()[:, 0], y.numpy()) for X, y in dataset]
+    X, y = (np.concatenate(parts) for parts in zip(*batches))
+    rows = np.rint(X * scaler.scale_[0] + scaler.mean_[0]).astype(int)
+
+    assert sorted(rows) == list(range(600)) and not np.array_equal(rows, np.arange(600))
+    np.testing.assert_array_equal(y, rows % 2)
+
+
+def test_scaler_streams_only_the_masked_rows() -> None:
+    values = np.random.default_rng(1).normal(size=(1000, 4)).astype(np.float32)
+    mask = np.zeros(len(values), dtype=bool)
+    mask[150:820] = True
+    mask[::7] = False
+
+    scaler = fit_scaler(values, list("abcd"), chunk_rows=64, mask=mask)
+
+    expected = StandardScaler().fit(values[mask])
+    assert scaler.n_samples_seen_ == mask.sum()
+    np.testing.assert_allclose(scaler.mean_, expected.mean_, rtol=1e-5)
+    np.testing.assert_allclose(scaler.scale_, expected.scale_, rtol=1e-5)
+
+
+def test_tensorflow_fit_inputs_pass_matrix_masks(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True), model_backend="tensorflow", early_stopping_patience=1
+    )
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path)
+    split_week = int(matrix.week[-1])
+
+    kwargs = _backend_fit_inputs(matrix, split_week, usable_rows(matrix, "tensorflow"), config)
+
+    assert kwargs["matrix"] is matrix and kwargs["patience"] == 1
+    assert kwargs["chunk_rows"] == config.tf_data_chunk_rows
+    assert not (kwargs["rows"] & kwargs["valid_rows"]).any()
+    assert (matrix.week[kwargs["valid_rows"]] >= split_week - config.valid_weeks).all()
@@ -0,0 +1,110 @@
+"""Mini-batch PyTorch training: masked batches over the memmap, early stopping, threads."""
+
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.train import FEATURE_COLS, _backend_fit_inputs, usable_rows
+from src.model.train_torch import iter_minibatches
+
+
+def _demo_matrix(root: Path):
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(load_config(True))))
+    return write_feature_matrix(features, FEATURE_COLS, root)
+
+
+def test_shuffled_minibatches_cover_every_row_once_per_pass(tmp_path: Path) -> None:
+    matrix = _demo_matrix(tmp_path / "matrix")
+    values, targets = matrix.values, matrix.target
+    mean, scale = values.mean(axis=0, dtype=np.float64), values.std(axis=0, dtype=np.float64)
+    scale[scale == 0] = 1.0
+
+    batches = list(iter_minibatches(values, targets, mean, scale, 128, np.random.default_rng(0)))
+
+    assert max(len(X) for X, _ in batches) == 128
+    X = np.concatenate([X for X, _ in batches])
+    assert X.dtype == np.float32 and len(X) == len(values)
+    expected = ((values - mean) / scale).astype(np.float32)
+    order = np.lexsort(expected.T[::-1])
+    np.testing.assert_allclose(X[np.lexsort(X.T[::-1])], expected[order], atol=1e-5)
+
+
+def test_minibatch_training_with_early_stopping(tmp_path: Path) -> None:
+    pytest.importorskip("torch")
+    from src.model.train import train_model
+
+    config = dataclasses.replace(
+        load_config(demo_mode=True),
+        models_dir=tmp_path,
+        model_backend="pytorch",
+        torch_batch_size=64,
+        torch_num_threads=1,
+        early_stopping_patience=1,
+        valid_weeks=2,
+    )
+    matrix = _demo_matrix(tmp_path / "matrix")
+
+    _, _, _, X_test, _, metadata = train_model(matrix, config)
+    params = metadata["backend_hyperparams"]
+
+    assert params["batch_size"] == 64 and params["num_threads"] == 1
+    assert params["early_stopping_patience"] == 1
+    assert 1 <= params["epochs_run"] <= params["epochs"]
+
+
+def test_masked_minibatches_read_only_the_selected_rows(tmp_path: Path) -> None:
+    matrix = _demo_matrix(tmp_path / "matrix")
+    values, targets = matrix.values, matrix.target
+    mask = np.arange(len(values)) % 3 == 0
+    mean, scale = np.zeros(values.shape[1]), np.ones(values.shape[1])
+
+    batches = list(
+        iter_minibatches(values, targets, mean, scale, 50, np.random.default_rng(1), mask)
+    )
+
+    X = np.concatenate([X for X, _ in batches])
+    y = np.concatenate([y for _, y in batches])
+    assert len(X) == mask.sum() and y.dtype == np.float32
+    np.testing.assert_array_equal(np.sort(X[:, 0]), np.sort(values[mask, 0]))
+
+
+def test_pytorch_fit_inputs_mask_the_matrix_instead_of_copying(tmp_path: Path) -> None:
+    config = dataclasses.replace(
+        load_config(demo_mode=True),
+        model_backend="pytorch",
+        early_stopping_patience=2,
+        valid_weeks=2,
+    )
+    matrix = _demo_matrix(tmp_path / "matrix")
+    complete = usable_rows(matrix, "pytorch")
+    complete[::5] = False
+    split_week = int(matrix.week[-1])
+
+    kwargs = _backend_fit_inputs(matrix, split_week, complete, config)
+
+    assert kwargs["matrix"] is matrix and kwargs["patience"] == 2
+    rows, valid_rows = kwargs["rows"], kwargs["valid_rows"]
+    assert not (rows & valid_rows).any() and not ((rows | valid_rows) & ~complete).any()
+    assert (matrix.week[rows] < split_week - 2).all()
+    assert set(matrix.week[valid_rows]) == {split_week - 2, split_week - 1}
+
+
+def test_torch_training_restores_the_global_thread_count(tmp_path: Path) -> None:
+    torch = pytest.importorskip("torch")
+    from src.model.train_torch import train_torch
+
+    matrix = _demo_matrix(tmp_path / "matrix")
+    before = torch.get_num_threads()
+    target = 1 if before > 1 else 2
+
+    _, params = train_torch(None, None, 0, demo_mode=True, num_threads=target, matrix=matrix)
+
+    assert params["num_threads"] == target
+    assert torch.get_num_threads() == before
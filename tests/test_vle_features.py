@@ -0,0 +1,83 @@
+"""Streaming VLE aggregation should match an in-memory groupby and join into features."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl.synthetic import generate_synthetic_oulad, write_synthetic_raw
+from src.etl.transform import transform_data
+from src.etl.vle import VLE_FEATURE_COLS, aggregate_vle_weekly
+from src.features.build_features import build_time_sliced_features, join_vle_features
+
+
+@pytest.mark.parametrize("chunksize", [97, 100_000])
+def test_streaming_vle_matches_in_memory_groupby(tmp_path: Path, chunksize: int) -> None:
+    write_synthetic_raw(tmp_path, n_students=40, n_modules=2, n_weeks=6, vle_rows_per_week=4)
+    student_vle = pd.read_csv(tmp_path / "studentVle.csv")
+    sites = pd.read_csv(tmp_path / "vle.csv")
+
+    weekly, stats = aggregate_vle_weekly(
+        tmp_path / "studentVle.csv", tmp_path / "vle.csv", chunksize
+    )
+
+    events = student_vle.merge(sites, on="id_site").assign(week=lambda df: df["date"] // 7)
+    keys = ["id_student", "code_module", "week"]
+    by_key = events.groupby(keys)
+    expected = pd.DataFrame(
+        {
+            "vle_clicks": by_key["sum_click"].sum(),
+            "vle_active_days": by_key["date"].nunique(),
+            "vle_clicks_quiz": events[events["activity_type"] == "quiz"]
+            .groupby(keys)["sum_click"]
+            .sum(),
+            "vle_clicks_other": events[events["activity_type"] == "glossary"]
+            .groupby(keys)["sum_click"]
+            .sum(),
+        }
+    ).fillna(0)
+    actual = weekly.assign(code_module=weekly["code_module"].astype(str)).set_index(keys)
+
+    assert stats["rows"] == len(student_vle)
+    np.testing.assert_array_equal(actual.index, expected.index)
+    for col in expected.columns:
+        np.testing.assert_array_equal(actual[col], expected[col], err_msg=col)
+
+
+def test_vle_features_join_onto_weekly_rows(tmp_path: Path) -> None:
+    write_synthetic_raw(tmp_path, n_students=40, n_modules=2, n_weeks=6, vle_rows_per_week=4)
+    vle_weekly, _ = aggregate_vle_weekly(tmp_path / "studentVle.csv", tmp_path / "vle.csv", 50)
+    clean_df = transform_data(*generate_synthetic_oulad(n_students=40, n_modules=2, n_weeks=6))
+
+    with_vle = build_time_sliced_features(clean_df, vle_weekly)
+    without_vle = build_time_sliced_features(clean_df)
+
+    assert (with_vle["vle_clicks"] > 0).all()
+    assert (without_vle[VLE_FEATURE_COLS] == 0).all().all()
+    assert with_vle["vle_active_days"].between(1, 7).all()
+
+
+def test_clicks_between_assessment_weeks_count_towards_the_next_one() -> None:
+    grouped = pd.DataFrame(
+        {
+            "id_student": [1, 1, 2],
+            "week": [2, 5, 3],
+            "code_module": pd.Categorical(["AAA", "AAA", "BBB"]),
+        }
+    )
+    vle_weekly = pd.DataFrame(
+        {
+            "id_student": [1, 1, 1, 1, 1, 2, 2],
+            "code_module": ["AAA", "AAA", "AAA", "AAA", "AAA", "BBB", "AAA"],
+            "week": [1, 2, 3, 4, 7, 3, 3],
+            **{col: [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0] for col in VLE_FEATURE_COLS},
+        }
+    )
+
+    joined = join_vle_features(grouped, vle_weekly)
+
+    # Weeks 1-2 feed week 2, weeks 3-4 feed week 5, week 7 waits for a later row, and the
+    # other module's clicks never reach student 2's BBB row.
+    assert joined["vle_clicks"].tolist() == [3.0, 12.0, 32.0]
+    assert list(joined.index) == list(grouped.index)
@@ -0,0 +1,51 @@
+"""Walk-forward CV folds, identical serially and in a process pool, and their PR metrics."""
+
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.etl.extract import _generate_demo_data
+from src.etl.transform import transform_data
+from src.features.build_features import build_time_sliced_features
+from src.features.matrix import write_feature_matrix
+from src.model.evaluate import ranking_metrics
+from src.model.train import FEATURE_COLS
+from src.model.walk_forward import cutoff_weeks, walk_forward_cv
+
+
+def _without_timings(folds: list[dict]) -> list[dict]:
+    return [{k: v for k, v in fold.items() if k != "seconds"} for fold in folds]
+
+
+def test_parallel_walk_forward_matches_serial_folds(tmp_path: Path) -> None:
+    config = dataclasses.replace(load_config(demo_mode=True), cv_min_train_weeks=3)
+    features = build_time_sliced_features(transform_data(*_generate_demo_data(config)))
+    matrix = write_feature_matrix(features, FEATURE_COLS, tmp_path / "matrix")
+
+    serial = walk_forward_cv(matrix, dataclasses.replace(config, cv_workers=1))
+    parallel = walk_forward_cv(matrix, dataclasses.replace(config, cv_workers=3))
+
+    cutoffs = cutoff_weeks(matrix, 3)
+    assert [fold["cutoff_week"] for fold in serial["folds"]] == cutoffs
+    for fold in serial["folds"]:
+        assert fold["train_rows"] == matrix.week_rows(stop=fold["cutoff_week"]).stop
+    assert _without_timings(parallel["folds"]) == _without_timings(serial["folds"])
+    assert serial["n_scored_folds"] > 1
+    assert serial["auc"]["min"] <= serial["auc"]["mean"] <= serial["auc"]["max"]
+    assert serial["pr_auc"]["std"] >= 0
+    assert serial["average_precision"]["std"] >= 0
+
+
+def test_average_precision_is_reported_next_to_trapezoidal_pr_auc() -> None:
+    # The top two scores tie at a positive and a negative row: average precision credits
+    # the tie at precision 1/2, where the trapezoidal PR area interpolates from precision 1.
+    y = np.array([1, 0, 1, 0, 0])
+    probs = np.array([0.9, 0.9, 0.6, 0.3, 0.1])
+
+    metrics = ranking_metrics(y, probs)
+
+    assert metrics["average_precision"] == pytest.approx(0.5 * 0.5 + 0.5 * 2 / 3)
+    assert metrics["pr_auc"] == pytest.approx(0.5 * (1 + 0.5) / 2 + 0.5 * (0.5 + 2 / 3) / 2)